@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the Home Assistant independent core package.
+
+Loads custom_components/jarolift/core standalone in a fresh interpreter under
+``python -X importtime``, lists the slowest imports and checks that neither
+Home Assistant nor the integration itself was imported. Exits non-zero when
+the core exceeds its import-time budget, so it can run as a CI gate.
+
+Usage: python benchmarks/bench_core_import.py [runs]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+STANDALONE = ROOT / "custom_components" / "jarolift" / "core" / "standalone.py"
+# Cumulative import time of everything loading the core pulls in, stdlib
+# included; Home Assistant itself takes seconds
+IMPORT_BUDGET_MS = 100.0
+FORBIDDEN = ("homeassistant", "voluptuous")
+MARKER = "jarolift-core-import"
+PROGRAM = f"""
+import runpy, sys
+sys.stderr.write("{MARKER}\\n")
+runpy.run_path({str(STANDALONE)!r})
+print("\\n".join(sys.modules))
+"""
+
+
+def measure():
+    """Return the imports of one standalone load as (module, self, cumulative)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROGRAM],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    lines = result.stderr.split(f"{MARKER}\n", 1)[1].splitlines()
+    imports = []
+    for line in lines:
+        fields = line.removeprefix("import time:").split("|")
+        # Skips the header and anything the program itself writes
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    modules = result.stdout.split()
+    return imports, modules
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Loading the core standalone, best of {runs} runs")
+
+    best = None
+    for _ in range(runs):
+        imports, modules = measure()
+        # Top-level entries include the time of everything they import
+        total = sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, imports, modules)
+    total, imports, modules = best
+
+    print(f"\n{'module':<48} {'self':>9} {'cumulative':>11}")
+    slowest = sorted(imports, key=lambda entry: entry[1], reverse=True)[:12]
+    for name, own, cumulative, _ in slowest:
+        print(f"{name:<48} {own / 1000:>7.2f}ms {cumulative / 1000:>9.2f}ms")
+    core = [entry for entry in imports if entry[0].startswith("custom_components")]
+    core_self = sum(own for _, own, _, _ in core)
+    print(f"\nCore modules (self):        {core_self / 1000:7.2f}ms")
+    print(f"Total import time:          {total / 1000:7.2f}ms")
+    print(f"Budget:                     {IMPORT_BUDGET_MS:7.2f}ms")
+
+    failed = False
+    leaked = [name for name in modules if name.partition(".")[0] in FORBIDDEN]
+    leaked += [name for name in modules if name == "custom_components.jarolift"]
+    if leaked:
+        print(f"\nFAIL: loading the core imported {', '.join(sorted(leaked))}")
+        failed = True
+    if total / 1000 > IMPORT_BUDGET_MS:
+        print("\nFAIL: the core exceeds its import-time budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
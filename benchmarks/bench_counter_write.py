@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for counter persistence.
+
+Compares the original in-place counter write (open(..., "w") on
+counter_<serial>.txt) with the CounterStore for every block size and fsync
+policy combination. The time a command waits for before its frames are
+sent (reservation and any write it needs) is reported separately from the
+work done in the background while the frames are on the air (deferred
+fsync, block renewals).
+
+Usage: python benchmarks/bench_counter_write.py [iterations]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path to import custom_components
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.jarolift.core.counter import (
+    COUNTER_FSYNC_POLICIES,
+    COUNTER_STORE_FILE,
+    DEFAULT_COUNTER_BLOCK_SIZE,
+    DEFAULT_COUNTER_FSYNC,
+    CounterStore,
+)
+
+SERIAL = 0x106AA01
+SERIALS = 20
+
+
+def write_in_place(counter_file, serial, counter):
+    """Original WriteCounter: truncate and rewrite the file in place."""
+    with open(f"{counter_file}{hex(serial)}.txt", "w", encoding="utf-8") as fo:
+        fo.write(str(counter))
+
+
+def report(name, iterations, before_send, background=0.0):
+    """Print the time per command spent before the send and in the background."""
+    print(
+        f"{name:<40} {before_send / iterations * 1e6:10.1f} us"
+        f" {background / iterations * 1e6:12.1f} us"
+    )
+
+
+def make_store(directory, **kwargs):
+    """Return a store with SERIALS covers, like a typical installation."""
+    store = CounterStore(str(Path(directory) / COUNTER_STORE_FILE), **kwargs)
+    for serial in range(SERIAL, SERIAL + SERIALS):
+        store.set(serial, 1000)
+    store.write(store.serialize())
+    return store
+
+
+def bench_store(store, iterations):
+    """Return the time spent before and after the sends of iterations commands."""
+    before_send = background = 0.0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        # What _async_reserve_counters_batch() does before the frames go out
+        store.reserve(SERIAL, 1)
+        if store.dirty:
+            store.write(store.serialize(), defer_sync=True)
+        sent = time.perf_counter()
+        # What the background flush does while the frames are on the air
+        if store.renewal_due:
+            store.extend_reservations()
+        if store.dirty:
+            store.write(store.serialize())
+        store.sync()
+        before_send += sent - start
+        background += time.perf_counter() - sent
+    return before_send, background
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{'per command':<40} {'before send':>13} {'background':>15}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        counter_file = str(Path(directory) / "counter_")
+        start = time.perf_counter()
+        for i in range(iterations):
+            write_in_place(counter_file, SERIAL, i)
+        report("in-place write (original)", iterations, time.perf_counter() - start)
+
+        for block_size in (0, DEFAULT_COUNTER_BLOCK_SIZE):
+            for fsync in COUNTER_FSYNC_POLICIES:
+                store = make_store(directory, block_size=block_size, fsync=fsync)
+                name = f"store block_size={block_size} fsync={fsync}"
+                if (block_size, fsync) == (
+                    DEFAULT_COUNTER_BLOCK_SIZE,
+                    DEFAULT_COUNTER_FSYNC,
+                ):
+                    name += " (default)"
+                report(name, iterations, *bench_store(store, iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for KeeLoq batches under many device keys.
+
+Compares one encrypt() call per item (with and without cached key schedules)
+with the bit-sliced engine at several batch sizes, and the packet build of a
+scene where every cover has its own serial, with warm caches and with the
+device keys still to be derived (first scene after a restart or key change).
+
+Usage: python benchmarks/bench_keeloq_batch.py [iterations]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import custom_components
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from custom_components.jarolift.core import BuildPacket, build_packets_batch, keeloq
+
+MSB = 0x12345678
+LSB = 0x87654321
+BATCH_SIZES = (1, 8, 64, 512)
+SCENE_COVERS = 60
+
+
+def bench(name, iterations, func, items=1):
+    """Run func iterations times and print the time per call and per item."""
+    # Warm up caches (device keys, packet templates) before timing
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(
+        f"{name:<36} {elapsed * 1e3:9.3f} ms/batch {elapsed / items * 1e6:9.1f} us/item"
+    )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rng = random.Random(0)
+
+    for size in BATCH_SIZES:
+        items = [
+            (rng.getrandbits(32), rng.getrandbits(32), rng.getrandbits(32))
+            for _ in range(size)
+        ]
+
+        def scalar_cold(items=items):
+            keeloq.encrypt_schedule.cache_clear()
+            return [keeloq.encrypt(*item) for item in items]
+
+        print(f"N = {size}")
+        bench("  encrypt() per item, new keys", iterations, scalar_cold, size)
+        bench(
+            "  encrypt() per item, cached keys",
+            iterations,
+            lambda items=items: [keeloq.encrypt(*item) for item in items],
+            size,
+        )
+        bench(
+            "  encrypt_bitsliced()",
+            iterations,
+            lambda items=items: keeloq.encrypt_bitsliced(items),
+            size,
+        )
+
+    frames = [(0x0001, 0x106AA01 + i, 0x2, 100) for i in range(SCENE_COVERS)]
+    print(f"Scene with {SCENE_COVERS} covers")
+    bench(
+        "  BuildPacket() of one cover",
+        iterations,
+        lambda: BuildPacket(*frames[0], MSB, LSB, False),
+    )
+    bench(
+        "  build_packets_batch()",
+        iterations,
+        lambda: build_packets_batch(frames, MSB, LSB),
+        SCENE_COVERS,
+    )
+
+    def scene_cold():
+        keeloq.derive_device_key.cache_clear()
+        keeloq.decrypt_schedule.cache_clear()
+        return build_packets_batch(frames, MSB, LSB)
+
+    bench("  build_packets_batch(), new keys", iterations, scene_cold, SCENE_COVERS)
+
+
+if __name__ == "__main__":
+    main()
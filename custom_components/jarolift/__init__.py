@@ -12,23 +12,48 @@ The integration:
 For more information, see: https://github.com/wuerzle/hass-jarolift
 """
 
-import base64
-import binascii
+import asyncio
 import logging
 import os.path
-import threading
-from time import sleep
+from datetime import timedelta
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .cipher_pool import DEFAULT_CIPHER_WORKERS, CipherPool
+from .core.counter import (
+    COUNTER_POLICY_SAME,
+    COUNTER_STORE_FILE,
+    DEFAULT_COUNTER_BLOCK_SIZE,
+    DEFAULT_COUNTER_FLUSH_INTERVAL,
+    DEFAULT_COUNTER_FSYNC,
+    DEFAULT_COUNTER_POLICY,
+    CounterStore,
+    CounterUsage,
+    repeat_counter_offsets,
+)
+from .core.decoder import decode_packets
+from .core.frames import BuildPacket, build_packets_batch
+from .core.packet import (
+    FRAME_AIRTIME,
+    FRAME_GAP,
+    HOLD_FRAME_AIRTIME,
+    MAX_FRAME_GAP,
+    fold_repeats_b64,
+    frames_per_packet_b64,
+    pack_frames_b64,
+)
+from .packet_cache import PacketCache
+from .transmit import PRIORITY_NORMAL, PRIORITY_STOP, JaroliftTransmitter
 
 DOMAIN = "jarolift"
 _LOGGER = logging.getLogger(__name__)
-mutex = threading.Lock()
 
 PLATFORMS = [Platform.COVER, Platform.BUTTON]
 
@@ -43,6 +68,14 @@ CONF_SERIAL = "serial"
 CONF_REP_COUNT = "repeat_count"
 CONF_REP_DELAY = "repeat_delay"
 CONF_REVERSE = "reverse"
+CONF_REPEAT_MODE = "repeat_mode"
+CONF_COUNTER_POLICY = "counter_policy"
+CONF_TRAVEL_TIME_UP = "travel_time_up"
+CONF_TRAVEL_TIME_DOWN = "travel_time_down"
+CONF_COUNTER_BLOCK_SIZE = "counter_block_size"
+CONF_COUNTER_FLUSH_INTERVAL = "counter_flush_interval"
+CONF_COUNTER_FSYNC = "counter_fsync"
+CONF_CIPHER_WORKERS = "cipher_workers"
 
 # Device information constants
 DEVICE_NAME = "Jarolift"
@@ -50,23 +83,20 @@ DEVICE_MANUFACTURER = "Jarolift"
 DEVICE_MODEL = "KeeLoq RF Controller"
 DEVICE_SW_VERSION = "2.0.5"
 
+# How repeats of a command are handed to the remote entity: one
+# remote.send_command call per frame, all frames in a single call, or
+# identical frames repeated by the blaster itself (header repeat byte)
+REPEAT_MODE_SEPARATE = "separate"
+REPEAT_MODE_BATCH = "batch"
+REPEAT_MODE_HARDWARE = "hardware"
+REPEAT_MODES = [REPEAT_MODE_SEPARATE, REPEAT_MODE_BATCH, REPEAT_MODE_HARDWARE]
+DEFAULT_REPEAT_MODE = REPEAT_MODE_SEPARATE
+
 # Button codes for Jarolift commands
 BUTTON_LEARN = 0xA
 BUTTON_STOP = 0x4
 BUTTON_UP = 0x8
 
-# KeeLoq packet building constants
-KEELOQ_KEY_LOW_MASK = 0x20000000
-KEELOQ_KEY_HIGH_MASK = 0x60000000
-KEELOQ_PACKET_BITS = 72
-KEELOQ_PREAMBLE = "190c1a0001e4310c0d0c0d0c0d0c0d0c0d0c0d0c0d0c0d7a"
-KEELOQ_BIT_ONE_LAST = "0c0005dc"
-KEELOQ_BIT_ZERO_LAST = "190005dc"
-KEELOQ_BIT_ONE = "0c19"
-KEELOQ_BIT_ZERO = "190c"
-KEELOQ_HOLD_PREFIX = "b214"
-KEELOQ_NORMAL_PREFIX = "b200"
-
 # Configuration schema for YAML setup (backward compatibility)
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -82,86 +112,68 @@ CONFIG_SCHEMA = vol.Schema(
     extra=vol.ALLOW_EXTRA,
 )
 
+# Limits of the priority and deadline (seconds) of the send services
+MAX_PRIORITY = 100
+MAX_DEADLINE = 3600
 
-def bitRead(value: int, bit: int) -> int:
-    """Read a specific bit from a value."""
-    return ((value) >> (bit)) & 0x01
-
-
-def bitSet(value: int, bit: int) -> int:
-    """Set a specific bit in a value."""
-    return (value) | (1 << (bit))
-
-
-def encrypt(x: int, keyHigh: int, keyLow: int) -> int:
-    """Encrypt a value using the KeeLoq algorithm.
-
-    KeeLoq is a proprietary cipher used in RF remote controls. This implementation
-    performs 528 rounds of encryption using a 64-bit key and a non-linear function.
+# Fields of the send services that reach the transmitter; the other fields
+# are parsed by the handlers
+SEND_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Optional("priority"): vol.All(
+            vol.Coerce(int), vol.Range(min=-MAX_PRIORITY, max=MAX_PRIORITY)
+        ),
+        vol.Optional("deadline"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_DEADLINE)
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+SEND_COMMAND_MANY_SCHEMA = SEND_COMMAND_SCHEMA.extend(
+    {
+        vol.Optional("frame_gap"): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_FRAME_GAP)
+        ),
+    }
+)
 
-    Args:
-        x: 32-bit value to encrypt
-        keyHigh: High 32 bits of the 64-bit key
-        keyLow: Low 32 bits of the 64-bit key
 
-    Returns:
-        Encrypted 32-bit value
-    """
-    KeeLoq_NLF = 0x3A5C742E  # Non-linear function lookup table
-    for r in range(0, 528):
-        keyBitNo = r & 63
-        if keyBitNo < 32:
-            keyBitVal = bitRead(keyLow, keyBitNo)
-        else:
-            keyBitVal = bitRead(keyHigh, keyBitNo - 32)
-        index = (
-            1 * bitRead(x, 1)
-            + 2 * bitRead(x, 9)
-            + 4 * bitRead(x, 20)
-            + 8 * bitRead(x, 26)
-            + 16 * bitRead(x, 31)
-        )
-        bitVal = bitRead(x, 0) ^ bitRead(x, 16) ^ bitRead(KeeLoq_NLF, index) ^ keyBitVal
-        x = (x >> 1) ^ bitVal << 31
-    return x
+def parse_hex_param(call_data: dict, param_name: str, default_value: str) -> int:
+    """Parse a hex parameter from call data."""
+    return int(call_data.get(param_name, default_value), 16)
 
 
-def decrypt(x: int, keyHigh: int, keyLow: int) -> int:
-    """Decrypt a value using the KeeLoq algorithm.
+async def async_send_remote_command(
+    hass: HomeAssistant, remote_entity_id: str, packet: str
+) -> None:
+    """Send a command via the remote entity."""
+    await hass.services.async_call(
+        "remote",
+        "send_command",
+        {"entity_id": remote_entity_id, "command": [packet]},
+        blocking=True,
+    )
 
-    This is the inverse operation of the encrypt function, performing 528 rounds
-    of decryption in reverse order.
 
-    Args:
-        x: 32-bit value to decrypt
-        keyHigh: High 32 bits of the 64-bit key
-        keyLow: Low 32 bits of the 64-bit key
+async def async_send_remote_commands(
+    hass: HomeAssistant, remote_entity_id: str, packets: list[str], delay: float
+) -> None:
+    """Send several commands via the remote entity in a single service call.
 
-    Returns:
-        Decrypted 32-bit value
+    The remote waits delay seconds between the commands (delay_secs).
     """
-    KeeLoq_NLF = 0x3A5C742E  # Non-linear function lookup table
-    for r in range(0, 528):
-        keyBitNo = (15 - r) & 63
-        if keyBitNo < 32:
-            keyBitVal = bitRead(keyLow, keyBitNo)
-        else:
-            keyBitVal = bitRead(keyHigh, keyBitNo - 32)
-        index = (
-            1 * bitRead(x, 0)
-            + 2 * bitRead(x, 8)
-            + 4 * bitRead(x, 19)
-            + 8 * bitRead(x, 25)
-            + 16 * bitRead(x, 30)
-        )
-        bitVal = (
-            bitRead(x, 31) ^ bitRead(x, 15) ^ bitRead(KeeLoq_NLF, index) ^ keyBitVal
-        )
-        x = ((x << 1) & 0xFFFFFFFF) ^ bitVal
-    return x
+    await hass.services.async_call(
+        "remote",
+        "send_command",
+        {"entity_id": remote_entity_id, "command": packets, "delay_secs": delay},
+        blocking=True,
+    )
 
 
-def BuildPacket(
+async def _async_send_packets_with_counter(
+    hass: HomeAssistant,
+    remote_entity_id: str,
+    counter_file: str,
     Grouping: int,
     Serial: int,
     Button: int,
@@ -169,191 +181,524 @@ def BuildPacket(
     MSB: int,
     LSB: int,
     Hold: bool,
-) -> str:
-    """Build a KeeLoq encrypted packet for RF transmission.
-
-    This function creates a complete packet that can be sent to a Jarolift cover:
-    1. Derives device-specific keys from the serial number
-    2. Encrypts the counter and device information using KeeLoq
-    3. Assembles the complete 72-bit packet
-    4. Encodes it in the Jarolift RF format
-    5. Returns a base64-encoded string for transmission
+    send_count: int,
+    rep_delay: float,
+    repeat_mode: str = DEFAULT_REPEAT_MODE,
+    counter_policy: str = DEFAULT_COUNTER_POLICY,
+) -> None:
+    """Send packets with automatic counter management.
 
     Args:
-        Grouping: Group number for the cover (0x0000-0xFFFF)
-        Serial: Serial number of the cover (unique identifier)
-        Button: Button code (0x2=down, 0x4=stop, 0x8=up, 0xA=learn)
-        Counter: Rolling counter value for replay protection
-        MSB: Manufacturer key (high 32 bits)
-        LSB: Manufacturer key (low 32 bits)
-        Hold: If True, button is held down (for programming)
-
-    Returns:
-        Base64-encoded packet string prefixed with "b64:"
+        hass: Home Assistant instance
+        remote_entity_id: Remote entity to use for transmission
+        counter_file: Base path for counter files
+        Grouping: Device group
+        Serial: Device serial
+        Button: Button code to send
+        Counter: Counter value (0 for auto-increment)
+        MSB: Manufacturer key MSB
+        LSB: Manufacturer key LSB
+        Hold: Whether to hold the button
+        send_count: Number of times to send the packet
+        rep_delay: Delay between repeated sends
+        repeat_mode: How repeats are handed to the remote (REPEAT_MODES)
+        counter_policy: How the repeats use counter values (COUNTER_POLICIES)
     """
-    # Generate device keys from serial
-    keylow = Serial | KEELOQ_KEY_LOW_MASK
-    keyhigh = Serial | KEELOQ_KEY_HIGH_MASK
-    KeyLSB = decrypt(keylow, MSB, LSB)
-    KeyMSB = decrypt(keyhigh, MSB, LSB)
-
-    # Build the decoded packet with counter, serial, and grouping
-    Decoded = Counter | ((Serial & 0xFF) << 16) | ((Grouping & 0xFF) << 24)
-    Encoded = encrypt(Decoded, KeyMSB, KeyLSB)
-
-    # Assemble the complete data packet
-    data = Encoded | (Serial << 32) | (Button << 60) | (((Grouping >> 8) & 0xFF) << 64)
-
-    # Convert to binary string and encode
-    datastring = bin(data)[2:].zfill(KEELOQ_PACKET_BITS)[::-1]
-    codedstring = _encode_keeloq_bits(datastring)
+    key = (Grouping, Serial, Button, MSB, LSB, Hold)
+    packet_cache = _get_packet_cache(hass)
+    counter_policy = _repeat_counter_policy(repeat_mode, counter_policy)
+    if Counter == 0:
+        # Use and increment the stored counter, taking precomputed packets
+        # from the cache where available
+        offsets = repeat_counter_offsets(counter_policy, send_count)
+        base_counter = await _async_reserve_counters(
+            hass, counter_file, Serial, Grouping, max(offsets) + 1
+        )
+        counters = [base_counter + offset for offset in offsets]
+        built = {
+            counter: packet_cache.pop(key, counter) for counter in sorted(set(counters))
+        }
+        missing = [counter for counter, packet in built.items() if packet is None]
+    else:
+        # User provided explicit counter, send same packet multiple times
+        counters = [Counter] * send_count
+        built = {}
+        missing = [Counter]
+    if missing:
+        # The cipher never runs on the event loop, cache misses included
+        built.update(
+            await hass.async_add_executor_job(packet_cache.build_window, key, missing)
+        )
+    packets = [built[counter] for counter in counters]
 
-    # Add preamble and packet wrapper
-    codedstring = KEELOQ_PREAMBLE + codedstring
-    packet_prefix = KEELOQ_HOLD_PREFIX if Hold else KEELOQ_NORMAL_PREFIX
-    packet_length = hex(len(codedstring) // 2)[2:]
-    codedstring = packet_prefix + packet_length + "00" + codedstring
+    for i, counter in enumerate(counters):
+        _LOGGER.debug(
+            f"Sending: {Button} group: 0x{Grouping:04X} Serial: 0x{Serial:08X} counter: {counter} repeat: {i}"
+        )
 
-    # Encode to base64
-    packet = base64.b64encode(binascii.unhexlify(codedstring))
-    return "b64:" + packet.decode("utf-8")
+    await _async_transmit_packets(
+        hass, remote_entity_id, packets, rep_delay, repeat_mode
+    )
 
+    if Counter == 0:
+        # The frames are out, prepare the packets for the next commands
+        hass.async_create_task(_async_refill_packet_cache(hass, counter_file, key))
 
-def _encode_keeloq_bits(datastring: str) -> str:
-    """Encode a binary string into KeeLoq format.
 
-    Args:
-        datastring: Binary string to encode
+def _repeat_counter_policy(repeat_mode: str, counter_policy: str) -> str:
+    """Return the counter policy the repeats of a command are sent with.
 
-    Returns:
-        Hex-encoded string in KeeLoq format
+    The blaster can only repeat identical frames, so hardware repeats always
+    use one counter; any other policy would fall back to a batch call.
     """
-    codedstring = ""
-    last_bit_index = len(datastring) - 1
-
-    for i, bit in enumerate(datastring):
-        is_last_bit = i == last_bit_index
-        is_one = bit == "1"
-
-        if is_last_bit:
-            codedstring += KEELOQ_BIT_ONE_LAST if is_one else KEELOQ_BIT_ZERO_LAST
-        else:
-            codedstring += KEELOQ_BIT_ONE if is_one else KEELOQ_BIT_ZERO
-
-    return codedstring
+    if repeat_mode == REPEAT_MODE_HARDWARE and counter_policy != COUNTER_POLICY_SAME:
+        _LOGGER.debug(
+            "Repeat mode %s sends its repeats with counter policy %s instead of %s",
+            repeat_mode,
+            COUNTER_POLICY_SAME,
+            counter_policy,
+        )
+        return COUNTER_POLICY_SAME
+    return counter_policy
 
 
-def ReadCounter(counter_file: str, serial: int) -> int:
-    """Read the counter value for a serial from file.
+def _estimate_airtime(frames: int, gaps: float = 0, Hold: bool = False) -> float:
+    """Return the seconds a command keeps the transmitter busy.
 
     Args:
-        counter_file: Base path for counter files
-        serial: Serial number of the device
-
-    Returns:
-        Current counter value, or 0 if file doesn't exist
+        frames: Number of frames sent
+        gaps: Total pause between the frames in seconds
+        Hold: Whether the frames are held (repeated by the transmitter)
     """
-    filename = f"{counter_file}{hex(serial)}.txt"
-    if os.path.isfile(filename):
-        with open(filename, encoding="utf-8") as fo:
-            return int(fo.readline().strip())
-    return 0
+    return frames * (HOLD_FRAME_AIRTIME if Hold else FRAME_AIRTIME) + gaps
 
 
-def WriteCounter(counter_file: str, serial: int, Counter: int) -> None:
-    """Write the counter value for a serial to file.
+def _command_priority(call_data: dict, buttons: list[int]) -> int:
+    """Return the transmit priority of a command.
 
-    Args:
-        counter_file: Base path for counter files
-        serial: Serial number of the device
-        Counter: Counter value to write
+    Stops are sent before waiting open and close commands unless the call
+    sets a priority.
     """
-    filename = f"{counter_file}{hex(serial)}.txt"
-    with open(filename, "w", encoding="utf-8") as fo:
-        fo.write(str(Counter))
+    default = (
+        PRIORITY_STOP
+        if buttons and all(button == BUTTON_STOP for button in buttons)
+        else PRIORITY_NORMAL
+    )
+    return int(call_data.get("priority", default))
 
 
-def get_counter_value(counter_file: str, serial: int, call_data_counter: str) -> int:
-    """
-    Get the counter value to use for a command.
-    Returns the appropriate counter based on whether a specific counter was provided.
-    """
-    provided_counter = int(call_data_counter, 16)
-    return (
-        ReadCounter(counter_file, serial) if provided_counter == 0 else provided_counter
-    )
+def _group_targets(
+    targets: list[tuple[int, int, int]],
+) -> dict[tuple[int, int], list[int]]:
+    """Return the group masks of the targets by serial and button, in order."""
+    groups: dict[tuple[int, int], list[int]] = {}
+    for Grouping, Serial, Button in targets:
+        groups.setdefault((Serial, Button), []).append(Grouping)
+    return groups
 
 
-def parse_hex_param(call_data: dict, param_name: str, default_value: str) -> int:
-    """Parse a hex parameter from call data."""
-    return int(call_data.get(param_name, default_value), 16)
+def _merge_group_targets(
+    targets: list[tuple[int, int, int]],
+) -> list[tuple[int, int, int]]:
+    """Merge targets with the same serial and button into one group target.
 
+    A merged target takes the place of the first of its targets.
+    """
+    merged = []
+    for (Serial, Button), groups in _group_targets(targets).items():
+        Grouping = 0
+        for group in groups:
+            Grouping |= group
+        merged.append((Grouping, Serial, Button))
+    return merged
 
-def send_remote_command(
-    hass: HomeAssistant, remote_entity_id: str, packet: str
-) -> None:
-    """Send a command via the remote entity."""
-    hass.services.call(
-        "remote",
-        "send_command",
-        {"entity_id": remote_entity_id, "command": [packet]},
-    )
 
+def _bulk_members(targets: list[tuple[int, int, int]]) -> dict[tuple[int, int], int]:
+    """Return the transmitter members (covers) of bulk targets."""
+    return {(Serial, Grouping): Grouping for Grouping, Serial, _ in targets}
 
-def _send_packets_with_counter(
+
+async def _async_send_packets_many(
     hass: HomeAssistant,
     remote_entity_id: str,
     counter_file: str,
-    Grouping: int,
-    Serial: int,
-    Button: int,
-    Counter: int,
+    targets: list[tuple[int, int, int]],
     MSB: int,
     LSB: int,
     Hold: bool,
     send_count: int,
     rep_delay: float,
+    repeat_mode: str,
+    delay: float,
+    counter_policy: str = DEFAULT_COUNTER_POLICY,
+    frame_gap: float | None = None,
 ) -> None:
-    """Send packets with automatic counter management.
+    """Send a command to many covers with one counter pass and one build.
+
+    Targets sharing a serial and button are merged into one frame with the
+    OR-ed group mask, like queued group commands. The counters of all
+    targets are then reserved together (at most one counter store write),
+    all packets are built by a single executor job and the covers are sent
+    in order, delay seconds apart. With cipher workers
+    configured, large batches are built in worker processes. Between two
+    covers, waiting commands of a higher priority (e.g. a stop) are sent.
+
+    Run from a transmitter job submitted with the _bulk_members() of the
+    targets, covers that got a newer command after the job was queued are
+    left out: a target is skipped, or rebuilt for the group mask of the
+    covers still in it, right before it is sent. Their reserved counters
+    are not reused.
+
+    With a frame_gap, the frames of all covers are instead packed into as
+    few remote packets as possible, frame_gap seconds apart. The repeats
+    are sent in rounds over all covers, so rep_delay, repeat_mode and delay
+    are not used. Otherwise hardware repeats always use one counter (see
+    _repeat_counter_policy).
 
     Args:
         hass: Home Assistant instance
         remote_entity_id: Remote entity to use for transmission
         counter_file: Base path for counter files
-        Grouping: Device group
-        Serial: Device serial
-        Button: Button code to send
-        Counter: Counter value (0 for auto-increment)
+        targets: (Grouping, Serial, Button) of every cover
         MSB: Manufacturer key MSB
         LSB: Manufacturer key LSB
         Hold: Whether to hold the button
-        send_count: Number of times to send the packet
+        send_count: Number of times to send each packet
         rep_delay: Delay between repeated sends
+        repeat_mode: How repeats are handed to the remote (REPEAT_MODES)
+        delay: Delay between two covers
+        counter_policy: How the repeats use counter values (COUNTER_POLICIES)
+        frame_gap: Gap between packed frames in seconds (None to not pack)
     """
-    if Counter == 0:
-        # Use and increment the stored counter
-        base_counter = ReadCounter(counter_file, Serial)
-        for i in range(send_count):
-            packet = BuildPacket(
-                Grouping, Serial, Button, base_counter + i, MSB, LSB, Hold
-            )
+    groups = list(_group_targets(targets).values())
+    targets = _merge_group_targets(targets)
+    if frame_gap is None:
+        counter_policy = _repeat_counter_policy(repeat_mode, counter_policy)
+    offsets = repeat_counter_offsets(counter_policy, send_count)
+    needed = max(offsets) + 1
+    base_counters = await _async_reserve_counters_batch(
+        hass,
+        counter_file,
+        [(Serial, Grouping, needed) for Grouping, Serial, _ in targets],
+    )
+    frames = [
+        (Grouping, Serial, Button, base_counter + i)
+        for (Grouping, Serial, Button), base_counter in zip(
+            targets, base_counters, strict=True
+        )
+        for i in range(needed)
+    ]
+    packets = await hass.async_add_executor_job(
+        _get_cipher_pool(hass).map_chunks, build_packets_batch, frames, MSB, LSB, Hold
+    )
+
+    transmitter = _get_transmitter(hass, remote_entity_id)
+    target_packets = [
+        packets[index * needed : (index + 1) * needed] for index in range(len(targets))
+    ]
+
+    async def async_refresh(index: int) -> bool:
+        """Drop superseded covers from a target; False if none is left."""
+        Grouping, Serial, Button = targets[index]
+        live = 0
+        for group in groups[index]:
+            if not transmitter.is_superseded((Serial, group)):
+                live |= group
+        if live == Grouping:
+            return True
+        targets[index] = (live, Serial, Button)
+        if not live:
             _LOGGER.debug(
-                f"Sending: {Button} group: 0x{Grouping:04X} Serial: 0x{Serial:08X} counter: {base_counter + i} repeat: {i}"
+                f"Skipping Serial: 0x{Serial:08X} group: 0x{Grouping:04X}, superseded"
             )
-            send_remote_command(hass, remote_entity_id, packet)
-            if i < send_count - 1:
-                sleep(rep_delay)
-        WriteCounter(counter_file, Serial, base_counter + send_count)
-    else:
-        # User provided explicit counter, send same packet multiple times
-        for i in range(send_count):
-            packet = BuildPacket(Grouping, Serial, Button, Counter, MSB, LSB, Hold)
-            _LOGGER.debug(
-                f"Sending: {Button} group: 0x{Grouping:04X} Serial: 0x{Serial:08X} counter: {Counter} repeat: {i}"
+            return False
+        target_packets[index] = await hass.async_add_executor_job(
+            build_packets_batch,
+            [(live, Serial, Button, base_counters[index] + i) for i in range(needed)],
+            MSB,
+            LSB,
+            Hold,
+        )
+        return True
+
+    if frame_gap is not None:
+        rounds = [
+            (index, offset) for offset in offsets for index in range(len(targets))
+        ]
+        per_packet = frames_per_packet_b64(packets[0])
+        _LOGGER.debug(f"Sending {len(rounds)} frames for {len(targets)} covers")
+        sent = False
+        while rounds:
+            if sent:
+                await transmitter.async_run_urgent()
+            live = [
+                index
+                for index in dict.fromkeys(i for i, _ in rounds)
+                if await async_refresh(index)
+            ]
+            rounds = [(i, offset) for i, offset in rounds if i in live]
+            if not rounds:
+                break
+            chunk, rounds = rounds[:per_packet], rounds[per_packet:]
+            for packet in pack_frames_b64(
+                [target_packets[i][offset] for i, offset in chunk], frame_gap
+            ):
+                await async_send_remote_command(hass, remote_entity_id, packet)
+            sent = True
+        return
+
+    pause = False
+    for index in range(len(targets)):
+        if index:
+            if pause:
+                await asyncio.sleep(delay)
+                pause = False
+            await transmitter.async_run_urgent()
+        if not await async_refresh(index):
+            continue
+        Grouping, Serial, Button = targets[index]
+        pause = True
+        _LOGGER.debug(
+            f"Sending: {Button} group: 0x{Grouping:04X} Serial: 0x{Serial:08X} counter: {base_counters[index]} batch: {index}"
+        )
+        await _async_transmit_packets(
+            hass,
+            remote_entity_id,
+            [target_packets[index][offset] for offset in offsets],
+            rep_delay,
+            repeat_mode,
+        )
+
+
+async def _async_transmit_packets(
+    hass: HomeAssistant,
+    remote_entity_id: str,
+    packets: list[str],
+    rep_delay: float,
+    repeat_mode: str,
+) -> None:
+    """Send the repeated packets of one command via the remote entity."""
+    if repeat_mode == REPEAT_MODE_HARDWARE:
+        # Same-counter repeats go into the packet header, the blaster sends
+        # them back to back; distinct frames still need their own packets
+        packets = fold_repeats_b64(packets)
+        if len(packets) == 1:
+            await async_send_remote_command(hass, remote_entity_id, packets[0])
+            return
+    if repeat_mode != REPEAT_MODE_SEPARATE and len(packets) > 1:
+        # Hand all repeats to the remote at once, it does the spacing
+        await async_send_remote_commands(hass, remote_entity_id, packets, rep_delay)
+        return
+
+    for i, packet in enumerate(packets):
+        await async_send_remote_command(hass, remote_entity_id, packet)
+        if i < len(packets) - 1:
+            await asyncio.sleep(rep_delay)
+
+
+async def _async_get_counter_store(
+    hass: HomeAssistant,
+    counter_file: str,
+    block_size: int = DEFAULT_COUNTER_BLOCK_SIZE,
+    fsync: str = DEFAULT_COUNTER_FSYNC,
+) -> CounterStore:
+    """Return the counter store, loading it from disk on first use.
+
+    The store lives next to the legacy counter files and imports them on
+    the first load. block_size and fsync only apply when the store is
+    created.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    lock = domain_data.setdefault("counter_lock", asyncio.Lock())
+    async with lock:
+        if "counter_store" not in domain_data:
+            store = CounterStore(
+                os.path.join(os.path.dirname(counter_file), COUNTER_STORE_FILE),
+                legacy_prefix=counter_file,
+                block_size=block_size,
+                fsync=fsync,
+            )
+            await hass.async_add_executor_job(store.load)
+            domain_data["counter_store"] = store
+    return domain_data["counter_store"]
+
+
+async def _async_reserve_counters(
+    hass: HomeAssistant, counter_file: str, Serial: int, Grouping: int, count: int
+) -> int:
+    """Reserve a block of consecutive counter values for a serial.
+
+    The counter is advanced in memory first, so commands for the same serial
+    on different remotes never reuse a counter value. If the new counters are
+    not covered by a persisted reservation yet, the store is written before
+    any frame is sent; reservations made while a write is in progress are
+    persisted together by the next write. That write is flushed to disk in
+    the background, as are renewals of blocks that are more than half used,
+    while the frames are sent.
+
+    Args:
+        hass: Home Assistant instance
+        counter_file: Base path for counter files
+        Serial: Device serial
+        Grouping: Group mask the counters are sent with (for the usage tally)
+        count: Number of counter values to reserve
+
+    Returns:
+        First reserved counter value
+    """
+    base_counters = await _async_reserve_counters_batch(
+        hass, counter_file, [(Serial, Grouping, count)]
+    )
+    return base_counters[0]
+
+
+async def _async_reserve_counters_batch(
+    hass: HomeAssistant, counter_file: str, requests: list[tuple[int, int, int]]
+) -> list[int]:
+    """Reserve counter blocks for several serials with a single store write.
+
+    A serial may appear more than once; its blocks follow each other in the
+    order of requests.
+
+    Args:
+        hass: Home Assistant instance
+        counter_file: Base path for counter files
+        requests: (Serial, Grouping, count) of every block to reserve; the
+            group mask only attributes the counters to covers in the usage
+            tally
+
+    Returns:
+        First reserved counter value of every request
+    """
+    store = await _async_get_counter_store(hass, counter_file)
+    base_counters = [store.reserve(Serial, count) for Serial, _, count in requests]
+    usage = _get_counter_usage(hass)
+    today = dt_util.now().date()
+    for Serial, Grouping, count in requests:
+        usage.record(Serial, Grouping, count, today)
+    async with hass.data[DOMAIN]["counter_lock"]:
+        if store.dirty:
+            await hass.async_add_executor_job(store.write, store.serialize(), True)
+    if store.renewal_due or store.sync_pending:
+        hass.async_create_task(_async_flush_counters(hass))
+    return base_counters
+
+
+async def _async_resync_counters(
+    hass: HomeAssistant, counter_file: str, counters: dict[int, int]
+) -> dict[int, int]:
+    """Fast-forward stored counters, e.g. to the counters of captured frames.
+
+    Counters only move forward; a serial whose stored counter is already at
+    or past the requested one is left alone.
+
+    Args:
+        hass: Home Assistant instance
+        counter_file: Base path for counter files
+        counters: Next counter value to use per serial
+
+    Returns:
+        The counters that were advanced, per serial
+    """
+    store = await _async_get_counter_store(hass, counter_file)
+    advanced = {}
+    for Serial, Counter in counters.items():
+        if Counter > store.get(Serial):
+            store.set(Serial, Counter)
+            advanced[Serial] = Counter
+    async with hass.data[DOMAIN]["counter_lock"]:
+        if store.dirty:
+            await hass.async_add_executor_job(store.write, store.serialize())
+    return advanced
+
+
+async def _async_flush_counters(hass: HomeAssistant, release: bool = False) -> None:
+    """Write pending counter changes of the store and flush deferred writes.
+
+    Args:
+        hass: Home Assistant instance
+        release: Store the exact counters instead of the reservation limits
+            (on shutdown, when no more counters are handed out)
+    """
+    domain_data = hass.data.get(DOMAIN, {})
+    store = domain_data.get("counter_store")
+    if store is None:
+        return
+    async with domain_data["counter_lock"]:
+        if release:
+            store.release_reservations()
+        else:
+            store.extend_reservations()
+        if store.dirty:
+            await hass.async_add_executor_job(store.write, store.serialize())
+        if store.sync_pending:
+            await hass.async_add_executor_job(store.sync)
+
+
+def _get_transmitter(hass: HomeAssistant, remote_entity_id: str) -> JaroliftTransmitter:
+    """Return the transmit pipeline of a remote entity, creating it if needed.
+
+    Each remote entity has its own queue and inter-cover delay, so commands
+    for covers behind different RF blasters are sent concurrently.
+    """
+    transmitters = hass.data.setdefault(DOMAIN, {}).setdefault("transmitters", {})
+    if remote_entity_id not in transmitters:
+        transmitters[remote_entity_id] = JaroliftTransmitter(hass, remote_entity_id)
+    return transmitters[remote_entity_id]
+
+
+def _get_counter_usage(hass: HomeAssistant) -> CounterUsage:
+    """Return the per-day tally of consumed counters, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "counter_usage" not in domain_data:
+        domain_data["counter_usage"] = CounterUsage()
+    return domain_data["counter_usage"]
+
+
+def _get_cipher_pool(hass: HomeAssistant) -> CipherPool:
+    """Return the pool for bulk KeeLoq work (in-process unless configured)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "cipher_pool" not in domain_data:
+        domain_data["cipher_pool"] = CipherPool(DEFAULT_CIPHER_WORKERS)
+    return domain_data["cipher_pool"]
+
+
+def _get_packet_cache(hass: HomeAssistant) -> PacketCache:
+    """Return the cache of precomputed packets, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if "packet_cache" not in domain_data:
+        domain_data["packet_cache"] = PacketCache(BuildPacket)
+    return domain_data["packet_cache"]
+
+
+async def _async_refill_packet_cache(
+    hass: HomeAssistant, counter_file: str, key: tuple
+) -> None:
+    """Build the packets for the next counters of a serial in an executor.
+
+    The counter of a serial moves for every command sent with it, so the
+    windows of all cached commands of the serial are renewed, starting with
+    the command just sent. Only one refill per serial runs at a time.
+    """
+    Serial = key[1]
+    refills = hass.data.setdefault(DOMAIN, {}).setdefault("packet_refills", set())
+    if Serial in refills:
+        return
+    refills.add(Serial)
+    try:
+        packet_cache = _get_packet_cache(hass)
+        store = await _async_get_counter_store(hass, counter_file)
+        keys = [key] + [k for k in packet_cache.keys_for_serial(Serial) if k != key]
+        for cached_key in keys:
+            counters = packet_cache.missing(cached_key, store.get(Serial))
+            if not counters:
+                continue
+            packets = await hass.async_add_executor_job(
+                packet_cache.build_window, cached_key, counters
             )
-            send_remote_command(hass, remote_entity_id, packet)
-            if i < send_count - 1:
-                sleep(rep_delay)
+            packet_cache.add(cached_key, store.get(Serial), packets)
+    finally:
+        refills.discard(Serial)
 
 
 def _parse_hex_config_value(value: str) -> int:
@@ -439,8 +784,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         CONF_COVERS: entry.options.get(CONF_COVERS, []),
     }
 
-    # Set up services
+    # Load the counter store (and migrate legacy counter files) up front
     counter_file = hass.config.path("counter_")
+    block_size = entry.data.get(CONF_COUNTER_BLOCK_SIZE, DEFAULT_COUNTER_BLOCK_SIZE)
+    fsync = entry.data.get(CONF_COUNTER_FSYNC, DEFAULT_COUNTER_FSYNC)
+    store = await _async_get_counter_store(hass, counter_file, block_size, fsync)
+    store.block_size = block_size
+    store.fsync = fsync
+    await _async_flush_counters(hass)
+
+    if store.block_size:
+        # Write-behind: renew reservations in the background and store the
+        # exact counters when Home Assistant stops
+        async def _async_periodic_flush(now) -> None:
+            await _async_flush_counters(hass)
+
+        async def _async_flush_on_stop(event) -> None:
+            await _async_flush_counters(hass, release=True)
+
+        flush_interval = entry.data.get(
+            CONF_COUNTER_FLUSH_INTERVAL, DEFAULT_COUNTER_FLUSH_INTERVAL
+        )
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _async_periodic_flush, timedelta(seconds=flush_interval)
+            )
+        )
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_on_stop)
+        )
+
+    # Bulk packet building in worker processes (opt-in)
+    old_pool = hass.data[DOMAIN].pop("cipher_pool", None)
+    if old_pool is not None:
+        await hass.async_add_executor_job(old_pool.shutdown)
+    hass.data[DOMAIN]["cipher_pool"] = CipherPool(
+        entry.data.get(CONF_CIPHER_WORKERS, DEFAULT_CIPHER_WORKERS)
+    )
+
+    # Set up services
     await _register_services(
         hass,
         entry.data[CONF_REMOTE_ENTITY_ID],
@@ -465,6 +847,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Queued commands were built for the old settings, drop them
+        transmitters = hass.data[DOMAIN].pop("transmitters", {})
+        for transmitter in transmitters.values():
+            await transmitter.async_shutdown()
+        await _async_flush_counters(hass, release=True)
+        cipher_pool = hass.data[DOMAIN].pop("cipher_pool", None)
+        if cipher_pool is not None:
+            await hass.async_add_executor_job(cipher_pool.shutdown)
 
     return unload_ok
 
@@ -488,12 +878,18 @@ async def _register_services(
     if hass.services.has_service(DOMAIN, "send_raw"):
         return
 
-    def handle_send_raw(call):
-        with mutex:
-            packet = call.data.get("packet", "")
-            send_remote_command(hass, remote_entity_id, packet)
+    async def handle_send_raw(call):
+        packet = call.data.get("packet", "")
+        remote = call.data.get(CONF_REMOTE_ENTITY_ID, remote_entity_id)
+
+        async def transmit():
+            await async_send_remote_command(hass, remote, packet)
+
+        await _get_transmitter(hass, remote).async_submit(
+            transmit, airtime=_estimate_airtime(1)
+        )
 
-    def handle_send_command(call):
+    async def handle_send_command(call):
         Grouping = parse_hex_param(call.data, "group", "0x0001")
         Serial = parse_hex_param(call.data, "serial", "0x106aa01")
         rep_count = call.data.get("rep_count", 0)
@@ -501,16 +897,24 @@ async def _register_services(
         Button = parse_hex_param(call.data, "button", "0x2")
         Hold = call.data.get("hold", False)
         Counter = parse_hex_param(call.data, "counter", "0x0000")
-
-        # Mutex used so that only one cover will be set when having rep_count > 0
-        with mutex:
-            # We want to send at least once, so rep_count 0 means send once
-            send_count = rep_count + 1
-            _send_packets_with_counter(
+        remote = call.data.get(CONF_REMOTE_ENTITY_ID, remote_entity_id)
+        repeat_mode = call.data.get(CONF_REPEAT_MODE, DEFAULT_REPEAT_MODE)
+        counter_policy = call.data.get(CONF_COUNTER_POLICY, DEFAULT_COUNTER_POLICY)
+
+        # We want to send at least once, so rep_count 0 means send once
+        send_count = rep_count + 1
+        schedule = {
+            "priority": _command_priority(call.data, [Button]),
+            "deadline": call.data.get("deadline"),
+            "airtime": _estimate_airtime(send_count, rep_count * rep_delay, Hold),
+        }
+
+        async def transmit(grouping=Grouping):
+            await _async_send_packets_with_counter(
                 hass,
-                remote_entity_id,
+                remote,
                 counter_file,
-                Grouping,
+                grouping,
                 Serial,
                 Button,
                 Counter,
@@ -519,64 +923,209 @@ async def _register_services(
                 Hold,
                 send_count,
                 rep_delay,
+                repeat_mode,
+                counter_policy,
+            )
+
+        # The transmitter runs one cover at a time (so repeats of a cover are
+        # not interleaved) and waits DELAY, the minimum delay between
+        # multiple different covers, before the next one
+        transmitter = _get_transmitter(hass, remote)
+        if Counter:
+            # An explicit counter is sent exactly as requested
+            await transmitter.async_submit(transmit, DELAY, **schedule)
+            return
+
+        # Covers sharing a serial receive one frame with the OR-ed group mask
+        # if their commands are still waiting for the transmitter, and a
+        # newer command for a cover replaces its older waiting one
+        key = (
+            Serial,
+            Button,
+            Hold,
+            send_count,
+            rep_delay,
+            repeat_mode,
+            counter_policy,
+        )
+        await transmitter.async_submit_grouped(
+            key, Grouping, transmit, DELAY, member=(Serial, Grouping), **schedule
+        )
+
+    async def handle_send_command_many(call):
+        default_button = call.data.get("button", "0x2")
+        targets = [
+            (
+                parse_hex_param(target, "group", "0x0001"),
+                parse_hex_param(target, "serial", "0x106aa01"),
+                parse_hex_param(target, "button", default_button),
+            )
+            for target in call.data.get("targets", [])
+        ]
+        rep_count = call.data.get("rep_count", 0)
+        rep_delay = call.data.get("rep_delay", 0.2)
+        Hold = call.data.get("hold", False)
+        remote = call.data.get(CONF_REMOTE_ENTITY_ID, remote_entity_id)
+        repeat_mode = call.data.get(CONF_REPEAT_MODE, DEFAULT_REPEAT_MODE)
+        counter_policy = call.data.get(CONF_COUNTER_POLICY, DEFAULT_COUNTER_POLICY)
+        frame_gap = (
+            call.data.get("frame_gap", FRAME_GAP)
+            if call.data.get("pack_frames", False)
+            else None
+        )
+        if not targets:
+            return
+
+        async def transmit():
+            await _async_send_packets_many(
+                hass,
+                remote,
+                counter_file,
+                targets,
+                MSB,
+                LSB,
+                Hold,
+                rep_count + 1,
+                rep_delay,
+                repeat_mode,
+                DELAY,
+                counter_policy,
+                frame_gap,
             )
-            # This is the minimum delay between multiple different covers
-            sleep(DELAY)
 
-    def handle_learn(call):
+        # One job for all covers, so no other command of the same priority
+        # interleaves with them
+        frames_per_round = len(_merge_group_targets(targets))
+        if frame_gap is None:
+            airtime = _estimate_airtime(rep_count + 1, rep_count * rep_delay, Hold)
+            airtime = frames_per_round * (airtime + DELAY) - DELAY
+        else:
+            frames = frames_per_round * (rep_count + 1)
+            # A frame's airtime includes the default gap after it
+            gaps = frames * (frame_gap - FRAME_GAP)
+            airtime = _estimate_airtime(frames, gaps, Hold)
+        # Registered as the latest command of every cover, so a newer
+        # command for one of them (e.g. a stop) takes it out of the job
+        await _get_transmitter(hass, remote).async_submit(
+            transmit,
+            DELAY,
+            members=_bulk_members(targets),
+            priority=_command_priority(call.data, [t[2] for t in targets]),
+            deadline=call.data.get("deadline"),
+            airtime=airtime,
+        )
+
+    async def handle_learn(call):
         Grouping = parse_hex_param(call.data, "group", "0x0001")
         Serial = parse_hex_param(call.data, "serial", "0x106aa01")
         Counter = parse_hex_param(call.data, "counter", "0x0000")
-        UsedCounter = get_counter_value(
-            counter_file, Serial, call.data.get("counter", "0x0000")
-        )
-        packet = BuildPacket(
-            Grouping, Serial, BUTTON_LEARN, UsedCounter, MSB, LSB, False
-        )
+        remote = call.data.get(CONF_REMOTE_ENTITY_ID, remote_entity_id)
 
-        with mutex:
-            send_remote_command(hass, remote_entity_id, packet)
-            sleep(1)
-            packet = BuildPacket(
-                Grouping, Serial, BUTTON_STOP, UsedCounter + 1, MSB, LSB, False
+        async def transmit():
+            UsedCounter = Counter or await _async_reserve_counters(
+                hass, counter_file, Serial, Grouping, 2
+            )
+            learn, stop = await hass.async_add_executor_job(
+                build_packets_batch,
+                [
+                    (Grouping, Serial, BUTTON_LEARN, UsedCounter),
+                    (Grouping, Serial, BUTTON_STOP, UsedCounter + 1),
+                ],
+                MSB,
+                LSB,
             )
-            send_remote_command(hass, remote_entity_id, packet)
-            if Counter == 0:
-                RCounter = ReadCounter(counter_file, Serial)
-                WriteCounter(counter_file, Serial, RCounter + 2)
+            await async_send_remote_command(hass, remote, learn)
+            await asyncio.sleep(1)
+            await async_send_remote_command(hass, remote, stop)
 
-    def handle_clear(call):
+        await _get_transmitter(hass, remote).async_submit(
+            transmit, airtime=_estimate_airtime(2, 1)
+        )
+
+    async def handle_clear(call):
         Grouping = parse_hex_param(call.data, "group", "0x0001")
         Serial = parse_hex_param(call.data, "serial", "0x106aa01")
         Counter = parse_hex_param(call.data, "counter", "0x0000")
-        UsedCounter = get_counter_value(
-            counter_file, Serial, call.data.get("counter", "0x0000")
+        remote = call.data.get(CONF_REMOTE_ENTITY_ID, remote_entity_id)
+
+        async def transmit():
+            UsedCounter = Counter or await _async_reserve_counters(
+                hass, counter_file, Serial, Grouping, 8
+            )
+            buttons = [BUTTON_LEARN] + [BUTTON_STOP] * 6 + [BUTTON_UP]
+            packets = await hass.async_add_executor_job(
+                build_packets_batch,
+                [
+                    (Grouping, Serial, button, UsedCounter + i)
+                    for i, button in enumerate(buttons)
+                ],
+                MSB,
+                LSB,
+            )
+            await async_send_remote_command(hass, remote, packets[0])
+            await asyncio.sleep(1)
+            for packet in packets[1:7]:
+                await async_send_remote_command(hass, remote, packet)
+                await asyncio.sleep(0.5)
+            await asyncio.sleep(1)
+            await async_send_remote_command(hass, remote, packets[7])
+
+        await _get_transmitter(hass, remote).async_submit(
+            transmit, airtime=_estimate_airtime(8, 5)
         )
-        packet = BuildPacket(
-            Grouping, Serial, BUTTON_LEARN, UsedCounter, MSB, LSB, False
+
+    async def handle_resync_counter(call):
+        packets = call.data.get("packet", [])
+        if isinstance(packets, str):
+            packets = [packets]
+        only_serial = (
+            parse_hex_param(call.data, "serial", "0x0")
+            if "serial" in call.data
+            else None
         )
 
-        with mutex:
-            send_remote_command(hass, remote_entity_id, packet)
-            sleep(1)
-            for i in range(0, 6):
-                packet = BuildPacket(
-                    Grouping, Serial, BUTTON_STOP, UsedCounter + 1 + i, MSB, LSB, False
-                )
-                send_remote_command(hass, remote_entity_id, packet)
-                sleep(0.5)
-            sleep(1)
-            packet = BuildPacket(
-                Grouping, Serial, BUTTON_UP, UsedCounter + 7, MSB, LSB, False
+        frames = await hass.async_add_executor_job(decode_packets, packets, MSB, LSB)
+        counters: dict[int, int] = {}
+        for frame in frames:
+            if frame is None or only_serial not in (None, frame.serial):
+                continue
+            # The stored counter is the next one to use
+            counters[frame.serial] = max(
+                counters.get(frame.serial, 0), frame.counter + 1
+            )
+        if not counters:
+            _LOGGER.warning(
+                "resync_counter: no Jarolift frame of the configured manufacturer "
+                "key found in %d packet(s)",
+                len(packets),
             )
-            send_remote_command(hass, remote_entity_id, packet)
-            if Counter == 0:
-                RCounter = ReadCounter(counter_file, Serial)
-                WriteCounter(counter_file, Serial, RCounter + 8)
+            return
+
+        advanced = await _async_resync_counters(hass, counter_file, counters)
+        for Serial, Counter in counters.items():
+            if Serial in advanced:
+                _LOGGER.info(
+                    "Counter of serial %s fast-forwarded to %d", hex(Serial), Counter
+                )
+            else:
+                _LOGGER.info(
+                    "Counter of serial %s is already at or past %d",
+                    hex(Serial),
+                    Counter,
+                )
 
     hass.services.async_register(DOMAIN, "send_raw", handle_send_raw)
-    hass.services.async_register(DOMAIN, "send_command", handle_send_command)
+    hass.services.async_register(
+        DOMAIN, "send_command", handle_send_command, schema=SEND_COMMAND_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "send_command_many",
+        handle_send_command_many,
+        schema=SEND_COMMAND_MANY_SCHEMA,
+    )
     hass.services.async_register(DOMAIN, "learn", handle_learn)
     hass.services.async_register(DOMAIN, "clear", handle_clear)
+    hass.services.async_register(DOMAIN, "resync_counter", handle_resync_counter)
 
     return True
@@ -19,6 +19,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import (
     CONF_COVERS,
     CONF_GROUP,
+    CONF_REMOTE_ENTITY_ID,
     CONF_SERIAL,
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
@@ -48,6 +49,7 @@ async def async_setup_entry(
                 cover[CONF_SERIAL],
                 hass,
                 config_entry.entry_id,
+                cover.get(CONF_REMOTE_ENTITY_ID),
             )
         )
 
@@ -67,6 +69,7 @@ class JaroliftLearnButton(ButtonEntity):
         _serial: Serial number (hex string)
         _hass: Home Assistant instance
         _entry_id: Config entry ID
+        _remote_entity_id: Remote entity override for this cover
     """
 
     def __init__(
@@ -76,6 +79,7 @@ class JaroliftLearnButton(ButtonEntity):
         serial: str,
         hass: HomeAssistant,
         entry_id: str,
+        remote_entity_id: str | None = None,
     ):
         """Initialize the Jarolift learning button entity.
 
@@ -85,12 +89,14 @@ class JaroliftLearnButton(ButtonEntity):
             serial: Serial number (hex string)
             hass: Home Assistant instance
             entry_id: Config entry ID
+            remote_entity_id: Remote entity for this cover (None for hub remote)
         """
         self._cover_name = cover_name
         self._group = group
         self._serial = serial
         self._hass = hass
         self._entry_id = entry_id
+        self._remote_entity_id = remote_entity_id
         self._attr_unique_id = f"jarolift_{serial}_{group}_learn"
         self._attr_name = f"{cover_name} Learn"
 
@@ -113,11 +119,14 @@ class JaroliftLearnButton(ButtonEntity):
         )
 
         # Call the existing jarolift.learn service
+        service_data = {
+            "serial": self._serial,
+            "group": self._group,
+        }
+        if self._remote_entity_id:
+            service_data[CONF_REMOTE_ENTITY_ID] = self._remote_entity_id
         await self._hass.services.async_call(
             DOMAIN,
             "learn",
-            {
-                "serial": self._serial,
-                "group": self._group,
-            },
+            service_data,
         )
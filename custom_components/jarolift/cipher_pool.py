@@ -0,0 +1,127 @@
+"""Optional process pool for bulk KeeLoq work.
+
+The KeeLoq engine is pure Python and holds the GIL, so building hundreds of
+packets in an executor thread still competes with every other thread of Home
+Assistant. A CipherPool spreads such bulk work over worker processes:
+
+- the work is split into chunks, one task per chunk, and the results are
+  concatenated in the original order
+- small batches (a single chunk) are computed in-process, where the pool's
+  pickling and scheduling overhead would dominate
+- if the pool cannot be started or breaks, the work is done in-process and
+  the pool stays disabled, so results never depend on the pool
+
+The functions run in the pool must be importable module-level functions that
+take a list of items and return a list with one result per item (e.g.
+keeloq.encrypt_many). Workers load the core package standalone before their
+first task, so functions of the core run without importing Home Assistant in
+every worker. All methods block and are meant for executor jobs.
+"""
+
+import logging
+import multiprocessing
+import runpy
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pickle import PicklingError
+from typing import Any
+
+from .core.keeloq import decrypt_many, encrypt_many
+from .core.standalone import STANDALONE_PATH
+
+_LOGGER = logging.getLogger(__name__)
+
+# Worker processes for bulk work (0 = always compute in-process)
+DEFAULT_CIPHER_WORKERS = 0
+# Items per task sent to a worker process
+DEFAULT_CIPHER_CHUNK_SIZE = 64
+
+
+class CipherPool:
+    """Run chunked bulk work in worker processes with in-process fallback."""
+
+    def __init__(
+        self, workers: int, chunk_size: int = DEFAULT_CIPHER_CHUNK_SIZE
+    ) -> None:
+        """Initialize the pool; worker processes are started on first use.
+
+        Args:
+            workers: Number of worker processes (0 disables the pool)
+            chunk_size: Items per task sent to a worker process
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Return True if bulk work may be sent to worker processes."""
+        return self.workers > 0 and not self._failed
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting it if needed."""
+        with self._lock:
+            if self._executor is None:
+                # Worker processes are spawned: forking a process with many
+                # threads (like Home Assistant) is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=runpy.run_path,
+                    initargs=(STANDALONE_PATH,),
+                )
+            return self._executor
+
+    def map_chunks(self, func: Callable[..., list], items: list, *args: Any) -> list:
+        """Apply func(chunk, *args) to chunks of items and join the results.
+
+        Args:
+            func: Module-level function returning one result per item
+            items: Items to process
+            *args: Extra arguments passed to every func call
+
+        Returns:
+            Results in the order of items
+        """
+        if not self.available or len(items) <= self.chunk_size:
+            return func(items, *args)
+
+        chunks = [
+            items[start : start + self.chunk_size]
+            for start in range(0, len(items), self.chunk_size)
+        ]
+        try:
+            executor = self._get_executor()
+            futures = [executor.submit(func, chunk, *args) for chunk in chunks]
+            return [result for future in futures for result in future.result()]
+        except (OSError, RuntimeError, PicklingError) as err:
+            # RuntimeError covers BrokenProcessPool and a pool shut down
+            # while in use
+            _LOGGER.warning(
+                "Cipher process pool unavailable, computing in-process: %s", err
+            )
+            self._failed = True
+            self.shutdown()
+            return func(items, *args)
+
+    def encrypt_many(self, items: list[tuple[int, int, int]]) -> list[int]:
+        """Encrypt many (x, keyHigh, keyLow) items, see keeloq.encrypt()."""
+        return self.map_chunks(encrypt_many, items)
+
+    def decrypt_many(self, items: list[tuple[int, int, int]]) -> list[int]:
+        """Decrypt many (x, keyHigh, keyLow) items, see keeloq.decrypt()."""
+        return self.map_chunks(decrypt_many, items)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker processes, dropping queued work.
+
+        Args:
+            wait: Block until the worker processes have exited
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
@@ -9,6 +9,10 @@ Features:
 - Options flow for managing covers (add/edit/remove)
 - Duplicate detection for serial+group combinations
 - Validation of remote entity existence
+- Optional per-cover remote entity for installations with several RF blasters
+- Per-cover repeat mode (one remote call per repeat or all repeats batched)
+- Optional per-cover travel times for position tracking
+- Hub settings for counter persistence (block size, flush interval, fsync)
 
 The flow supports both initial setup and managing covers after integration is configured.
 """
@@ -24,6 +28,11 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from . import (
+    CONF_CIPHER_WORKERS,
+    CONF_COUNTER_BLOCK_SIZE,
+    CONF_COUNTER_FLUSH_INTERVAL,
+    CONF_COUNTER_FSYNC,
+    CONF_COUNTER_POLICY,
     CONF_COVERS,
     CONF_DELAY,
     CONF_GROUP,
@@ -32,10 +41,26 @@ from . import (
     CONF_REMOTE_ENTITY_ID,
     CONF_REP_COUNT,
     CONF_REP_DELAY,
+    CONF_REPEAT_MODE,
     CONF_REVERSE,
     CONF_SERIAL,
+    CONF_TRAVEL_TIME_DOWN,
+    CONF_TRAVEL_TIME_UP,
+    DEFAULT_REPEAT_MODE,
     DOMAIN,
+    REPEAT_MODES,
 )
+from .cipher_pool import DEFAULT_CIPHER_WORKERS
+from .core.counter import (
+    COUNTER_FSYNC_POLICIES,
+    COUNTER_POLICIES,
+    DEFAULT_COUNTER_BLOCK_SIZE,
+    DEFAULT_COUNTER_FLUSH_INTERVAL,
+    DEFAULT_COUNTER_FSYNC,
+    DEFAULT_COUNTER_POLICY,
+    resolve_counter_policy,
+)
+from .core.keeloq import derive_device_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -210,6 +235,8 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
         errors = {}
 
         if user_input is not None:
+            self._validate_cover_remote(user_input, errors)
+
             # Validate that serial+group combination is unique
             for cover in self.covers:
                 if (
@@ -233,11 +260,28 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional(CONF_REP_COUNT, default=0): vol.Coerce(int),
                     vol.Optional(CONF_REP_DELAY, default=0.2): vol.Coerce(float),
                     vol.Optional(CONF_REVERSE, default=False): cv.boolean,
+                    vol.Optional(CONF_REMOTE_ENTITY_ID): cv.string,
+                    vol.Optional(CONF_REPEAT_MODE, default=DEFAULT_REPEAT_MODE): vol.In(
+                        REPEAT_MODES
+                    ),
+                    vol.Optional(CONF_TRAVEL_TIME_UP, default=0): vol.Coerce(float),
+                    vol.Optional(CONF_TRAVEL_TIME_DOWN, default=0): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_COUNTER_POLICY, default=DEFAULT_COUNTER_POLICY
+                    ): vol.In(COUNTER_POLICIES),
                 }
             ),
             errors=errors,
         )
 
+    def _validate_cover_remote(
+        self, user_input: dict[str, Any], errors: dict[str, str]
+    ) -> None:
+        """Validate the optional per-cover remote entity exists."""
+        remote_entity_id = user_input.get(CONF_REMOTE_ENTITY_ID)
+        if remote_entity_id and not self.hass.states.get(remote_entity_id):
+            errors[CONF_REMOTE_ENTITY_ID] = "invalid_remote_entity"
+
     async def async_step_select_cover_to_edit(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -273,6 +317,8 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
         errors = {}
 
         if user_input is not None:
+            self._validate_cover_remote(user_input, errors)
+
             # Validate that serial+group combination is unique (except for the current cover)
             for i, cover in enumerate(self.covers):
                 if i != self.edit_cover_index and (
@@ -305,6 +351,29 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_REVERSE, default=cover.get(CONF_REVERSE, False)
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_REMOTE_ENTITY_ID,
+                        description={
+                            "suggested_value": cover.get(CONF_REMOTE_ENTITY_ID)
+                        },
+                    ): cv.string,
+                    vol.Optional(
+                        CONF_REPEAT_MODE,
+                        default=cover.get(CONF_REPEAT_MODE, DEFAULT_REPEAT_MODE),
+                    ): vol.In(REPEAT_MODES),
+                    vol.Optional(
+                        CONF_TRAVEL_TIME_UP, default=cover.get(CONF_TRAVEL_TIME_UP, 0)
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_TRAVEL_TIME_DOWN,
+                        default=cover.get(CONF_TRAVEL_TIME_DOWN, 0),
+                    ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_COUNTER_POLICY,
+                        default=resolve_counter_policy(
+                            cover.get(CONF_COUNTER_POLICY, DEFAULT_COUNTER_POLICY)
+                        ),
+                    ): vol.In(COUNTER_POLICIES),
                 }
             ),
             errors=errors,
@@ -350,6 +419,19 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
             if not self.hass.states.get(user_input[CONF_REMOTE_ENTITY_ID]):
                 errors[CONF_REMOTE_ENTITY_ID] = "invalid_remote_entity"
             else:
+                # Device keys are derived from the manufacturer key
+                current_data = self.config_entry.data
+                key_changed = (user_input[CONF_MSB], user_input[CONF_LSB]) != (
+                    current_data.get(CONF_MSB),
+                    current_data.get(CONF_LSB),
+                )
+                if key_changed:
+                    _LOGGER.debug(
+                        "Manufacturer key changed, invalidating device keys (%s)",
+                        derive_device_key.cache_info(),
+                    )
+                    derive_device_key.cache_clear()
+
                 # Update the config entry data
                 self.hass.config_entries.async_update_entry(
                     self.config_entry,
@@ -358,6 +440,18 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
                         CONF_MSB: user_input[CONF_MSB],
                         CONF_LSB: user_input[CONF_LSB],
                         CONF_DELAY: user_input.get(CONF_DELAY, 0),
+                        CONF_COUNTER_BLOCK_SIZE: user_input.get(
+                            CONF_COUNTER_BLOCK_SIZE, DEFAULT_COUNTER_BLOCK_SIZE
+                        ),
+                        CONF_COUNTER_FLUSH_INTERVAL: user_input.get(
+                            CONF_COUNTER_FLUSH_INTERVAL, DEFAULT_COUNTER_FLUSH_INTERVAL
+                        ),
+                        CONF_COUNTER_FSYNC: user_input.get(
+                            CONF_COUNTER_FSYNC, DEFAULT_COUNTER_FSYNC
+                        ),
+                        CONF_CIPHER_WORKERS: user_input.get(
+                            CONF_CIPHER_WORKERS, DEFAULT_CIPHER_WORKERS
+                        ),
                     },
                 )
                 # Return to manage covers menu
@@ -382,6 +476,30 @@ class JaroliftOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional(
                         CONF_DELAY, default=current_data.get(CONF_DELAY, 0)
                     ): vol.Coerce(int),
+                    vol.Optional(
+                        CONF_COUNTER_BLOCK_SIZE,
+                        default=current_data.get(
+                            CONF_COUNTER_BLOCK_SIZE, DEFAULT_COUNTER_BLOCK_SIZE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_COUNTER_FLUSH_INTERVAL,
+                        default=current_data.get(
+                            CONF_COUNTER_FLUSH_INTERVAL, DEFAULT_COUNTER_FLUSH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_COUNTER_FSYNC,
+                        default=current_data.get(
+                            CONF_COUNTER_FSYNC, DEFAULT_COUNTER_FSYNC
+                        ),
+                    ): vol.In(COUNTER_FSYNC_POLICIES),
+                    vol.Optional(
+                        CONF_CIPHER_WORKERS,
+                        default=current_data.get(
+                            CONF_CIPHER_WORKERS, DEFAULT_CIPHER_WORKERS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
                 }
             ),
             errors=errors,
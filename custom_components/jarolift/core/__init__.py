@@ -0,0 +1,43 @@
+"""Home Assistant independent core of the Jarolift integration.
+
+KeeLoq cipher, RF packet encoding and decoding, command frames and counter
+helpers. The core only imports the standard library (NumPy optionally, on
+first use) and only uses relative imports inside this package, so worker
+processes, command line tools and benchmarks can load it without Home
+Assistant: run standalone.py by path (see there) and import from
+custom_components.jarolift.core as usual.
+"""
+
+from .counter import CounterStore, ReadCounter, WriteCounter
+from .decoder import JaroliftFrame, decode_packet, decode_packets
+from .frames import BuildPacket, BuildPacketBytes, build_packets_batch
+from .keeloq import (
+    decrypt,
+    decrypt_many,
+    derive_device_key,
+    derive_device_keys,
+    encrypt,
+    encrypt_many,
+)
+from .packet import encode_packet, encode_packet_b64, pack_frames_b64
+
+__all__ = [
+    "BuildPacket",
+    "BuildPacketBytes",
+    "CounterStore",
+    "JaroliftFrame",
+    "ReadCounter",
+    "WriteCounter",
+    "build_packets_batch",
+    "decode_packet",
+    "decode_packets",
+    "decrypt",
+    "decrypt_many",
+    "derive_device_key",
+    "derive_device_keys",
+    "encode_packet",
+    "encode_packet_b64",
+    "encrypt",
+    "encrypt_many",
+    "pack_frames_b64",
+]
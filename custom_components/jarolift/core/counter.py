@@ -0,0 +1,544 @@
+"""Rolling counter store for Jarolift serials.
+
+All counters live in a single JSON file that is loaded into memory once.
+Reads are served from memory; changes are persisted by rewriting the whole
+(small) file atomically: the new content is written to a temporary file in
+the same directory, flushed to disk according to the fsync policy and
+renamed over the old file, so a crash leaves either the old or the new file
+but never a truncated one. An older version of the file is kept as
+``<file>.bak``; it is refreshed once a counter has moved
+COUNTER_BACKUP_DISTANCE past it, not on every write. If the counter file is
+missing or fails validation on load, the counters are restored from the
+backup and advanced by a safety jump, because newer counters may already
+have been sent.
+
+By default the store works write-behind: instead of persisting every
+counter it persists a reservation ``counter + block_size`` and hands out
+counters below that limit from memory. After a crash the counters restart
+at the persisted limit, so no counter value is ever reused, while
+steady-state sends do no disk I/O. Blocks that are more than half used are
+renewed by a write that can run after the send (renewal_due); only a block
+that is used up has to be written before its counters are sent. The exact
+counters are written on a clean shutdown (release_reservations()). A block
+size of 0 persists every counter before it is used.
+
+A write that a send has to wait for can leave the fsync of the "file" policy
+to sync(), called once the frames are out. If power is lost before that,
+the rename may reach the disk without the new content; the damaged file is
+then recovered from the backup like any other. The "full" policy always
+flushes file and directory before write() returns.
+
+Counters from the legacy one-file-per-serial layout (``counter_0x....txt``)
+are imported on the first load and the old files are removed once the store
+has been written. An empty or damaged legacy file is moved aside to
+``<file>.corrupt``; the counter of its serial jumps like a restored backup if
+the store knows it, and restarts at 0 with an error otherwise.
+
+The counter policy decides how many counter values the repeats of a command
+use, and CounterUsage keeps a per-day tally of the values consumed.
+ReadCounter() and WriteCounter() access single legacy counter files.
+"""
+
+import glob
+import json
+import logging
+import os
+import tempfile
+from datetime import date, timedelta
+
+COUNTER_STORE_FILE = "jarolift_counters.json"
+COUNTER_STORE_VERSION = 1
+# A crash skips at most one block, which keeps the counters within the
+# window a receiver accepts for a single press
+DEFAULT_COUNTER_BLOCK_SIZE = 16
+DEFAULT_COUNTER_FLUSH_INTERVAL = 60
+
+# Counters restored from the backup file are advanced by this much (plus the
+# block size) to skip values that may have been sent after the backup
+COUNTER_SAFETY_JUMP = 128
+
+# The backup file is refreshed once a counter has moved this far past it, so
+# restoring it with the safety jump never goes back behind a stored counter
+COUNTER_BACKUP_DISTANCE = COUNTER_SAFETY_JUMP // 2
+
+# fsync policies: file and directory before sending, file only (in the
+# background where possible), or leave it to the OS
+COUNTER_FSYNC_FULL = "full"
+COUNTER_FSYNC_FILE = "file"
+COUNTER_FSYNC_NONE = "none"
+COUNTER_FSYNC_POLICIES = (COUNTER_FSYNC_FULL, COUNTER_FSYNC_FILE, COUNTER_FSYNC_NONE)
+DEFAULT_COUNTER_FSYNC = COUNTER_FSYNC_FILE
+
+# Counter values used by the repeats of a command:
+# - increment: a new counter for every repeat
+# - same: all repeats with one counter (like an RF repeat of the remote)
+COUNTER_POLICY_INCREMENT = "increment"
+COUNTER_POLICY_SAME = "same"
+COUNTER_POLICIES = (COUNTER_POLICY_INCREMENT, COUNTER_POLICY_SAME)
+DEFAULT_COUNTER_POLICY = COUNTER_POLICY_INCREMENT
+
+# Policies of earlier versions that may still be configured, and the policy
+# they are sent with. "adaptive" alternated two counters for close repeats,
+# which executed every command twice
+LEGACY_COUNTER_POLICIES = {"adaptive": COUNTER_POLICY_SAME}
+
+# Days of counter usage kept per cover
+COUNTER_USAGE_DAYS = 7
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def resolve_counter_policy(policy: str) -> str:
+    """Return the policy a configured counter policy is sent with."""
+    return LEGACY_COUNTER_POLICIES.get(policy, policy)
+
+
+def repeat_counter_offsets(policy: str, send_count: int) -> list[int]:
+    """Return the counter offset of every frame of a command.
+
+    The command uses max(offsets) + 1 counter values starting at its base
+    counter.
+
+    Args:
+        policy: One of COUNTER_POLICIES (or LEGACY_COUNTER_POLICIES)
+        send_count: Number of frames (repeats included)
+    """
+    if resolve_counter_policy(policy) == COUNTER_POLICY_SAME:
+        return [0] * send_count
+    return list(range(send_count))
+
+
+class CounterUsage:
+    """Counter values consumed per cover and day, kept in memory.
+
+    Usage is recorded per frame, under the serial and group mask the frame
+    was sent with. A cover (serial and group) counts the frames addressed to
+    it: a frame for a merged group mask counts for every cover in it, a
+    frame for another cover of the same serial for none. Nothing is
+    persisted, so the tally starts over on restart.
+    """
+
+    def __init__(self, days: int = COUNTER_USAGE_DAYS) -> None:
+        """Initialize the tally.
+
+        Args:
+            days: Number of days kept per cover (today included)
+        """
+        self.days = days
+        self._usage: dict[tuple[int, int], dict[date, int]] = {}
+
+    def record(self, serial: int, grouping: int, count: int, day: date) -> None:
+        """Add count counter values sent to a serial and group mask on a day."""
+        usage = self._usage.setdefault((serial, grouping), {})
+        usage[day] = usage.get(day, 0) + count
+        oldest = day - timedelta(days=self.days - 1)
+        for old_day in [d for d in usage if d < oldest]:
+            del usage[old_day]
+
+    def _daily(self, serial: int, grouping: int) -> dict[date, int]:
+        """Return the daily usage of the cover with a serial and group."""
+        daily: dict[date, int] = {}
+        for (used_serial, mask), usage in self._usage.items():
+            if used_serial == serial and mask & grouping:
+                for day, count in usage.items():
+                    daily[day] = daily.get(day, 0) + count
+        return daily
+
+    def get(self, serial: int, grouping: int, day: date) -> int:
+        """Return the counter values sent to a cover on a day."""
+        return self._daily(serial, grouping).get(day, 0)
+
+    def history(self, serial: int, grouping: int) -> dict[str, int]:
+        """Return the kept daily usage of a cover by ISO date."""
+        return {
+            day.isoformat(): count
+            for day, count in sorted(self._daily(serial, grouping).items())
+        }
+
+
+class CounterStore:
+    """In-memory counter table backed by a single JSON file.
+
+    The class does blocking file I/O in load() and write() only; everything
+    else is pure in-memory bookkeeping, so callers on an event loop can run
+    the two I/O methods in an executor and everything else inline.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        legacy_prefix: str | None = None,
+        block_size: int = DEFAULT_COUNTER_BLOCK_SIZE,
+        fsync: str = DEFAULT_COUNTER_FSYNC,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            path: Path of the JSON counter file
+            legacy_prefix: Base path of legacy per-serial counter files to
+                migrate (e.g. "<config>/counter_"), or None
+            block_size: Counters reserved ahead of use (0 persists every
+                counter before it is used)
+            fsync: One of COUNTER_FSYNC_POLICIES
+        """
+        self.path = path
+        self.backup_path = f"{path}.bak"
+        self.block_size = block_size
+        self.fsync = fsync
+        self._legacy_prefix = legacy_prefix
+        self._counters: dict[int, int] = {}
+        # Persisted reservation limit per serial (write-behind mode only)
+        self._limits: dict[int, int] = {}
+        self._migrated_files: list[str] = []
+        self._dirty = False
+        self._renewal_due = False
+        self._sync_pending = False
+        # Counters in the counter file and in its backup (None if unknown)
+        self._file_counters: dict[int, int] | None = None
+        self._backup_counters: dict[int, int] | None = None
+
+    @property
+    def dirty(self) -> bool:
+        """Return True if there are changes that were not serialized yet."""
+        return self._dirty
+
+    @property
+    def renewal_due(self) -> bool:
+        """Return True if a reserved block is more than half used.
+
+        The block can be renewed with extend_reservations() and a write
+        after the counters were sent.
+        """
+        return self._renewal_due
+
+    @property
+    def sync_pending(self) -> bool:
+        """Return True if a deferred write still has to be flushed by sync()."""
+        return self._sync_pending
+
+    def get(self, serial: int) -> int:
+        """Return the next counter value of a serial (0 if unknown)."""
+        return self._counters.get(serial, 0)
+
+    def set(self, serial: int, counter: int) -> None:
+        """Set the next counter value of a serial."""
+        if self._counters.get(serial) != counter:
+            self._counters[serial] = counter
+            self._dirty = True
+
+    def reserve(self, serial: int, count: int) -> int:
+        """Reserve count consecutive counter values and return the first one.
+
+        The store is dirty afterwards if the reserved values must be written
+        before they are used; in write-behind mode that is only the case when
+        the reserved block of the serial is exhausted.
+        """
+        base_counter = self.get(serial)
+        next_counter = base_counter + count
+        if not self.block_size:
+            self.set(serial, next_counter)
+            return base_counter
+
+        self._counters[serial] = next_counter
+        limit = self._limits.get(serial, 0)
+        if next_counter > limit:
+            self._limits[serial] = next_counter + self.block_size
+            self._dirty = True
+        elif limit - next_counter < self.block_size / 2:
+            self._renewal_due = True
+        return base_counter
+
+    def extend_reservations(self) -> None:
+        """Renew reservation blocks that are more than half used.
+
+        Called after sends and from the periodic flush so that sends rarely
+        have to wait for a block to be written.
+        """
+        self._renewal_due = False
+        if not self.block_size:
+            return
+        for serial, limit in self._limits.items():
+            counter = self._counters.get(serial, 0)
+            if limit - counter < self.block_size / 2:
+                self._limits[serial] = counter + self.block_size
+                self._dirty = True
+
+    def release_reservations(self) -> None:
+        """Drop reservations so the next write stores the exact counters."""
+        if any(
+            limit > self._counters.get(serial, 0)
+            for serial, limit in self._limits.items()
+        ):
+            self._dirty = True
+        self._limits.clear()
+
+    def load(self) -> None:
+        """Load the store from disk and import legacy counter files."""
+        counters = self._read(self.path)
+        self._file_counters = counters
+        self._backup_counters = self._read(self.backup_path)
+        damaged = counters is None and os.path.exists(self.path)
+        if damaged:
+            # Keep the damaged file for inspection; it must never become
+            # the backup of the next write
+            os.replace(self.path, f"{self.path}.corrupt")
+        if counters is None and self._backup_counters is not None:
+            jump = COUNTER_SAFETY_JUMP + self.block_size
+            _LOGGER.warning(
+                "Counter file %s is missing or damaged, restoring counters "
+                "from %s advanced by %d",
+                self.path,
+                self.backup_path,
+                jump,
+            )
+            counters = {
+                serial: value + jump for serial, value in self._backup_counters.items()
+            }
+            self._dirty = True
+        if counters is None and damaged:
+            _LOGGER.error(
+                "Counter file %s is damaged and no backup exists, counters "
+                "restart at 0. Covers may need to be learned again",
+                self.path,
+            )
+        self._counters = counters or {}
+        if self._legacy_prefix:
+            self._import_legacy_files()
+
+    @staticmethod
+    def _read(path: str) -> dict[int, int] | None:
+        """Read and validate a counter file.
+
+        Returns:
+            The counters, or None if the file is missing or invalid
+        """
+        try:
+            with open(path, encoding="utf-8") as fo:
+                data = json.load(fo)
+            if data["version"] > COUNTER_STORE_VERSION:
+                raise ValueError(f"unsupported version {data['version']}")
+            counters = {}
+            for serial, counter in data["counters"].items():
+                if type(counter) is not int or counter < 0:
+                    raise ValueError(f"invalid counter {counter!r}")
+                counters[int(serial, 16)] = counter
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as err:
+            _LOGGER.warning("Ignoring invalid counter file %s: %s", path, err)
+            return None
+        return counters
+
+    def _import_legacy_files(self) -> None:
+        """Import counters from legacy counter_<serial>.txt files."""
+        prefix_length = len(self._legacy_prefix)
+        for filename in glob.glob(f"{glob.escape(self._legacy_prefix)}0x*.txt"):
+            try:
+                serial = int(filename[prefix_length:-4], 16)
+            except ValueError:
+                _LOGGER.warning("Ignoring counter file %s of no serial", filename)
+                continue
+            try:
+                counter = _read_legacy_counter(filename)
+            except OSError as err:
+                _LOGGER.error(
+                    "Unable to read counter file %s, serial %s is not imported: %s",
+                    filename,
+                    hex(serial),
+                    err,
+                )
+                continue
+            except ValueError:
+                self._recover_legacy_file(filename, serial)
+                continue
+            # Never go backwards if both the store and a legacy file exist
+            self.set(serial, max(counter, self.get(serial)))
+            self._migrated_files.append(filename)
+        if self._migrated_files:
+            self._dirty = True
+            _LOGGER.info(
+                "Migrating %d legacy counter file(s) to %s",
+                len(self._migrated_files),
+                self.path,
+            )
+
+    def _recover_legacy_file(self, filename: str, serial: int) -> None:
+        """Handle an empty or damaged legacy counter file of a serial."""
+        # Out of the import glob, so it is reported once and not every load
+        os.replace(filename, f"{filename}.corrupt")
+        if serial in self._counters:
+            jump = COUNTER_SAFETY_JUMP + self.block_size
+            _LOGGER.warning(
+                "Counter file %s is damaged, advancing the stored counter of "
+                "serial %s by %d",
+                filename,
+                hex(serial),
+                jump,
+            )
+            self.set(serial, self._counters[serial] + jump)
+            return
+        _LOGGER.error(
+            "Counter file %s is damaged and serial %s has no stored counter, "
+            "its counter restarts at 0. The cover may need to be learned again",
+            filename,
+            hex(serial),
+        )
+
+    def serialize(self) -> str:
+        """Return the file content for the current counters.
+
+        Marks the store as clean; pass the result to write().
+        """
+        self._dirty = False
+        return json.dumps(
+            {
+                "version": COUNTER_STORE_VERSION,
+                "counters": {
+                    hex(serial): max(counter, self._limits.get(serial, 0))
+                    for serial, counter in sorted(self._counters.items())
+                },
+            },
+            indent=1,
+        )
+
+    def write(self, payload: str, defer_sync: bool = False) -> None:
+        """Atomically replace the counter file with payload.
+
+        The replaced file becomes the backup if the counters moved
+        COUNTER_BACKUP_DISTANCE past the current backup.
+
+        Args:
+            payload: Result of serialize()
+            defer_sync: Leave the fsync of the "file" policy to sync(), for
+                writes a send is waiting for
+        """
+        defer_sync = (
+            defer_sync and self.fsync == COUNTER_FSYNC_FILE and not self._migrated_files
+        )
+        counters = {
+            int(serial, 16): counter
+            for serial, counter in json.loads(payload)["counters"].items()
+        }
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{COUNTER_STORE_FILE}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fo:
+                fo.write(payload)
+                if self.fsync != COUNTER_FSYNC_NONE and not defer_sync:
+                    fo.flush()
+                    os.fsync(fo.fileno())
+            if os.path.isfile(self.path) and self._backup_due(counters):
+                os.replace(self.path, self.backup_path)
+                self._backup_counters = self._file_counters
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._file_counters = counters
+        self._sync_pending = defer_sync
+        if self.fsync == COUNTER_FSYNC_FULL:
+            _fsync_directory(directory)
+
+        # Legacy files are only removed once their counters are on disk
+        while self._migrated_files:
+            os.remove(self._migrated_files.pop())
+
+    def sync(self) -> None:
+        """Flush the counter file of a deferred write to disk."""
+        if not self._sync_pending:
+            return
+        self._sync_pending = False
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _backup_due(self, counters: dict[int, int]) -> bool:
+        """Return True if the backup is too old for the counters to write."""
+        if self._backup_counters is None or self._file_counters is None:
+            return True
+        return any(
+            counter - self._backup_counters.get(serial, 0) > COUNTER_BACKUP_DISTANCE
+            for serial, counter in counters.items()
+        )
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a directory entry (the rename) to disk where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError as err:
+        _LOGGER.debug("Unable to fsync %s: %s", directory, err)
+    finally:
+        os.close(fd)
+
+
+def _read_legacy_counter(filename: str) -> int:
+    """Read the counter of a legacy counter file.
+
+    Raises:
+        ValueError: The file is empty or holds no counter
+        OSError: The file cannot be read
+    """
+    with open(filename, encoding="utf-8") as fo:
+        text = fo.readline().strip()
+    if not text.isdecimal():
+        raise ValueError(f"Counter file {filename} is empty or damaged: {text!r}")
+    return int(text)
+
+
+def ReadCounter(counter_file: str, serial: int) -> int:
+    """Read the counter value for a serial from a legacy counter file.
+
+    Counters are kept in the CounterStore now; legacy files are imported
+    into it automatically when the store is loaded.
+
+    Args:
+        counter_file: Base path for counter files
+        serial: Serial number of the device
+
+    Returns:
+        Current counter value, or 0 if file doesn't exist
+
+    Raises:
+        ValueError: The file is empty or damaged; restarting at 0 would make
+            the receiver reject the following commands
+    """
+    filename = f"{counter_file}{hex(serial)}.txt"
+    if os.path.isfile(filename):
+        return _read_legacy_counter(filename)
+    return 0
+
+
+def WriteCounter(counter_file: str, serial: int, Counter: int) -> None:
+    """Write the counter value for a serial to a legacy counter file.
+
+    Args:
+        counter_file: Base path for counter files
+        serial: Serial number of the device
+        Counter: Counter value to write
+    """
+    filename = f"{counter_file}{hex(serial)}.txt"
+    # Write a temporary file and rename it, so a crash never truncates it
+    with open(f"{filename}.tmp", "w", encoding="utf-8") as fo:
+        fo.write(str(Counter))
+    os.replace(f"{filename}.tmp", filename)
+
+
+def get_counter_value(counter_file: str, serial: int, call_data_counter: str) -> int:
+    """
+    Get the counter value to use for a command.
+    Returns the appropriate counter based on whether a specific counter was provided.
+    """
+    provided_counter = int(call_data_counter, 16)
+    return (
+        ReadCounter(counter_file, serial) if provided_counter == 0 else provided_counter
+    )
@@ -0,0 +1,162 @@
+"""Jarolift RF frame decoder.
+
+Reverses BuildPacket() for frames captured by an RF blaster (e.g. a code
+learned by a Broadlink), so the counter of a cover can be recovered after the
+counter file was lost or a physical remote advanced it.
+
+A Broadlink RF payload is a list of pulse lengths: one byte per pulse, or a
+zero byte followed by a two byte big endian length for long pulses. A data
+bit is a pulse pair whose first (high) pulse is short for 1 and long for 0,
+least significant bit first, and the data bits follow a long header gap.
+Captures carry jitter and often several repeats of the frame; the decoder
+classifies pulses by a threshold and uses the first complete frame.
+
+The hopping code is decrypted with the cached device key of the serial, and
+decode_packets() decrypts all frames of a serial in one keeloq_native call.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass
+
+from .keeloq import derive_device_key
+from .keeloq_native import decrypt_array
+from .packet import KEELOQ_PACKET_BITS, parse_pulses
+
+# Pulses at least this long (about 2 ms) separate frames and their preamble
+GAP_MIN_PULSE = 0x40
+# High pulses shorter than this (about 600 us) encode a 1 bit
+BIT_ONE_MAX_PULSE = 0x13
+
+# Pulses of one frame up to the high pulse of its last bit (its low pulse is
+# the gap after the frame and may be cut off at the end of a capture)
+_FRAME_PULSES = 2 * KEELOQ_PACKET_BITS - 1
+
+
+@dataclass(frozen=True)
+class JaroliftFrame:
+    """A decoded Jarolift command."""
+
+    serial: int
+    group: int
+    button: int
+    counter: int
+    hold: bool
+
+
+def _packet_bytes(packet: str | bytes) -> bytes:
+    """Return the raw bytes of a "b64:"/base64 string or bytes."""
+    if isinstance(packet, bytes):
+        return packet
+    if packet.startswith("b64:"):
+        packet = packet[4:]
+    try:
+        return base64.b64decode(packet, validate=True)
+    except binascii.Error as err:
+        raise ValueError(f"invalid base64 packet: {err}") from err
+
+
+def extract_data_word(packet: str | bytes) -> tuple[int, bool]:
+    """Return the 72-bit data word and hold flag of a captured packet.
+
+    Raises:
+        ValueError: If the packet contains no complete Jarolift frame
+    """
+    raw = _packet_bytes(packet)
+    pulses = parse_pulses(raw)
+    for gap, pulse in enumerate(pulses):
+        if pulse < GAP_MIN_PULSE:
+            continue
+        frame = pulses[gap + 1 : gap + 1 + _FRAME_PULSES]
+        if len(frame) < _FRAME_PULSES or max(frame) >= GAP_MIN_PULSE:
+            continue
+        data = 0
+        for bit, high in enumerate(frame[::2]):
+            if high < BIT_ONE_MAX_PULSE:
+                data |= 1 << bit
+        # The repeat count of the packet is set for held buttons
+        return data, raw[1] != 0
+    raise ValueError("no Jarolift frame found in packet")
+
+
+def _split_data_word(data: int) -> tuple[int, int, int, int]:
+    """Return (Encoded, Serial, Button, group high byte) of a data word."""
+    return (
+        data & 0xFFFFFFFF,
+        (data >> 32) & 0x0FFFFFFF,
+        (data >> 60) & 0xF,
+        (data >> 64) & 0xFF,
+    )
+
+
+def _frame_from_decrypted(
+    Decoded: int, Serial: int, Button: int, group_high: int, hold: bool
+) -> JaroliftFrame | None:
+    """Return the frame of a decrypted hopping code, None if the key is wrong."""
+    # The decrypted word repeats the low byte of the serial
+    if (Decoded >> 16) & 0xFF != Serial & 0xFF:
+        return None
+    return JaroliftFrame(
+        serial=Serial,
+        group=(group_high << 8) | (Decoded >> 24),
+        button=Button,
+        counter=Decoded & 0xFFFF,
+        hold=hold,
+    )
+
+
+def decode_packets(
+    packets: list[str | bytes], MSB: int, LSB: int
+) -> list[JaroliftFrame | None]:
+    """Decode many captured packets.
+
+    Args:
+        packets: Captured packets ("b64:" strings, base64 strings or bytes)
+        MSB: Manufacturer key (high 32 bits)
+        LSB: Manufacturer key (low 32 bits)
+
+    Returns:
+        One frame per packet, None for packets that are no Jarolift frame
+        or do not decrypt with the manufacturer key
+    """
+    words: list[tuple[int, bool] | None] = []
+    for packet in packets:
+        try:
+            words.append(extract_data_word(packet))
+        except ValueError:
+            words.append(None)
+
+    by_serial: dict[int, list[int]] = {}
+    for index, word in enumerate(words):
+        if word is not None:
+            by_serial.setdefault(_split_data_word(word[0])[1], []).append(index)
+
+    frames: list[JaroliftFrame | None] = [None] * len(packets)
+    for Serial, indexes in by_serial.items():
+        KeyMSB, KeyLSB = derive_device_key(Serial, MSB, LSB)
+        fields = [_split_data_word(words[i][0]) for i in indexes]
+        decrypted = decrypt_array([f[0] for f in fields], KeyMSB, KeyLSB)
+        for index, (_Encoded, _Serial, Button, group_high), Decoded in zip(
+            indexes, fields, decrypted, strict=True
+        ):
+            frames[index] = _frame_from_decrypted(
+                Decoded, Serial, Button, group_high, words[index][1]
+            )
+    return frames
+
+
+def decode_packet(packet: str | bytes, MSB: int, LSB: int) -> JaroliftFrame:
+    """Decode a captured packet, see decode_packets().
+
+    Raises:
+        ValueError: If the packet is no Jarolift frame of the manufacturer key
+    """
+    frame = decode_packets([packet], MSB, LSB)[0]
+    if frame is None:
+        # Raises for packets without a frame
+        data, _hold = extract_data_word(packet)
+        raise ValueError(
+            f"frame of serial {hex(_split_data_word(data)[1])} does not decrypt "
+            "with the manufacturer key"
+        )
+    return frame
@@ -0,0 +1,124 @@
+"""Jarolift command frames.
+
+Builds the Broadlink RF packets of Jarolift commands: the counter, serial and
+group are encrypted into the 32-bit KeeLoq hopping code under the device key
+of the serial, and the hopping code is spliced into the cached packet
+template of the cover and button (see packet.py).
+"""
+
+from .keeloq import derive_device_key, derive_device_keys, encrypt
+from .keeloq_native import encrypt_items
+from .packet import FrameTemplate, frame_template
+
+
+def _hopping_code(Grouping: int, Serial: int, Counter: int, MSB: int, LSB: int) -> int:
+    """Build the encrypted 32-bit hopping code for a command."""
+    # Generate device keys from serial (cached per serial and manufacturer key)
+    KeyMSB, KeyLSB = derive_device_key(Serial, MSB, LSB)
+
+    return encrypt(_decoded_word(Grouping, Serial, Counter), KeyMSB, KeyLSB)
+
+
+def _decoded_word(Grouping: int, Serial: int, Counter: int) -> int:
+    """Build the decoded 32-bit word with counter, serial, and grouping."""
+    return Counter | ((Serial & 0xFF) << 16) | ((Grouping & 0xFF) << 24)
+
+
+def _assemble_packet_data(Encoded: int, Grouping: int, Serial: int, Button: int) -> int:
+    """Assemble the complete 72-bit data packet around the encrypted word."""
+    return Encoded | (Serial << 32) | (Button << 60) | (((Grouping >> 8) & 0xFF) << 64)
+
+
+def _frame_template(
+    Grouping: int, Serial: int, Button: int, Hold: bool
+) -> FrameTemplate:
+    """Return the cached packet template of a cover and button."""
+    return frame_template(_assemble_packet_data(0, Grouping, Serial, Button), Hold)
+
+
+def BuildPacket(
+    Grouping: int,
+    Serial: int,
+    Button: int,
+    Counter: int,
+    MSB: int,
+    LSB: int,
+    Hold: bool,
+) -> str:
+    """Build a KeeLoq encrypted packet for RF transmission.
+
+    This function creates a complete packet that can be sent to a Jarolift cover:
+    1. Derives device-specific keys from the serial number (cached)
+    2. Encrypts the counter and device information using KeeLoq
+    3. Splices it into the encoded packet of the cover and button (cached)
+    4. Returns a base64-encoded string for transmission
+
+    Args:
+        Grouping: Group number for the cover (0x0000-0xFFFF)
+        Serial: Serial number of the cover (unique identifier)
+        Button: Button code (0x2=down, 0x4=stop, 0x8=up, 0xA=learn)
+        Counter: Rolling counter value for replay protection
+        MSB: Manufacturer key (high 32 bits)
+        LSB: Manufacturer key (low 32 bits)
+        Hold: If True, button is held down (for programming)
+
+    Returns:
+        Base64-encoded packet string prefixed with "b64:"
+    """
+    Encoded = _hopping_code(Grouping, Serial, Counter, MSB, LSB)
+    return _frame_template(Grouping, Serial, Button, Hold).packet_b64(Encoded)
+
+
+def BuildPacketBytes(
+    Grouping: int,
+    Serial: int,
+    Button: int,
+    Counter: int,
+    MSB: int,
+    LSB: int,
+    Hold: bool,
+) -> bytes:
+    """Build a KeeLoq encrypted packet as raw Broadlink RF bytes.
+
+    Same as BuildPacket() without the base64 step, for transports that take
+    the payload as bytes.
+    """
+    Encoded = _hopping_code(Grouping, Serial, Counter, MSB, LSB)
+    return _frame_template(Grouping, Serial, Button, Hold).packet(Encoded)
+
+
+def build_packets_batch(
+    frames: list[tuple[int, int, int, int]], MSB: int, LSB: int, Hold: bool = False
+) -> list[str]:
+    """Build the packets for many frames in one call.
+
+    Blocking; a whole batch is meant to run as a single executor job instead
+    of one job (or one event loop slice) per cover. Device keys missing from
+    the cache are derived in one bit-sliced call. All frames are encrypted
+    in one call, by the native KeeLoq kernel (once per device key) if it is
+    available and bit-sliced over all device keys otherwise.
+
+    Args:
+        frames: (Grouping, Serial, Button, Counter) of every packet
+        MSB: Manufacturer key (high 32 bits)
+        LSB: Manufacturer key (low 32 bits)
+        Hold: If True, button is held down (for programming)
+
+    Returns:
+        Base64-encoded packets in the order of frames
+    """
+    keys = derive_device_keys([Serial for _, Serial, _, _ in frames], MSB, LSB)
+    encoded = encrypt_items(
+        [
+            (_decoded_word(Grouping, Serial, Counter), *key)
+            for (Grouping, Serial, _Button, Counter), key in zip(
+                frames, keys, strict=True
+            )
+        ]
+    )
+    return [
+        _frame_template(Grouping, Serial, Button, Hold).packet_b64(Encoded)
+        for Encoded, (Grouping, Serial, Button, _Counter) in zip(
+            encoded, frames, strict=True
+        )
+    ]
@@ -0,0 +1,167 @@
+"""Optional native KeeLoq kernel with pure-Python fallback.
+
+native/keeloq.c is a small C kernel that encrypts or decrypts an array of
+32-bit values under one key. It is not built automatically; when a compiled
+library sits next to the source (see the build lines in keeloq.c) it is
+loaded through ctypes at import. Before it is used, a self-test compares it
+with the Python engine on known vectors, and a library that fails is ignored.
+
+encrypt_array() and decrypt_array() use the kernel when it is loaded, the
+NumPy engine (keeloq_numpy) for large batches if NumPy is installed and the
+table-driven Python engine otherwise, all with identical results. ctypes
+releases the GIL during the call, so kernel work in executor jobs runs in
+parallel with the event loop. encrypt_items() takes values under many keys
+and uses the kernel once per key, or the bit-sliced Python engine.
+"""
+
+import ctypes
+import logging
+import sys
+from pathlib import Path
+
+from .keeloq import KEELOQ_MASK, decrypt, encrypt, encrypt_many
+
+_LOGGER = logging.getLogger(__name__)
+
+NATIVE_DIR = Path(__file__).parent.parent / "native"
+
+if sys.platform == "win32":
+    NATIVE_LIBRARY = "keeloq.dll"
+elif sys.platform == "darwin":
+    NATIVE_LIBRARY = "libkeeloq.dylib"
+else:
+    NATIVE_LIBRARY = "libkeeloq.so"
+
+# Smallest batch worth the fixed per-round overhead of the NumPy engine
+NUMPY_MIN_BATCH = 128
+
+# (x, keyHigh, keyLow) checked against the Python engine before first use
+SELF_TEST_VECTORS = [
+    (0x12345678, 0xABCDEF01, 0x23456789),
+    (0x00000000, 0x00000000, 0x00000000),
+    (0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF),
+    (0x2106AA01, 0x12345678, 0x87654321),
+]
+
+
+class NativeKeeloq:
+    """ctypes binding of the keeloq_encrypt_many/keeloq_decrypt_many kernel."""
+
+    def __init__(self, library: ctypes.CDLL) -> None:
+        """Bind the kernel functions of a loaded library.
+
+        Raises:
+            AttributeError: If the library does not export the kernel
+        """
+        self._encrypt = library.keeloq_encrypt_many
+        self._decrypt = library.keeloq_decrypt_many
+        for func in (self._encrypt, self._decrypt):
+            func.argtypes = [
+                ctypes.POINTER(ctypes.c_uint32),
+                ctypes.c_size_t,
+                ctypes.c_uint32,
+                ctypes.c_uint32,
+            ]
+            func.restype = None
+
+    @staticmethod
+    def _run(func, values: list[int], keyHigh: int, keyLow: int) -> list[int]:
+        """Run a kernel function over a copy of values."""
+        buffer = (ctypes.c_uint32 * len(values))(*(x & KEELOQ_MASK for x in values))
+        func(buffer, len(values), keyHigh & KEELOQ_MASK, keyLow & KEELOQ_MASK)
+        return list(buffer)
+
+    def encrypt_array(self, values: list[int], keyHigh: int, keyLow: int) -> list[int]:
+        """Encrypt values under one key."""
+        return self._run(self._encrypt, values, keyHigh, keyLow)
+
+    def decrypt_array(self, values: list[int], keyHigh: int, keyLow: int) -> list[int]:
+        """Decrypt values under one key."""
+        return self._run(self._decrypt, values, keyHigh, keyLow)
+
+    def self_test(self) -> bool:
+        """Return True if the kernel matches the Python engine."""
+        for x, keyHigh, keyLow in SELF_TEST_VECTORS:
+            if self.encrypt_array([x], keyHigh, keyLow) != [
+                encrypt(x, keyHigh, keyLow)
+            ] or self.decrypt_array([x], keyHigh, keyLow) != [
+                decrypt(x, keyHigh, keyLow)
+            ]:
+                return False
+        return True
+
+
+def load_kernel(path: Path) -> NativeKeeloq | None:
+    """Load and self-test a compiled kernel.
+
+    Args:
+        path: Shared library built from native/keeloq.c
+
+    Returns:
+        The kernel, or None if it is missing, incomplete or wrong
+    """
+    if not path.is_file():
+        return None
+    try:
+        kernel = NativeKeeloq(ctypes.CDLL(str(path)))
+    except (OSError, AttributeError) as err:
+        _LOGGER.warning("Cannot load native KeeLoq kernel %s: %s", path, err)
+        return None
+    if not kernel.self_test():
+        _LOGGER.warning(
+            "Native KeeLoq kernel %s failed its self-test, using Python", path
+        )
+        return None
+    _LOGGER.debug("Using native KeeLoq kernel %s", path)
+    return kernel
+
+
+_kernel = load_kernel(NATIVE_DIR / NATIVE_LIBRARY)
+
+
+def native_available() -> bool:
+    """Return True if the native kernel is loaded."""
+    return _kernel is not None
+
+
+def _numpy_engine():
+    """Return the NumPy engine, None if NumPy is not installed."""
+    # Imported on first use, importing NumPy takes longer than the whole core
+    from . import keeloq_numpy
+
+    return keeloq_numpy if keeloq_numpy.NUMPY_AVAILABLE else None
+
+
+def encrypt_array(values: list[int], keyHigh: int, keyLow: int) -> list[int]:
+    """Encrypt many 32-bit values under one key, see keeloq.encrypt()."""
+    if _kernel is not None:
+        return _kernel.encrypt_array(values, keyHigh, keyLow)
+    engine = _numpy_engine() if len(values) >= NUMPY_MIN_BATCH else None
+    if engine is not None:
+        return engine.encrypt_array_numpy(values, keyHigh, keyLow).tolist()
+    return [encrypt(x, keyHigh, keyLow) for x in values]
+
+
+def decrypt_array(values: list[int], keyHigh: int, keyLow: int) -> list[int]:
+    """Decrypt many 32-bit values under one key, see keeloq.decrypt()."""
+    if _kernel is not None:
+        return _kernel.decrypt_array(values, keyHigh, keyLow)
+    engine = _numpy_engine() if len(values) >= NUMPY_MIN_BATCH else None
+    if engine is not None:
+        return engine.decrypt_array_numpy(values, keyHigh, keyLow).tolist()
+    return [decrypt(x, keyHigh, keyLow) for x in values]
+
+
+def encrypt_items(items: list[tuple[int, int, int]]) -> list[int]:
+    """Encrypt many (x, keyHigh, keyLow) items, see keeloq.encrypt_many()."""
+    if _kernel is None:
+        return encrypt_many(items)
+    by_key: dict[tuple[int, int], list[int]] = {}
+    for index, (_x, keyHigh, keyLow) in enumerate(items):
+        by_key.setdefault((keyHigh, keyLow), []).append(index)
+    encrypted = [0] * len(items)
+    for (keyHigh, keyLow), indexes in by_key.items():
+        values = _kernel.encrypt_array([items[i][0] for i in indexes], keyHigh, keyLow)
+        for index, value in zip(indexes, values, strict=True):
+            encrypted[index] = value
+    return encrypted
@@ -0,0 +1,290 @@
+"""Jarolift RF frame encoder.
+
+Turns the 72-bit KeeLoq data word into the Broadlink RF payload understood by
+Jarolift receivers. Every data bit (least significant first) becomes a pair of
+pulse lengths, so the encoder maps 8 bits at a time through a 256-entry lookup
+table straight into a preallocated buffer instead of going through binary and
+hex strings.
+
+Between two sends of a cover and button only the 32-bit hopping code
+changes, so frame_template() caches everything else of the packet and only
+the hopping code is encoded per send.
+
+Payload layout:
+    prefix (2 bytes) | length (2 bytes, little endian) | preamble | data bits
+
+The payload after the header is a list of pulse lengths (one byte, or a zero
+byte and two bytes big endian for long pulses), which also gives the time a
+packet keeps the RF blaster busy.
+"""
+
+import base64
+import itertools
+from functools import lru_cache
+
+KEELOQ_PACKET_BITS = 72
+KEELOQ_PREAMBLE = "190c1a0001e4310c0d0c0d0c0d0c0d0c0d0c0d0c0d0c0d7a"
+KEELOQ_BIT_ONE_LAST = "0c0005dc"
+KEELOQ_BIT_ZERO_LAST = "190005dc"
+KEELOQ_BIT_ONE = "0c19"
+KEELOQ_BIT_ZERO = "190c"
+KEELOQ_HOLD_PREFIX = "b214"
+KEELOQ_NORMAL_PREFIX = "b200"
+
+# The second header byte makes the blaster send the payload up to 256 times
+MAX_SENDS = 0x100
+# Largest packet handed to the blaster when frames are packed together
+MAX_PACKED_SIZE = 1024
+
+# Broadlink pulse lengths are in units of 269/8192 ms (about 32.8 us)
+PULSE_UNIT = 269 / 8192 / 1000
+
+_PREAMBLE = bytes.fromhex(KEELOQ_PREAMBLE)
+_BIT_ONE = bytes.fromhex(KEELOQ_BIT_ONE)
+_BIT_ZERO = bytes.fromhex(KEELOQ_BIT_ZERO)
+_BIT_ONE_LAST = bytes.fromhex(KEELOQ_BIT_ONE_LAST)
+_BIT_ZERO_LAST = bytes.fromhex(KEELOQ_BIT_ZERO_LAST)
+_HOLD_PREFIX = bytes.fromhex(KEELOQ_HOLD_PREFIX)
+_NORMAL_PREFIX = bytes.fromhex(KEELOQ_NORMAL_PREFIX)
+
+# Encoded pulses for 8 data bits, least significant bit first
+BYTE_TABLE = tuple(
+    b"".join(_BIT_ONE if (value >> bit) & 1 else _BIT_ZERO for bit in range(8))
+    for value in range(256)
+)
+
+_HEADER_SIZE = 4
+_BIT_SIZE = len(_BIT_ONE)
+# Every bit but the last uses a short pulse pair, the last one ends the frame
+FRAME_SIZE = len(_PREAMBLE) + (KEELOQ_PACKET_BITS - 1) * _BIT_SIZE + len(_BIT_ONE_LAST)
+PACKET_SIZE = _HEADER_SIZE + FRAME_SIZE
+
+# Every frame ends with a long low pulse (two byte length), the gap before
+# the next frame
+_GAP_PULSE = slice(-2, None)
+FRAME_GAP_PULSE = int.from_bytes(_BIT_ONE_LAST[_GAP_PULSE], "big")
+FRAME_GAP = FRAME_GAP_PULSE * PULSE_UNIT
+MAX_FRAME_GAP = 0xFFFF * PULSE_UNIT
+
+# Offsets of the encoded data bits inside a packet
+DATA_OFFSET = _HEADER_SIZE + len(_PREAMBLE)
+_FULL_BYTES = (KEELOQ_PACKET_BITS - 1) // 8
+_TAIL_BITS = (KEELOQ_PACKET_BITS - 1) % 8
+
+# The 32-bit hopping code is the only part of the data word that changes
+# between two sends of a cover and button. Its encoded bytes, widened to
+# whole base64 groups, are all a frame template has to rebuild.
+_HOP_END = DATA_OFFSET + 4 * len(BYTE_TABLE[0])
+_PATCH_START = DATA_OFFSET - DATA_OFFSET % 3
+_PATCH_END = _PATCH_START + -(-(_HOP_END - _PATCH_START) // 3) * 3
+
+# Upper bound on cached frame templates (one per cover, button and hold)
+TEMPLATE_CACHE_SIZE = 512
+
+
+def encode_header(Hold: bool, length: int = FRAME_SIZE) -> bytes:
+    """Return the Broadlink RF header for a payload of the given length."""
+    prefix = _HOLD_PREFIX if Hold else _NORMAL_PREFIX
+    return prefix + length.to_bytes(2, "little")
+
+
+def encode_packet(data: int, Hold: bool) -> bytes:
+    """Encode a 72-bit KeeLoq data word into a raw Broadlink RF packet.
+
+    Args:
+        data: Data word (hopping code, serial, button and group high byte)
+        Hold: If True, the transmitter repeats the frame (button held down)
+
+    Returns:
+        Raw packet bytes including header and preamble
+    """
+    table = BYTE_TABLE
+    buf = bytearray(PACKET_SIZE)
+    buf[:DATA_OFFSET] = encode_header(Hold) + _PREAMBLE
+
+    pos = DATA_OFFSET
+    for shift in range(0, _FULL_BYTES * 8, 8):
+        buf[pos : pos + 16] = table[(data >> shift) & 0xFF]
+        pos += 16
+
+    # Remaining bits; the final bit of the frame is encoded with a long gap
+    tail = data >> (_FULL_BYTES * 8)
+    tail_size = _TAIL_BITS * _BIT_SIZE
+    buf[pos : pos + tail_size] = table[tail & 0xFF][:tail_size]
+    pos += tail_size
+    buf[pos:] = _BIT_ONE_LAST if (tail >> _TAIL_BITS) & 1 else _BIT_ZERO_LAST
+    return bytes(buf)
+
+
+def encode_packet_b64(data: int, Hold: bool) -> str:
+    """Encode a 72-bit KeeLoq data word as a "b64:" remote command string."""
+    return "b64:" + base64.b64encode(encode_packet(data, Hold)).decode("ascii")
+
+
+class FrameTemplate:
+    """Encoded packet of a cover and button, except for the hopping code.
+
+    The header, preamble, serial, button and group high byte are encoded
+    once; packet() and packet_b64() only encode the 32-bit hopping code and
+    splice it in. Templates are immutable and can be shared between threads.
+    """
+
+    __slots__ = ("_head", "_tail", "_head_b64", "_tail_b64", "_lead", "_trail")
+
+    def __init__(self, static: int, Hold: bool) -> None:
+        """Encode the static part of a packet.
+
+        Args:
+            static: Data word with the hopping code bits (low 32 bits) zero
+            Hold: If True, the transmitter repeats the frame (button held down)
+        """
+        packet = encode_packet(static, Hold)
+        self._head = packet[:DATA_OFFSET]
+        self._tail = packet[_HOP_END:]
+        # Base64 of the bytes outside the base64 groups touching the code
+        self._head_b64 = "b64:" + base64.b64encode(packet[:_PATCH_START]).decode(
+            "ascii"
+        )
+        self._tail_b64 = base64.b64encode(packet[_PATCH_END:]).decode("ascii")
+        self._lead = packet[_PATCH_START:DATA_OFFSET]
+        self._trail = packet[_HOP_END:_PATCH_END]
+
+    @staticmethod
+    def _encode_code(Encoded: int) -> bytes:
+        """Return the encoded pulses of a hopping code."""
+        table = BYTE_TABLE
+        return (
+            table[Encoded & 0xFF]
+            + table[(Encoded >> 8) & 0xFF]
+            + table[(Encoded >> 16) & 0xFF]
+            + table[(Encoded >> 24) & 0xFF]
+        )
+
+    def packet(self, Encoded: int) -> bytes:
+        """Return the raw packet for a hopping code, see encode_packet()."""
+        return self._head + self._encode_code(Encoded) + self._tail
+
+    def packet_b64(self, Encoded: int) -> str:
+        """Return the "b64:" packet for a hopping code, see encode_packet_b64()."""
+        middle = self._lead + self._encode_code(Encoded) + self._trail
+        return (
+            self._head_b64 + base64.b64encode(middle).decode("ascii") + self._tail_b64
+        )
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def frame_template(static: int, Hold: bool) -> FrameTemplate:
+    """Return the cached template for a data word without hopping code."""
+    return FrameTemplate(static, Hold)
+
+
+def fold_repeats_b64(packets: list[str]) -> list[str]:
+    """Fold runs of identical "b64:" packets into the blaster repeat byte.
+
+    The blaster then sends the frame back to back (separated by the gap at
+    the end of the frame) without further remote calls. Packets that are
+    already repeated (held buttons) are multiplied; runs needing more than
+    MAX_SENDS sends are split.
+
+    Returns:
+        Packets to send in order, one per run (or part of a run)
+    """
+    folded = []
+    for packet, run in itertools.groupby(packets):
+        raw = bytearray(base64.b64decode(packet[4:]))
+        sends = raw[1] + 1
+        count = len(list(run))
+        while count:
+            times = min(count, MAX_SENDS // sends)
+            raw[1] = times * sends - 1
+            folded.append("b64:" + base64.b64encode(raw).decode("ascii"))
+            count -= times
+    return folded
+
+
+def pack_frames(
+    packets: list[bytes], gap: float = FRAME_GAP, max_size: int = MAX_PACKED_SIZE
+) -> list[bytes]:
+    """Concatenate the frames of many packets into as few packets as possible.
+
+    The frames keep their order, each followed by a gap of the given length,
+    and a new packet is started when the next frame would exceed max_size.
+    Packets with a different repeat count (held buttons) are not packed
+    together.
+
+    Args:
+        packets: Raw packets from encode_packet()
+        gap: Seconds between two frames (at most MAX_FRAME_GAP)
+        max_size: Largest packet the blaster accepts, header included
+
+    Returns:
+        Raw packets carrying all frames
+    """
+    gap_pulse = max(1, min(0xFFFF, round(gap / PULSE_UNIT))).to_bytes(2, "big")
+    packed: list[bytes] = []
+    prefix = b""
+    payload = bytearray()
+    for packet in packets:
+        frame = bytearray(packet[_HEADER_SIZE:])
+        frame[_GAP_PULSE] = gap_pulse
+        if payload and (
+            packet[:2] != prefix or _HEADER_SIZE + len(payload) + len(frame) > max_size
+        ):
+            packed.append(prefix + len(payload).to_bytes(2, "little") + payload)
+            payload = bytearray()
+        prefix = packet[:2]
+        payload += frame
+    if payload:
+        packed.append(prefix + len(payload).to_bytes(2, "little") + payload)
+    return packed
+
+
+def pack_frames_b64(
+    packets: list[str], gap: float = FRAME_GAP, max_size: int = MAX_PACKED_SIZE
+) -> list[str]:
+    """Concatenate "b64:" packets, see pack_frames()."""
+    return [
+        "b64:" + base64.b64encode(packet).decode("ascii")
+        for packet in pack_frames(
+            [base64.b64decode(packet[4:]) for packet in packets], gap, max_size
+        )
+    ]
+
+
+def frames_per_packet_b64(packet: str, max_size: int = MAX_PACKED_SIZE) -> int:
+    """Return how many frames of a "b64:" packet's size pack_frames() packs."""
+    frame_size = len(base64.b64decode(packet[4:])) - _HEADER_SIZE
+    return max(1, (max_size - _HEADER_SIZE) // frame_size)
+
+
+def parse_pulses(packet: bytes) -> list[int]:
+    """Return the pulse lengths of a raw Broadlink RF packet."""
+    if len(packet) < _HEADER_SIZE:
+        raise ValueError("packet too short")
+    length = int.from_bytes(packet[2:_HEADER_SIZE], "little")
+    payload = packet[_HEADER_SIZE : _HEADER_SIZE + length]
+    pulses = []
+    pos = 0
+    while pos < len(payload):
+        pulse = payload[pos]
+        pos += 1
+        if pulse == 0:
+            pulse = int.from_bytes(payload[pos : pos + 2], "big")
+            pos += 2
+        pulses.append(pulse)
+    return pulses
+
+
+def packet_airtime(packet: bytes) -> float:
+    """Return the seconds a raw Broadlink RF packet is on the air.
+
+    The second header byte is the number of times the blaster repeats the
+    payload (set for held buttons).
+    """
+    return sum(parse_pulses(packet)) * PULSE_UNIT * (packet[1] + 1)
+
+
+# Every data bit takes the same time, so all frames are equally long (the
+# last bit differs by a fraction of a millisecond; 0 is the longer one)
+FRAME_AIRTIME = packet_airtime(encode_packet(0, False))
+HOLD_FRAME_AIRTIME = packet_airtime(encode_packet(0, True))
@@ -0,0 +1,45 @@
+"""Load the core package without the Home Assistant integration.
+
+Importing custom_components.jarolift.core normally runs the integration's
+__init__.py first, which imports Home Assistant. Running this file by path
+registers the core package under its usual name without its parent, so the
+imports, pickled function references and module state are the same as
+inside Home Assistant:
+
+    import runpy
+    runpy.run_path("custom_components/jarolift/core/standalone.py")
+    from custom_components.jarolift.core import BuildPacket
+
+The cipher process pool uses it as the initializer of its worker processes.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+CORE_PACKAGE = "custom_components.jarolift.core"
+STANDALONE_PATH = str(Path(__file__))
+
+
+def load_core():
+    """Import the core package without importing its parent packages."""
+    if CORE_PACKAGE in sys.modules:
+        return sys.modules[CORE_PACKAGE]
+    directory = Path(__file__).parent
+    spec = importlib.util.spec_from_file_location(
+        CORE_PACKAGE,
+        directory / "__init__.py",
+        submodule_search_locations=[str(directory)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[CORE_PACKAGE] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[CORE_PACKAGE]
+        raise
+    return module
+
+
+if __name__ in ("__main__", "<run_path>"):
+    load_core()
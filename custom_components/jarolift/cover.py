@@ -8,14 +8,20 @@ Features:
 - Open/Close/Stop commands
 - Reverse mode for covers wired backwards
 - Configurable repeat counts and delays for reliable operation
+- Optional batching of repeats into a single remote call
+- Optional time-based position tracking with set_position support
 - Device info for UI integration
 """
 
 import logging
+import time
+from datetime import timedelta
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
+    ATTR_POSITION,
     PLATFORM_SCHEMA,
     CoverDeviceClass,
     CoverEntity,
@@ -23,24 +29,41 @@ from homeassistant.components.cover import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
 from . import (
+    CONF_COUNTER_POLICY,
     CONF_COVERS,
     CONF_GROUP,
+    CONF_REMOTE_ENTITY_ID,
     CONF_REP_COUNT,
     CONF_REP_DELAY,
+    CONF_REPEAT_MODE,
     CONF_REVERSE,
     CONF_SERIAL,
+    CONF_TRAVEL_TIME_DOWN,
+    CONF_TRAVEL_TIME_UP,
+    DEFAULT_COUNTER_POLICY,
+    DEFAULT_REPEAT_MODE,
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
     DEVICE_NAME,
     DEVICE_SW_VERSION,
     DOMAIN,
+    REPEAT_MODES,
     _has_config_entry,
 )
+from .core.counter import (
+    COUNTER_POLICIES,
+    LEGACY_COUNTER_POLICIES,
+    resolve_counter_policy,
+)
+from .position import PositionTracker
 
 _COVERS_SCHEMA = vol.All(
     cv.ensure_list,
@@ -53,6 +76,15 @@ _COVERS_SCHEMA = vol.All(
                 vol.Optional(CONF_REP_COUNT, default=0): cv.positive_int,
                 vol.Optional(CONF_REP_DELAY, default=0.2): cv.positive_float,
                 vol.Optional(CONF_REVERSE, default=False): cv.boolean,
+                vol.Optional(CONF_REMOTE_ENTITY_ID): cv.string,
+                vol.Optional(CONF_REPEAT_MODE, default=DEFAULT_REPEAT_MODE): vol.In(
+                    REPEAT_MODES
+                ),
+                vol.Optional(CONF_TRAVEL_TIME_UP, default=0): cv.positive_float,
+                vol.Optional(CONF_TRAVEL_TIME_DOWN, default=0): cv.positive_float,
+                vol.Optional(
+                    CONF_COUNTER_POLICY, default=DEFAULT_COUNTER_POLICY
+                ): vol.In([*COUNTER_POLICIES, *LEGACY_COUNTER_POLICIES]),
             }
         )
     ],
@@ -68,6 +100,9 @@ DEPENDENCIES = ["jarolift"]
 
 _LOGGER = logging.getLogger(__name__)
 
+# How often the estimated position is published while a cover is moving
+POSITION_UPDATE_INTERVAL = timedelta(seconds=1)
+
 
 def setup_platform(hass, config, add_devices, discovery_info=None):
     """Set up the Jarolift covers from YAML (backward compatibility)."""
@@ -86,16 +121,23 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
         # YAML import is pending - store configs but don't create entities
         # The entities will be created by async_setup_entry after import
         for cover in covers_conf:
-            yaml_covers.append(
-                {
-                    CONF_NAME: cover[CONF_NAME],
-                    CONF_GROUP: cover[CONF_GROUP],
-                    CONF_SERIAL: cover[CONF_SERIAL],
-                    CONF_REP_COUNT: cover.get(CONF_REP_COUNT, 0),
-                    CONF_REP_DELAY: cover.get(CONF_REP_DELAY, 0.2),
-                    CONF_REVERSE: cover.get(CONF_REVERSE, False),
-                }
-            )
+            cover_config = {
+                CONF_NAME: cover[CONF_NAME],
+                CONF_GROUP: cover[CONF_GROUP],
+                CONF_SERIAL: cover[CONF_SERIAL],
+                CONF_REP_COUNT: cover.get(CONF_REP_COUNT, 0),
+                CONF_REP_DELAY: cover.get(CONF_REP_DELAY, 0.2),
+                CONF_REVERSE: cover.get(CONF_REVERSE, False),
+                CONF_REPEAT_MODE: cover.get(CONF_REPEAT_MODE, DEFAULT_REPEAT_MODE),
+                CONF_TRAVEL_TIME_UP: cover.get(CONF_TRAVEL_TIME_UP, 0),
+                CONF_TRAVEL_TIME_DOWN: cover.get(CONF_TRAVEL_TIME_DOWN, 0),
+                CONF_COUNTER_POLICY: cover.get(
+                    CONF_COUNTER_POLICY, DEFAULT_COUNTER_POLICY
+                ),
+            }
+            if CONF_REMOTE_ENTITY_ID in cover:
+                cover_config[CONF_REMOTE_ENTITY_ID] = cover[CONF_REMOTE_ENTITY_ID]
+            yaml_covers.append(cover_config)
         _LOGGER.info(
             "YAML config stored for import, entities will be created via config entry"
         )
@@ -113,6 +155,11 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
                 cover[CONF_REP_DELAY],
                 cover[CONF_REVERSE],
                 hass,
+                remote_entity_id=cover.get(CONF_REMOTE_ENTITY_ID),
+                repeat_mode=cover[CONF_REPEAT_MODE],
+                travel_time_up=cover[CONF_TRAVEL_TIME_UP],
+                travel_time_down=cover[CONF_TRAVEL_TIME_DOWN],
+                counter_policy=cover[CONF_COUNTER_POLICY],
             )
         )
     add_devices(covers)
@@ -139,16 +186,23 @@ async def async_setup_entry(
                 cover.get(CONF_REVERSE, False),
                 hass,
                 config_entry.entry_id,
+                cover.get(CONF_REMOTE_ENTITY_ID),
+                cover.get(CONF_REPEAT_MODE, DEFAULT_REPEAT_MODE),
+                cover.get(CONF_TRAVEL_TIME_UP, 0),
+                cover.get(CONF_TRAVEL_TIME_DOWN, 0),
+                cover.get(CONF_COUNTER_POLICY, DEFAULT_COUNTER_POLICY),
             )
         )
     async_add_entities(covers)
 
 
-class JaroliftCover(CoverEntity):
+class JaroliftCover(CoverEntity, RestoreEntity):
     """Representation of a Jarolift motorized cover.
 
     This entity represents a single Jarolift cover (blind, shutter, or awning)
     and provides standard Home Assistant cover controls (open, close, stop).
+    With travel times configured, the position is estimated from the running
+    time of the motor and the cover can be moved to a position.
 
     Button codes used:
     - 0x2: Down/Close
@@ -176,6 +230,11 @@ class JaroliftCover(CoverEntity):
         reversed: bool,
         hass: HomeAssistant,
         entry_id: str | None = None,
+        remote_entity_id: str | None = None,
+        repeat_mode: str = DEFAULT_REPEAT_MODE,
+        travel_time_up: float = 0,
+        travel_time_down: float = 0,
+        counter_policy: str = DEFAULT_COUNTER_POLICY,
     ):
         """Initialize the Jarolift cover entity.
 
@@ -188,6 +247,11 @@ class JaroliftCover(CoverEntity):
             reversed: If True, swap open/close buttons (for reversed wiring)
             hass: Home Assistant instance
             entry_id: Config entry ID (None for YAML mode)
+            remote_entity_id: Remote entity for this cover (None for hub remote)
+            repeat_mode: How repeats are handed to the remote (REPEAT_MODES)
+            travel_time_up: Seconds to fully open (0 = no position tracking)
+            travel_time_down: Seconds to fully close (0 = no position tracking)
+            counter_policy: How repeats use counter values (COUNTER_POLICIES)
         """
         self._name = name
         self._group = group
@@ -197,10 +261,23 @@ class JaroliftCover(CoverEntity):
         self._reversed = reversed
         self._hass = hass
         self._entry_id = entry_id
+        self._remote_entity_id = remote_entity_id
+        self._repeat_mode = repeat_mode
+        self._counter_policy = resolve_counter_policy(counter_policy)
         supported_features = 0
         supported_features |= CoverEntityFeature.OPEN
         supported_features |= CoverEntityFeature.CLOSE
         supported_features |= CoverEntityFeature.STOP
+        self._tracker: PositionTracker | None = None
+        if travel_time_up > 0 and travel_time_down > 0:
+            self._tracker = PositionTracker(travel_time_up, travel_time_down)
+            supported_features |= CoverEntityFeature.SET_POSITION
+        self._pending_position: int | None = None
+        # Incremented by every command, so a move that was sent after a
+        # newer command does not start estimating its run
+        self._command = 0
+        self._unsub_travel = None
+        self._unsub_updates = None
         self._attr_supported_features = supported_features
         self._attr_device_class = CoverDeviceClass.BLIND
         self._attr_unique_id = f"jarolift_{serial}_{group}"
@@ -238,14 +315,68 @@ class JaroliftCover(CoverEntity):
     @property
     def is_closed(self) -> bool | None:
         """Return true if cover is closed, None if unknown."""
-        return None
+        position = self.current_cover_position
+        if position is None:
+            return None
+        return position == 0
+
+    @property
+    def is_opening(self) -> bool | None:
+        """Return true while the cover is estimated to be opening."""
+        return self._tracker is not None and self._tracker.is_opening
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Return true while the cover is estimated to be closing."""
+        return self._tracker is not None and self._tracker.is_closing
 
     @property
     def current_cover_position(self) -> int | None:
         """Return the current position of the cover.
         None is unknown, 0 is closed, 100 is fully open.
         """
-        return None
+        if self._tracker is None:
+            return None
+        position = self._tracker.position(self._now())
+        return None if position is None else round(position)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the counter policy and the counters consumed per day.
+
+        counters_today and counter_usage count the counter values of the
+        frames addressed to this cover, including group frames it shares
+        with other covers. They are kept in memory and start over on restart.
+        """
+        usage = self._hass.data.get(DOMAIN, {}).get("counter_usage")
+        serial = int(self._serial, 16)
+        group = int(self._group, 16)
+        today = dt_util.now().date()
+        return {
+            CONF_COUNTER_POLICY: self._counter_policy,
+            "counters_today": usage.get(serial, group, today) if usage else 0,
+            "counter_usage": usage.history(serial, group) if usage else {},
+        }
+
+    def _now(self) -> float:
+        """Return the monotonic time used for position estimation."""
+        return time.monotonic()
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known position."""
+        await super().async_added_to_hass()
+        if self._tracker is None:
+            return
+        last_state = await self.async_get_last_state()
+        if last_state is None:
+            return
+        position = last_state.attributes.get(ATTR_CURRENT_POSITION)
+        if position is not None:
+            self._tracker.set_position(position)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel running position timers."""
+        self._cancel_travel()
 
     async def async_close_cover(self, **kwargs):
         """Close the cover."""
@@ -253,7 +384,7 @@ class JaroliftCover(CoverEntity):
         _LOGGER.debug(
             "closing cover, sending %s (reversed=%s)", actual_code, self._reversed
         )
-        await self.async_push_button(actual_code)
+        await self._async_move(actual_code, 0)
 
     async def async_open_cover(self, **kwargs):
         """Open the cover."""
@@ -261,24 +392,137 @@ class JaroliftCover(CoverEntity):
         _LOGGER.debug(
             "opening cover, sending %s (reversed=%s)", actual_code, self._reversed
         )
-        await self.async_push_button(actual_code)
+        await self._async_move(actual_code, 100)
 
     async def async_stop_cover(self, **kwargs):
         """Stop the cover."""
         _LOGGER.debug("stopping cover")
+        self._pending_position = None
+        self._command += 1
+        self._cancel_travel()
+        if self._tracker is not None:
+            self._tracker.stop(self._now())
         await self.async_push_button(type(self).code_stop)
 
+    async def async_set_cover_position(self, **kwargs):
+        """Move the cover to a position, stopping it when it gets there."""
+        position = kwargs[ATTR_POSITION]
+        current = self.current_cover_position
+        pending = None
+        if position in (0, 100) or current is None:
+            # End positions need no stop; with an unknown position the cover
+            # first runs into the nearer end position to calibrate
+            target = 100 if position >= 50 else 0
+            opening = target == 100
+            if position != target:
+                pending = position
+        elif position == current:
+            return
+        else:
+            target = position
+            opening = position > current
+
+        if opening:
+            code = type(self).code_down if self._reversed else type(self).code_up
+        else:
+            code = type(self).code_up if self._reversed else type(self).code_down
+        _LOGGER.debug("moving cover from %s to %s, sending %s", current, target, code)
+        await self._async_move(code, target, pending)
+
+    async def _async_move(
+        self, code: str, target: int, pending: int | None = None
+    ) -> None:
+        """Send a move and start estimating the run once it is on the air.
+
+        The run (and the stop ending it at an intermediate position) only
+        starts after the move was sent, so a busy transmitter does not make
+        the estimate run ahead of the motor, and the stop can never replace
+        the move while it is still waiting for the transmitter.
+
+        Args:
+            code: Button to send
+            target: Position the button moves the cover to
+            pending: Position to continue to after a calibration run
+        """
+        self._cancel_travel()
+        self._pending_position = pending
+        self._command += 1
+        command = self._command
+        await self.async_push_button(code)
+        if command == self._command:
+            self._start_travel(target)
+
+    def _start_travel(self, target: int) -> None:
+        """Start estimating a run to target and schedule its arrival."""
+        if self._tracker is None:
+            return
+        self._cancel_travel()
+        duration = self._tracker.start(target, self._now())
+        self._unsub_travel = async_call_later(
+            self._hass, duration, self._async_travel_done
+        )
+        self._unsub_updates = async_track_time_interval(
+            self._hass, self._async_publish_position, POSITION_UPDATE_INTERVAL
+        )
+
+    def _cancel_travel(self) -> None:
+        """Cancel the arrival and position update timers."""
+        if self._unsub_travel is not None:
+            self._unsub_travel()
+            self._unsub_travel = None
+        if self._unsub_updates is not None:
+            self._unsub_updates()
+            self._unsub_updates = None
+
+    @callback
+    def _async_publish_position(self, _now) -> None:
+        """Publish the estimated position while the cover is moving."""
+        self.async_write_ha_state()
+
+    @callback
+    def _async_travel_done(self, _now) -> None:
+        """Handle the cover reaching the target of its run."""
+        self._unsub_travel = None
+        self._cancel_travel()
+        target = self._tracker.target
+        self._tracker.set_position(target)
+        if target not in (0, 100):
+            # Intermediate positions are held by sending stop
+            self._hass.async_create_task(self._async_hold_position(self._command))
+        elif self._pending_position is not None:
+            # Calibration run finished, continue to the requested position
+            position, self._pending_position = self._pending_position, None
+            self._hass.async_create_task(
+                self.async_set_cover_position(**{ATTR_POSITION: position})
+            )
+        self.async_write_ha_state()
+
+    async def _async_hold_position(self, command: int) -> None:
+        """Send the stop ending a run, unless a newer command was issued."""
+        if command == self._command:
+            await self.async_push_button(type(self).code_stop)
+
     async def async_push_button(self, value: str) -> None:
-        """Push a button on the Jarolift cover."""
+        """Push a button on the Jarolift cover.
+
+        Returns once the frames were handed to the remote entity, or the
+        command was replaced by a newer one for this cover.
+        """
+        service_data = {
+            "group": self._group,
+            "serial": self._serial,
+            "rep_count": self._rep_count,
+            "rep_delay": self._rep_delay,
+            "button": value,
+            CONF_REPEAT_MODE: self._repeat_mode,
+            CONF_COUNTER_POLICY: self._counter_policy,
+        }
+        if self._remote_entity_id:
+            service_data[CONF_REMOTE_ENTITY_ID] = self._remote_entity_id
         await self._hass.services.async_call(
             "jarolift",
             "send_command",
-            {
-                "group": self._group,
-                "serial": self._serial,
-                "rep_count": self._rep_count,
-                "rep_delay": self._rep_delay,
-                "button": value,
-            },
+            service_data,
+            blocking=True,
         )
         self.async_schedule_update_ha_state(True)
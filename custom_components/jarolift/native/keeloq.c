@@ -0,0 +1,65 @@
+/*
+ * Optional native KeeLoq kernel for the Jarolift integration.
+ *
+ * Bit-identical to keeloq.py; loaded through ctypes by keeloq_native.py,
+ * which falls back to the pure Python engine if the library is missing or
+ * fails its self-test. Build it next to this file:
+ *
+ *   Linux:   cc -O2 -shared -fPIC -o libkeeloq.so keeloq.c
+ *   macOS:   cc -O2 -shared -fPIC -o libkeeloq.dylib keeloq.c
+ *   Windows: cl /O2 /LD keeloq.c /Fe:keeloq.dll
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(_WIN32)
+#define KEELOQ_EXPORT __declspec(dllexport)
+#else
+#define KEELOQ_EXPORT
+#endif
+
+#define KEELOQ_NLF 0x3A5C742Eu
+#define KEELOQ_ROUNDS 528u
+#define BIT(x, n) (((x) >> (n)) & 1u)
+
+/* Encrypt count values in place under one 64-bit key. */
+KEELOQ_EXPORT void keeloq_encrypt_many(uint32_t *values, size_t count,
+                                       uint32_t key_high, uint32_t key_low)
+{
+    uint64_t key = ((uint64_t)key_high << 32) | key_low;
+
+    for (size_t i = 0; i < count; i++) {
+        uint32_t x = values[i];
+        for (uint32_t r = 0; r < KEELOQ_ROUNDS; r++) {
+            /* NLF(x1, x9, x20, x26, x31) ^ x0 ^ x16 ^ key bit */
+            uint32_t index = BIT(x, 1) | BIT(x, 9) << 1 | BIT(x, 20) << 2 |
+                             BIT(x, 26) << 3 | BIT(x, 31) << 4;
+            uint32_t feedback = BIT(KEELOQ_NLF, index) ^ BIT(x, 0) ^
+                                BIT(x, 16) ^ (uint32_t)((key >> (r & 63u)) & 1u);
+            x = (x >> 1) | (feedback << 31);
+        }
+        values[i] = x;
+    }
+}
+
+/* Decrypt count values in place under one 64-bit key. */
+KEELOQ_EXPORT void keeloq_decrypt_many(uint32_t *values, size_t count,
+                                       uint32_t key_high, uint32_t key_low)
+{
+    uint64_t key = ((uint64_t)key_high << 32) | key_low;
+
+    for (size_t i = 0; i < count; i++) {
+        uint32_t x = values[i];
+        for (uint32_t r = 0; r < KEELOQ_ROUNDS; r++) {
+            /* NLF(x0, x8, x19, x25, x30) ^ x31 ^ x15 ^ key bit */
+            uint32_t index = BIT(x, 0) | BIT(x, 8) << 1 | BIT(x, 19) << 2 |
+                             BIT(x, 25) << 3 | BIT(x, 30) << 4;
+            uint32_t feedback = BIT(KEELOQ_NLF, index) ^ BIT(x, 31) ^
+                                BIT(x, 15) ^
+                                (uint32_t)((key >> ((15u - r) & 63u)) & 1u);
+            x = (x << 1) | feedback;
+        }
+        values[i] = x;
+    }
+}
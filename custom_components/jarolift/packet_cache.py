@@ -0,0 +1,95 @@
+"""Cache of precomputed packets for upcoming counter values.
+
+Building a packet runs the KeeLoq cipher, which is the only expensive step
+between a command and its frame going out. Since the counter of a serial only
+ever moves forward, the packets for the next few counters of a command can be
+built ahead of time. The cache keeps such a window of ready packets for the
+most recently used commands; the send path pops a packet if it is there and
+builds the missing ones with build_window() in an executor job otherwise.
+
+The cache is owned by the event loop. Windows are computed with
+build_window() in an executor job and stored with add() afterwards.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+
+# Packets built ahead per command
+DEFAULT_PACKET_CACHE_DEPTH = 8
+# Upper bound on cached commands (least recently used are dropped first)
+DEFAULT_PACKET_CACHE_SIZE = 64
+
+# (Grouping, Serial, Button, MSB, LSB, Hold)
+PacketKey = tuple[int, int, int, int, int, bool]
+
+
+class PacketCache:
+    """Bounded LRU of precomputed packets per command and counter."""
+
+    def __init__(
+        self,
+        build: Callable[[int, int, int, int, int, int, bool], str],
+        depth: int = DEFAULT_PACKET_CACHE_DEPTH,
+        size: int = DEFAULT_PACKET_CACHE_SIZE,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            build: Packet builder with the signature of BuildPacket()
+            depth: Number of counter values to build ahead per command
+            size: Maximum number of cached commands
+        """
+        self._build = build
+        self.depth = depth
+        self.size = size
+        self._windows: OrderedDict[PacketKey, dict[int, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached commands."""
+        return len(self._windows)
+
+    def pop(self, key: PacketKey, counter: int) -> str | None:
+        """Return and remove the cached packet of a command and counter."""
+        window = self._windows.get(key)
+        packet = None if window is None else window.pop(counter, None)
+        if packet is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._windows.move_to_end(key)
+        return packet
+
+    def keys_for_serial(self, serial: int) -> list[PacketKey]:
+        """Return the cached commands of a serial."""
+        return [key for key in self._windows if key[1] == serial]
+
+    def missing(self, key: PacketKey, first: int) -> list[int]:
+        """Return the counters of the window starting at first not cached yet."""
+        window = self._windows.get(key, {})
+        return [c for c in range(first, first + self.depth) if c not in window]
+
+    def build_window(self, key: PacketKey, counters: list[int]) -> dict[int, str]:
+        """Build the packets of a command for counters (blocking, no state)."""
+        Grouping, Serial, Button, MSB, LSB, Hold = key
+        return {
+            counter: self._build(Grouping, Serial, Button, counter, MSB, LSB, Hold)
+            for counter in counters
+        }
+
+    def add(self, key: PacketKey, first: int, packets: dict[int, str]) -> None:
+        """Store built packets, dropping counters below first (already used)."""
+        window = self._windows.setdefault(key, {})
+        for counter in [c for c in window if c < first]:
+            del window[counter]
+        window.update(
+            (counter, packet) for counter, packet in packets.items() if counter >= first
+        )
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.size:
+            self._windows.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached packets."""
+        self._windows.clear()
@@ -0,0 +1,110 @@
+"""Time-based position estimation for Jarolift covers.
+
+Jarolift receivers do not report their position, so it is estimated from the
+time the motor has been running and the configured travel times for a full
+opening and closing run. Positions follow Home Assistant: 0 is closed, 100 is
+fully open.
+
+The tracker only does arithmetic on timestamps passed in by the caller; the
+cover entity drives it with event loop timers.
+"""
+
+
+class PositionTracker:
+    """Estimate the position of a cover from its travel times.
+
+    While the position is unknown (fresh setup, nothing restored) the cover
+    has to run into an end position once before intermediate positions can
+    be estimated.
+    """
+
+    def __init__(
+        self,
+        travel_time_up: float,
+        travel_time_down: float,
+        position: float | None = None,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            travel_time_up: Seconds for a full run from closed to open
+            travel_time_down: Seconds for a full run from open to closed
+            position: Known position, or None if unknown
+        """
+        self.travel_time_up = travel_time_up
+        self.travel_time_down = travel_time_down
+        self._position = position
+        self._target: int | None = None
+        self._started: float = 0.0
+
+    @property
+    def target(self) -> int | None:
+        """Return the position the cover is travelling to (None if idle)."""
+        return self._target
+
+    @property
+    def is_opening(self) -> bool:
+        """Return True while the cover travels up."""
+        return self._target is not None and self._direction() > 0
+
+    @property
+    def is_closing(self) -> bool:
+        """Return True while the cover travels down."""
+        return self._target is not None and self._direction() < 0
+
+    def _direction(self) -> int:
+        """Return +1 when travelling up, -1 when travelling down."""
+        if self._position is None:
+            return 1 if self._target == 100 else -1
+        return 1 if self._target > self._position else -1
+
+    def _travel_time(self, direction: int) -> float:
+        """Return the full travel time in a direction."""
+        return self.travel_time_up if direction > 0 else self.travel_time_down
+
+    def set_position(self, position: float | None) -> None:
+        """Set the position while the cover is idle (e.g. restored state)."""
+        self._position = position
+        self._target = None
+
+    def position(self, now: float) -> float | None:
+        """Return the estimated position at a point in time."""
+        if self._target is None or self._position is None:
+            return self._position
+        direction = self._direction()
+        moved = (now - self._started) * 100 / self._travel_time(direction)
+        if direction > 0:
+            return min(self._position + moved, self._target)
+        return max(self._position - moved, self._target)
+
+    def start(self, target: int, now: float) -> float:
+        """Start travelling to a target position.
+
+        Args:
+            target: Position to travel to (0-100); must be an end position
+                while the current position is unknown
+            now: Current time in seconds
+
+        Returns:
+            Seconds until the target is reached
+        """
+        self._position = self.position(now)
+        self._target = target
+        self._started = now
+        direction = self._direction()
+        if self._position is None:
+            # Unknown start: a full run guarantees the end position
+            return self._travel_time(direction)
+        return abs(target - self._position) * self._travel_time(direction) / 100
+
+    def stop(self, now: float) -> None:
+        """Stop travelling and keep the position reached at now."""
+        if self._target is None:
+            return
+        if self._position is None:
+            # A full run was interrupted, the position is still unknown
+            if now - self._started >= self._travel_time(self._direction()):
+                self._position = self._target
+        else:
+            self._position = self.position(now)
+        self._target = None
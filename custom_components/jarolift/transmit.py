@@ -0,0 +1,343 @@
+"""Asynchronous transmit pipeline for Jarolift commands.
+
+Every remote entity (RF blaster) gets a JaroliftTransmitter. Jobs submitted to
+it are executed one at a time by a single consumer task, so frames of
+different commands never interleave on the same transmitter. All timing
+(repeat delays, learn/clear gaps and the minimum delay between covers) is
+done with asyncio.sleep() inside the consumer, which keeps both the event
+loop and the executor threads free while a command is on the air.
+
+Waiting jobs are not strictly first in, first out. The next job is the one
+with the highest priority, then the earliest deadline (jobs without one come
+last), then the shortest estimated airtime, then the oldest. Shortest first
+minimizes the total time covers wait for their command, and since all frames
+take the same time, commands with equal repeats keep their order. Stop
+commands are submitted with PRIORITY_STOP so they overtake queued opens and
+closes, and a long job (many covers) can let them run between its covers
+with async_run_urgent().
+
+Callers get an awaitable future that completes once the job's frames have
+been handed to the remote entity.
+
+Group commands (same serial and button, different group bits) that are still
+waiting in the queue are merged into a single job whose group mask is the OR
+of all merged commands, so one frame reaches all of their receivers.
+
+Group commands also name the cover (member) they are for. The last command of
+a cover wins: a newer command removes the cover from its older job while that
+job is still waiting, and the job is dropped once no cover is left in it. A
+repeat of the command currently on the air for a cover joins that job instead
+of being sent again. Jobs for several covers (send_command_many) are
+submitted with all of their members. A cover that gets a newer command is
+marked superseded in such a job, which checks is_superseded() before each of
+its covers.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import operator
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from functools import reduce
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Job priorities; higher runs first
+PRIORITY_BULK = -10
+PRIORITY_NORMAL = 0
+PRIORITY_STOP = 10
+
+
+@dataclass
+class TransmitJob:
+    """A unit of work executed exclusively on one transmitter.
+
+    Attributes:
+        run: Coroutine function sending the frames of the job
+        delay: Pause after the job before the next job may transmit
+        future: Completed when the job's frames are on the air
+        key: Merge key of a group command (None if the job is not mergeable)
+        members: Group mask of every command merged into the job, by member
+        priority: Jobs with a higher priority are sent first
+        deadline: Event loop time the job should be sent by (None if none)
+        airtime: Estimated seconds the job keeps the transmitter busy
+        seq: Submission order, set when the job is queued
+        superseded: Members that got a newer command after the job was queued
+    """
+
+    run: Callable[[], Awaitable[None]]
+    delay: float
+    future: asyncio.Future
+    key: Hashable | None = None
+    members: dict[Hashable, int] = field(default_factory=dict)
+    priority: int = PRIORITY_NORMAL
+    deadline: float | None = None
+    airtime: float = 0.0
+    seq: int = 0
+    superseded: set[Hashable] = field(default_factory=set)
+
+    def order(self) -> tuple:
+        """Return the sort key of the job in the queue (lowest runs first)."""
+        deadline = math.inf if self.deadline is None else self.deadline
+        return (-self.priority, deadline, self.airtime, self.seq)
+
+    @property
+    def grouping(self) -> int:
+        """Return the OR-ed group mask of all commands in the job."""
+        return reduce(operator.or_, self.members.values(), 0)
+
+
+class JaroliftTransmitter:
+    """Serialize transmissions of a single remote entity.
+
+    The consumer task is started on demand when the first job is queued and
+    ends when the queue is empty, so at most one consumer exists per remote.
+    async_shutdown() stops it when the integration is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, remote_entity_id: str) -> None:
+        """Initialize the transmitter.
+
+        Args:
+            hass: Home Assistant instance
+            remote_entity_id: Remote entity the frames are sent through
+        """
+        self._hass = hass
+        self.remote_entity_id = remote_entity_id
+        self._jobs: deque[TransmitJob] = deque()
+        self._active: TransmitJob | None = None
+        self._grouped: dict[Hashable, TransmitJob] = {}
+        self._members: dict[Hashable, TransmitJob] = {}
+        self._consumer: asyncio.Task | None = None
+        self._seq = itertools.count()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of jobs waiting for the transmitter."""
+        return len(self._jobs)
+
+    def async_submit(
+        self,
+        run: Callable[[], Awaitable[None]],
+        delay: float = 0,
+        priority: int = PRIORITY_NORMAL,
+        deadline: float | None = None,
+        airtime: float = 0.0,
+        members: dict[Hashable, int] | None = None,
+    ) -> asyncio.Future:
+        """Queue a job and return a future completed once it was sent.
+
+        Args:
+            run: Coroutine function sending the frames of the job
+            delay: Pause after the job before the next job may transmit
+            priority: Jobs with a higher priority are sent first
+            deadline: Seconds from now the job should be sent within
+            airtime: Estimated seconds the job keeps the transmitter busy
+            members: Group mask by cover the job sends to; the job becomes
+                the last command of each of them (None for no covers)
+
+        Returns:
+            Future resolved with None when done, or with the job's exception
+        """
+        job = TransmitJob(
+            run,
+            delay,
+            self._hass.loop.create_future(),
+            priority=priority,
+            deadline=self._deadline(deadline),
+            airtime=airtime,
+        )
+        for member, grouping in (members or {}).items():
+            current = self._members.get(member)
+            if current is not None:
+                self._async_supersede(member, current)
+            job.members[member] = grouping
+            self._members[member] = job
+        return self._async_queue(job)
+
+    def _deadline(self, deadline: float | None) -> float | None:
+        """Return the event loop time of a deadline given in seconds from now."""
+        return None if deadline is None else self._hass.loop.time() + deadline
+
+    def async_submit_grouped(
+        self,
+        key: Hashable,
+        grouping: int,
+        run: Callable[[int], Awaitable[None]],
+        delay: float = 0,
+        member: Hashable | None = None,
+        priority: int = PRIORITY_NORMAL,
+        deadline: float | None = None,
+        airtime: float = 0.0,
+    ) -> asyncio.Future:
+        """Queue a group command, merging it into a waiting job with the same key.
+
+        A merged job takes the highest priority and earliest deadline of its
+        commands.
+
+        Args:
+            key: Identifies commands that may share one frame (serial, button, ...)
+            grouping: Group mask of this command
+            run: Coroutine function sending the frames for a group mask
+            delay: Pause after the job before the next job may transmit
+            member: Cover the command is for; its older waiting command is
+                superseded (None to never supersede)
+            priority: See async_submit()
+            deadline: See async_submit()
+            airtime: See async_submit()
+
+        Returns:
+            Future of the (possibly shared) job, see async_submit(); the
+            future of a dropped job completes without sending
+        """
+        anonymous = member is None
+        if anonymous:
+            member = object()
+        current = self._members.get(member)
+        if current is not None and current.key == key and current is self._active:
+            _LOGGER.debug("Command for %s is already on the air", member)
+            return current.future
+        if current is not None and current.key != key:
+            self._async_supersede(member, current)
+
+        deadline = self._deadline(deadline)
+        job = self._grouped.get(key)
+        if job is not None:
+            job.members[member] = grouping
+            job.priority = max(job.priority, priority)
+            if deadline is not None:
+                job.deadline = min(job.deadline or math.inf, deadline)
+            _LOGGER.debug(
+                "Merged group 0x%04X into queued command, group mask now 0x%04X",
+                grouping,
+                job.grouping,
+            )
+        else:
+            job = TransmitJob(
+                lambda: run(job.grouping),
+                delay,
+                self._hass.loop.create_future(),
+                key,
+                {member: grouping},
+                priority,
+                deadline,
+                airtime,
+            )
+            self._grouped[key] = job
+            self._async_queue(job)
+        if not anonymous:
+            self._members[member] = job
+        return job.future
+
+    def _async_supersede(self, member: Hashable, job: TransmitJob) -> None:
+        """Remove a member from a waiting job, dropping the job if it is empty.
+
+        The member is marked superseded, see is_superseded(). A job that
+        already started (including one paused by async_run_urgent()) keeps it.
+        """
+        job.superseded.add(member)
+        if all(waiting is not job for waiting in self._jobs):
+            return
+        job.members.pop(member, None)
+        if job.members:
+            _LOGGER.debug("Removed superseded command for %s from queue", member)
+            return
+        _LOGGER.debug("Dropped superseded command for %s", member)
+        self._jobs.remove(job)
+        self._grouped.pop(job.key, None)
+        if not job.future.done():
+            job.future.set_result(None)
+
+    def is_superseded(self, member: Hashable) -> bool:
+        """Return True if a member of the active job got a newer command."""
+        return self._active is not None and member in self._active.superseded
+
+    def _async_queue(self, job: TransmitJob) -> asyncio.Future:
+        """Append a job and start the consumer if it is not running."""
+        job.seq = next(self._seq)
+        self._jobs.append(job)
+        if self._consumer is None:
+            self._consumer = self._hass.async_create_task(self._async_consume())
+        return job.future
+
+    def _next_job(self) -> TransmitJob:
+        """Remove and return the waiting job that should be sent next."""
+        job = min(self._jobs, key=TransmitJob.order)
+        self._jobs.remove(job)
+        return job
+
+    async def _async_run_job(self, job: TransmitJob) -> None:
+        """Send a job, complete its future and wait its delay."""
+        self._active = job
+        if job.key is not None:
+            # Once started, the group mask of the job is fixed
+            self._grouped.pop(job.key, None)
+        if job.deadline is not None and self._hass.loop.time() > job.deadline:
+            _LOGGER.debug("Command via %s missed its deadline", self.remote_entity_id)
+        try:
+            await job.run()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error("Transmission via %s failed: %s", self.remote_entity_id, err)
+            if not job.future.done():
+                job.future.set_exception(err)
+        else:
+            if not job.future.done():
+                job.future.set_result(None)
+        for member in job.members:
+            if self._members.get(member) is job:
+                del self._members[member]
+        if job.delay:
+            await asyncio.sleep(job.delay)
+
+    async def async_run_urgent(self) -> None:
+        """Send waiting jobs with a higher priority than the active job.
+
+        Meant to be awaited by a long running job between two of its covers,
+        so e.g. a stop does not wait until all covers of the job are sent.
+        """
+        active = self._active
+        if active is None:
+            return
+        try:
+            while self._jobs:
+                job = min(self._jobs, key=TransmitJob.order)
+                if job.priority <= active.priority:
+                    break
+                self._jobs.remove(job)
+                await self._async_run_job(job)
+        finally:
+            self._active = active
+
+    async def async_shutdown(self) -> None:
+        """Stop the consumer; the active and all waiting jobs are cancelled."""
+        consumer = self._consumer
+        if consumer is None:
+            return
+        consumer.cancel()
+        # Waits without raising the consumer's CancelledError here
+        await asyncio.wait([consumer])
+
+    async def _async_consume(self) -> None:
+        """Run queued jobs one after another until the queue is empty."""
+        try:
+            while self._jobs:
+                await self._async_run_job(self._next_job())
+                self._active = None
+        except asyncio.CancelledError:
+            # Shutting down: nothing queued will be sent anymore
+            if self._active is not None:
+                self._active.future.cancel()
+            for job in self._jobs:
+                job.future.cancel()
+            self._jobs.clear()
+            self._grouped.clear()
+            self._members.clear()
+            raise
+        finally:
+            self._active = None
+            self._consumer = None
@@ -50,7 +50,7 @@ for cover in sample_covers:
         hass=None,
         entry_id=entry_id,
     )
-    
+
     print(f"Cover: {cover['name']}")
     print(f"  └─ Button Entity Name: {button._attr_name}")
     print(f"     Unique ID: {button._attr_unique_id}")
@@ -2,6 +2,7 @@
 
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 # Add parent directory to path to import custom_components
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -103,6 +104,25 @@ def test_button_attributes():
     assert button._entry_id == "test_entry"
 
 
+async def test_button_uses_cover_remote():
+    """Test that the learn button forwards the cover's remote entity."""
+    hass = MagicMock()
+    hass.services.async_call = AsyncMock()
+    button = JaroliftLearnButton(
+        cover_name="Test Cover",
+        group="0x0001",
+        serial="0x116ea01",
+        hass=hass,
+        entry_id="test_entry",
+        remote_entity_id="remote.upstairs",
+    )
+
+    await button.async_press()
+
+    service_data = hass.services.async_call.await_args.args[2]
+    assert service_data["remote_entity_id"] == "remote.upstairs"
+
+
 if __name__ == "__main__":
     print("Testing button entities...")
 
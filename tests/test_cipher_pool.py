@@ -0,0 +1,60 @@
+"""Tests for the optional process pool for bulk KeeLoq work."""
+
+from custom_components.jarolift import cipher_pool as cipher_pool_module
+from custom_components.jarolift.cipher_pool import CipherPool
+from custom_components.jarolift.core import build_packets_batch
+from custom_components.jarolift.core.keeloq import decrypt, encrypt
+
+MSB = 0x12345678
+LSB = 0x87654321
+ITEMS = [(x * 0x01010101 & 0xFFFFFFFF, MSB, LSB) for x in range(40)]
+
+
+def test_worker_results_match_in_process():
+    """Test results from worker processes are identical and in order."""
+    pool = CipherPool(2, chunk_size=8)
+    try:
+        encrypted = pool.encrypt_many(ITEMS)
+        assert encrypted == [encrypt(*item) for item in ITEMS]
+        assert pool.decrypt_many([(x, MSB, LSB) for x in encrypted]) == [
+            item[0] for item in ITEMS
+        ]
+
+        frames = [(0x0001, 0x106AA01, 0x2, counter) for counter in range(20)]
+        assert pool.map_chunks(
+            build_packets_batch, frames, MSB, LSB, False
+        ) == build_packets_batch(frames, MSB, LSB, False)
+        assert pool.available
+    finally:
+        pool.shutdown(wait=True)
+
+
+def test_disabled_and_small_batches_stay_in_process(monkeypatch):
+    """Test no worker process is started when it cannot pay off."""
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("process pool started")
+
+    monkeypatch.setattr(cipher_pool_module, "ProcessPoolExecutor", _fail)
+
+    assert CipherPool(0, chunk_size=8).encrypt_many(ITEMS) == [
+        encrypt(*item) for item in ITEMS
+    ]
+    assert CipherPool(2).decrypt_many(ITEMS) == [decrypt(*item) for item in ITEMS]
+
+
+def test_falls_back_when_pool_cannot_start(monkeypatch):
+    """Test the work is done in-process and the pool stays disabled."""
+    started = []
+
+    def _fail(*args, **kwargs):
+        started.append(True)
+        raise OSError("no processes")
+
+    monkeypatch.setattr(cipher_pool_module, "ProcessPoolExecutor", _fail)
+    pool = CipherPool(2, chunk_size=8)
+
+    assert pool.encrypt_many(ITEMS) == [encrypt(*item) for item in ITEMS]
+    assert not pool.available
+    assert pool.encrypt_many(ITEMS) == [encrypt(*item) for item in ITEMS]
+    assert started == [True]
@@ -5,6 +5,8 @@ from homeassistant.const import CONF_NAME
 
 from custom_components.jarolift import DOMAIN
 from custom_components.jarolift.config_flow import (
+    CONF_COUNTER_BLOCK_SIZE,
+    CONF_COUNTER_FLUSH_INTERVAL,
     CONF_COVERS,
     CONF_DELAY,
     CONF_GROUP,
@@ -16,6 +18,7 @@ from custom_components.jarolift.config_flow import (
     CONF_REVERSE,
     CONF_SERIAL,
 )
+from custom_components.jarolift.core.keeloq import derive_device_key
 
 
 async def test_user_form_valid_input(hass, mock_remote_entity):
@@ -392,6 +395,7 @@ async def test_options_flow_edit_hub_valid(hass, mock_remote_entity):
     # Edit hub settings with valid remote entity
     new_remote = "remote.new_remote"
     hass.states.async_set(new_remote, "idle")
+    derive_device_key(0x106AA01, 0x12345678, 0x87654321)
 
     result = await hass.config_entries.options.async_configure(
         result["flow_id"],
@@ -400,11 +404,17 @@ async def test_options_flow_edit_hub_valid(hass, mock_remote_entity):
             CONF_MSB: "0xAABBCCDD",
             CONF_LSB: "0x11223344",
             CONF_DELAY: 5,
+            CONF_COUNTER_BLOCK_SIZE: 64,
+            CONF_COUNTER_FLUSH_INTERVAL: 30,
         },
     )
 
     assert result["type"] == data_entry_flow.FlowResultType.FORM
     assert result["step_id"] == "manage_covers"
+    assert entry.data[CONF_COUNTER_BLOCK_SIZE] == 64
+    assert entry.data[CONF_COUNTER_FLUSH_INTERVAL] == 30
+    # Changing the manufacturer key invalidates cached device keys
+    assert derive_device_key.cache_info().currsize == 0
 
 
 async def test_options_flow_edit_hub_invalid_remote(hass, mock_remote_entity):
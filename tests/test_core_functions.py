@@ -10,38 +10,16 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from custom_components.jarolift import (
+from custom_components.jarolift import _parse_hex_config_value
+from custom_components.jarolift.core import (
     BuildPacket,
     ReadCounter,
     WriteCounter,
-    _parse_hex_config_value,
-    bitRead,
-    bitSet,
     decrypt,
     encrypt,
 )
 
 
-class TestBitOperations:
-    """Test bit operations."""
-
-    def test_bit_read(self):
-        """Test bitRead function."""
-        value = 0b10101010
-        assert bitRead(value, 0) == 0
-        assert bitRead(value, 1) == 1
-        assert bitRead(value, 2) == 0
-        assert bitRead(value, 3) == 1
-        assert bitRead(value, 7) == 1
-
-    def test_bit_set(self):
-        """Test bitSet function."""
-        value = 0b00000000
-        assert bitSet(value, 0) == 0b00000001
-        assert bitSet(value, 1) == 0b00000010
-        assert bitSet(value, 7) == 0b10000000
-
-
 class TestKeeLoqEncryption:
     """Test KeeLoq encryption functions."""
 
@@ -0,0 +1,42 @@
+"""Tests for loading the core package without Home Assistant."""
+
+import json
+import subprocess
+import sys
+
+from custom_components.jarolift.core import BuildPacket
+from custom_components.jarolift.core.standalone import STANDALONE_PATH
+
+MSB = 0x12345678
+LSB = 0x87654321
+
+PROGRAM = f"""
+import json, runpy, sys
+runpy.run_path({STANDALONE_PATH!r})
+from custom_components.jarolift.core import BuildPacket
+print(json.dumps({{
+    "modules": sorted(sys.modules),
+    "packet": BuildPacket(0x0001, 0x106AA01, 0x2, 10, {MSB}, {LSB}, False),
+}}))
+"""
+
+
+def test_core_loads_without_home_assistant(tmp_path):
+    """Test the core loads standalone and builds the same packets."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROGRAM],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=tmp_path,
+    )
+    loaded = json.loads(result.stdout)
+
+    assert not [
+        name
+        for name in loaded["modules"]
+        if name.partition(".")[0] in ("homeassistant", "voluptuous")
+    ]
+    assert "custom_components.jarolift" not in loaded["modules"]
+    assert "custom_components.jarolift.core.frames" in loaded["modules"]
+    assert loaded["packet"] == BuildPacket(0x0001, 0x106AA01, 0x2, 10, MSB, LSB, False)
@@ -0,0 +1,466 @@
+"""Tests for the consolidated counter store."""
+
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from custom_components.jarolift.core import WriteCounter
+from custom_components.jarolift.core.counter import (
+    COUNTER_BACKUP_DISTANCE,
+    COUNTER_FSYNC_FILE,
+    COUNTER_FSYNC_FULL,
+    COUNTER_FSYNC_NONE,
+    COUNTER_POLICIES,
+    COUNTER_SAFETY_JUMP,
+    COUNTER_STORE_FILE,
+    CounterStore,
+    CounterUsage,
+    ReadCounter,
+    repeat_counter_offsets,
+    resolve_counter_policy,
+)
+
+
+def _store(tmp_path, legacy=False, block_size=0):
+    """Return a loaded store in tmp_path (writing every counter by default)."""
+    store = CounterStore(
+        str(tmp_path / COUNTER_STORE_FILE),
+        legacy_prefix=str(tmp_path / "counter_") if legacy else None,
+        block_size=block_size,
+    )
+    store.load()
+    return store
+
+
+def test_empty_store(tmp_path):
+    """Test a missing store file starts all counters at zero."""
+    store = _store(tmp_path)
+
+    assert store.get(0x106AA01) == 0
+    assert not store.dirty
+
+
+def test_reserve_advances_counter(tmp_path):
+    """Test reserve hands out consecutive blocks."""
+    store = _store(tmp_path)
+
+    assert store.reserve(0x106AA01, 3) == 0
+    assert store.reserve(0x106AA01, 2) == 3
+    assert store.reserve(0x106AA02, 1) == 0
+    assert store.get(0x106AA01) == 5
+    assert store.dirty
+
+
+def test_write_and_reload(tmp_path):
+    """Test counters survive a write and reload."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 42)
+    store.set(0x2, 7)
+    store.write(store.serialize())
+
+    assert not store.dirty
+    reloaded = _store(tmp_path)
+    assert reloaded.get(0x106AA01) == 42
+    assert reloaded.get(0x2) == 7
+
+    with open(tmp_path / COUNTER_STORE_FILE, encoding="utf-8") as fo:
+        data = json.load(fo)
+    assert data["counters"] == {"0x2": 7, "0x106aa01": 42}
+
+
+def test_write_leaves_no_temp_file(tmp_path):
+    """Test the atomic write cleans up its temporary file."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 1)
+    store.write(store.serialize())
+    store.set(0x106AA01, 2)
+    store.write(store.serialize())
+
+    assert sorted(os.listdir(tmp_path)) == [
+        COUNTER_STORE_FILE,
+        f"{COUNTER_STORE_FILE}.bak",
+    ]
+
+
+def test_failed_write_keeps_old_file(tmp_path, monkeypatch):
+    """Test a failing write leaves the previous content in place."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 1)
+    store.write(store.serialize())
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    store.set(0x106AA01, 2)
+    with pytest.raises(OSError):
+        store.write(store.serialize())
+
+    assert os.listdir(tmp_path) == [COUNTER_STORE_FILE]
+    assert _store(tmp_path).get(0x106AA01) == 1
+
+
+def test_legacy_files_are_migrated(tmp_path):
+    """Test legacy counter files are imported and removed after the write."""
+    counter_file = str(tmp_path / "counter_")
+    WriteCounter(counter_file, 0x106AA01, 17)
+    WriteCounter(counter_file, 0x106AA02, 5)
+
+    store = _store(tmp_path, legacy=True)
+
+    assert store.get(0x106AA01) == 17
+    assert store.get(0x106AA02) == 5
+    assert store.dirty
+    # Legacy files stay until their counters are safely in the store
+    assert os.path.isfile(f"{counter_file}0x106aa01.txt")
+
+    store.write(store.serialize())
+
+    assert sorted(os.listdir(tmp_path)) == [COUNTER_STORE_FILE]
+    assert _store(tmp_path, legacy=True).get(0x106AA01) == 17
+
+
+def test_legacy_migration_never_goes_backwards(tmp_path):
+    """Test the higher of store and legacy file counter wins."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 30)
+    store.set(0x106AA02, 3)
+    store.write(store.serialize())
+    counter_file = str(tmp_path / "counter_")
+    WriteCounter(counter_file, 0x106AA01, 10)
+    WriteCounter(counter_file, 0x106AA02, 20)
+
+    store = _store(tmp_path, legacy=True)
+
+    assert store.get(0x106AA01) == 30
+    assert store.get(0x106AA02) == 20
+
+
+@pytest.mark.parametrize("content", ["", "garbage", "12\x00"])
+def test_damaged_legacy_file_is_moved_aside(tmp_path, caplog, content):
+    """Test a damaged legacy file of an unknown serial is reported once."""
+    filename = tmp_path / "counter_0x106aa01.txt"
+    filename.write_text(content, encoding="utf-8")
+
+    store = _store(tmp_path, legacy=True)
+
+    assert store.get(0x106AA01) == 0
+    assert not store.dirty
+    assert not filename.exists()
+    assert (tmp_path / "counter_0x106aa01.txt.corrupt").is_file()
+    assert "learned again" in caplog.text
+    assert [r.levelname for r in caplog.records] == ["ERROR"]
+
+    caplog.clear()
+    _store(tmp_path, legacy=True)
+    assert not caplog.records
+
+
+def test_damaged_legacy_file_advances_known_counter(tmp_path):
+    """Test a damaged legacy file moves a stored counter by the safety jump."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 30)
+    store.write(store.serialize())
+    (tmp_path / "counter_0x106aa01.txt").write_text("", encoding="utf-8")
+
+    store = _store(tmp_path, legacy=True)
+
+    assert store.get(0x106AA01) == 30 + COUNTER_SAFETY_JUMP
+    assert store.dirty
+
+
+def test_unreadable_legacy_file_does_not_abort_load(tmp_path, monkeypatch):
+    """Test an OSError reading a legacy file skips it without failing."""
+    counter_file = str(tmp_path / "counter_")
+    WriteCounter(counter_file, 0x106AA01, 17)
+    WriteCounter(counter_file, 0x106AA02, 5)
+    real_open = open
+
+    def denied_open(file, *args, **kwargs):
+        if str(file).endswith("0x106aa01.txt"):
+            raise PermissionError(13, "Permission denied", file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", denied_open)
+    store = _store(tmp_path, legacy=True)
+
+    assert store.get(0x106AA01) == 0
+    assert store.get(0x106AA02) == 5
+    assert os.path.isfile(f"{counter_file}0x106aa01.txt")
+
+
+def test_read_counter_rejects_damaged_file(tmp_path):
+    """Test ReadCounter raises instead of restarting a damaged counter at 0."""
+    counter_file = str(tmp_path / "counter_")
+    (tmp_path / "counter_0x106aa01.txt").write_text("", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="empty or damaged"):
+        ReadCounter(counter_file, 0x106AA01)
+
+
+def test_write_behind_reserves_blocks(tmp_path):
+    """Test write-behind mode only writes when a block is exhausted."""
+    store = _store(tmp_path)
+    store.block_size = 64
+
+    assert store.reserve(0x106AA01, 2) == 0
+    assert store.dirty
+    store.write(store.serialize())
+    # The file holds the reservation limit, not the counter in use
+    assert _store(tmp_path).get(0x106AA01) == 66
+
+    for expected in range(2, 66, 2):
+        assert store.reserve(0x106AA01, 2) == expected
+        assert not store.dirty
+
+    assert store.reserve(0x106AA01, 2) == 66
+    assert store.dirty
+    store.write(store.serialize())
+    assert _store(tmp_path).get(0x106AA01) == 132
+
+
+def test_write_behind_never_reuses_after_crash(tmp_path):
+    """Test a restart without a clean shutdown continues past the block."""
+    store = _store(tmp_path)
+    store.block_size = 64
+    store.reserve(0x106AA01, 1)
+    store.write(store.serialize())
+    used = [store.reserve(0x106AA01, 1) for _ in range(10)]
+
+    restarted = _store(tmp_path)
+
+    assert restarted.reserve(0x106AA01, 1) > max(used)
+
+
+def test_extend_reservations(tmp_path):
+    """Test the periodic flush renews blocks that are more than half used."""
+    store = _store(tmp_path)
+    store.block_size = 64
+    store.reserve(0x106AA01, 1)
+    store.write(store.serialize())
+
+    store.extend_reservations()
+    assert not store.dirty
+
+    for _ in range(40):
+        store.reserve(0x106AA01, 1)
+    store.extend_reservations()
+    assert store.dirty
+    store.write(store.serialize())
+    assert _store(tmp_path).get(0x106AA01) == 41 + 64
+
+
+def test_renewal_is_due_when_block_half_used(tmp_path):
+    """Test a half used block asks for a renewal without blocking the send."""
+    store = _store(tmp_path, block_size=16)
+    store.reserve(0x106AA01, 1)
+    store.write(store.serialize())
+
+    for _ in range(8):
+        store.reserve(0x106AA01, 1)
+        assert not store.dirty
+    assert not store.renewal_due
+    store.reserve(0x106AA01, 1)
+    assert store.renewal_due
+    assert not store.dirty
+
+    store.extend_reservations()
+    assert not store.renewal_due
+    assert store.dirty
+    store.write(store.serialize())
+    assert _store(tmp_path).get(0x106AA01) == 10 + 16
+
+
+def test_default_store_is_write_behind(tmp_path):
+    """Test the default store does not write before every command."""
+    store = CounterStore(str(tmp_path / COUNTER_STORE_FILE))
+    store.load()
+    store.reserve(0x106AA01, 1)
+    store.write(store.serialize())
+
+    store.reserve(0x106AA01, 1)
+
+    assert not store.dirty
+
+
+def test_backup_is_refreshed_by_distance(tmp_path):
+    """Test the backup is only replaced once the counters moved far from it."""
+    store = _store(tmp_path)
+    backup = tmp_path / f"{COUNTER_STORE_FILE}.bak"
+    store.set(0x106AA01, 1)
+    store.write(store.serialize())
+    store.set(0x106AA01, 2)
+    store.write(store.serialize())
+    assert json.loads(backup.read_text())["counters"] == {"0x106aa01": 1}
+
+    for counter in range(3, COUNTER_BACKUP_DISTANCE + 2):
+        store.set(0x106AA01, counter)
+        store.write(store.serialize())
+    assert json.loads(backup.read_text())["counters"] == {"0x106aa01": 1}
+
+    store.set(0x106AA01, COUNTER_BACKUP_DISTANCE + 2)
+    store.write(store.serialize())
+    assert json.loads(backup.read_text())["counters"] == {
+        "0x106aa01": COUNTER_BACKUP_DISTANCE + 1
+    }
+    # A reloaded store knows the backup it found
+    reloaded = _store(tmp_path)
+    reloaded.set(0x106AA01, COUNTER_BACKUP_DISTANCE + 3)
+    reloaded.write(reloaded.serialize())
+    assert json.loads(backup.read_text())["counters"] == {
+        "0x106aa01": COUNTER_BACKUP_DISTANCE + 1
+    }
+
+
+def test_release_reservations_stores_exact_counters(tmp_path):
+    """Test a clean shutdown writes the counters actually used."""
+    store = _store(tmp_path)
+    store.block_size = 64
+    store.reserve(0x106AA01, 5)
+    store.write(store.serialize())
+
+    store.release_reservations()
+
+    assert store.dirty
+    store.write(store.serialize())
+    assert _store(tmp_path).get(0x106AA01) == 5
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["", '{"version": 1, "coun', '{"version": 1, "counters": {"0x106aa01": -1}}'],
+)
+def test_damaged_file_restores_backup_with_jump(tmp_path, content):
+    """Test a damaged counter file falls back to the last good counters."""
+    store = _store(tmp_path)
+    store.set(0x106AA01, 10)
+    store.write(store.serialize())
+    store.set(0x106AA01, 12)
+    store.write(store.serialize())
+    (tmp_path / COUNTER_STORE_FILE).write_text(content, encoding="utf-8")
+
+    restored = _store(tmp_path)
+
+    # The backup holds 10; counters up to 12 may already have been sent
+    assert restored.get(0x106AA01) == 10 + COUNTER_SAFETY_JUMP
+    assert restored.dirty
+    assert (tmp_path / f"{COUNTER_STORE_FILE}.corrupt").is_file()
+
+
+def test_missing_file_restores_backup(tmp_path):
+    """Test a crash between the backup and the final rename is recovered."""
+    store = _store(tmp_path)
+    store.block_size = 64
+    store.set(0x106AA01, 10)
+    store.write(store.serialize())
+    store.write(store.serialize())
+    os.remove(tmp_path / COUNTER_STORE_FILE)
+
+    restored = CounterStore(str(tmp_path / COUNTER_STORE_FILE), block_size=64)
+    restored.load()
+
+    assert restored.get(0x106AA01) == 10 + COUNTER_SAFETY_JUMP + 64
+
+
+def test_damaged_file_without_backup(tmp_path):
+    """Test a damaged file without backup is set aside instead of crashing."""
+    (tmp_path / COUNTER_STORE_FILE).write_text("", encoding="utf-8")
+
+    store = _store(tmp_path)
+
+    assert store.get(0x106AA01) == 0
+    assert os.listdir(tmp_path) == [f"{COUNTER_STORE_FILE}.corrupt"]
+
+
+@pytest.mark.parametrize("fsync", [COUNTER_FSYNC_FULL, COUNTER_FSYNC_NONE])
+def test_fsync_policies(tmp_path, monkeypatch, fsync):
+    """Test the fsync policy controls how much is flushed to disk."""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(real_fsync(fd)))
+    store = CounterStore(str(tmp_path / COUNTER_STORE_FILE), fsync=fsync)
+    store.set(0x106AA01, 3)
+
+    store.write(store.serialize())
+
+    assert len(synced) == (2 if fsync == COUNTER_FSYNC_FULL else 0)
+    assert _store(tmp_path).get(0x106AA01) == 3
+
+
+@pytest.mark.parametrize(
+    ("fsync", "before", "after"),
+    [
+        (COUNTER_FSYNC_FILE, 0, 1),
+        (COUNTER_FSYNC_FULL, 2, 2),
+        (COUNTER_FSYNC_NONE, 0, 0),
+    ],
+)
+def test_deferred_sync(tmp_path, monkeypatch, fsync, before, after):
+    """Test a write before a send leaves the file policy's fsync to sync()."""
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(real_fsync(fd)))
+    store = CounterStore(str(tmp_path / COUNTER_STORE_FILE), fsync=fsync)
+    store.set(0x106AA01, 3)
+
+    store.write(store.serialize(), defer_sync=True)
+    assert len(synced) == before
+    assert store.sync_pending == (after > before)
+
+    store.sync()
+    assert len(synced) == after
+    assert not store.sync_pending
+    assert _store(tmp_path).get(0x106AA01) == 3
+
+
+@pytest.mark.parametrize(
+    ("policy", "offsets"),
+    [
+        ("increment", [0, 1, 2, 3, 4]),
+        ("same", [0, 0, 0, 0, 0]),
+        # Legacy policy, sent with same
+        ("adaptive", [0, 0, 0, 0, 0]),
+    ],
+)
+def test_repeat_counter_offsets(policy, offsets):
+    """Test the counter offsets of the repeats of a command per policy."""
+    assert repeat_counter_offsets(policy, 5) == offsets
+    assert repeat_counter_offsets(policy, 1) == [0]
+
+
+def test_adaptive_policy_is_not_offered():
+    """Test the adaptive policy of earlier versions maps to same."""
+    assert "adaptive" not in COUNTER_POLICIES
+    assert resolve_counter_policy("adaptive") == "same"
+    assert resolve_counter_policy("increment") == "increment"
+
+
+def test_counter_usage_per_day():
+    """Test usage is tallied per cover and day and old days are dropped."""
+    usage = CounterUsage(days=2)
+    today = date(2024, 5, 3)
+    usage.record(0x106AA01, 0x0001, 3, today - timedelta(days=2))
+    usage.record(0x106AA01, 0x0001, 2, today - timedelta(days=1))
+    usage.record(0x106AA01, 0x0001, 5, today)
+    usage.record(0x106AA01, 0x0001, 1, today)
+
+    assert usage.get(0x106AA01, 0x0001, today) == 6
+    assert usage.get(0x106AA02, 0x0001, today) == 0
+    assert usage.history(0x106AA01, 0x0001) == {"2024-05-02": 2, "2024-05-03": 6}
+
+
+def test_counter_usage_per_cover():
+    """Test covers sharing a serial only count the frames addressed to them."""
+    usage = CounterUsage()
+    today = date(2024, 5, 3)
+    usage.record(0x106AA01, 0x0001, 4, today)
+    usage.record(0x106AA01, 0x0002, 1, today)
+    # One group frame for both covers
+    usage.record(0x106AA01, 0x0003, 2, today)
+
+    assert usage.get(0x106AA01, 0x0001, today) == 6
+    assert usage.get(0x106AA01, 0x0002, today) == 3
+    assert usage.get(0x106AA01, 0x0004, today) == 0
+    assert usage.history(0x106AA01, 0x0002) == {"2024-05-03": 3}
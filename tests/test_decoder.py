@@ -0,0 +1,86 @@
+"""Tests for the Jarolift RF frame decoder."""
+
+import base64
+import random
+
+import pytest
+
+from custom_components.jarolift.core import BuildPacket, BuildPacketBytes
+from custom_components.jarolift.core.decoder import (
+    JaroliftFrame,
+    decode_packet,
+    decode_packets,
+    parse_pulses,
+)
+
+MSB = 0x12345678
+LSB = 0x87654321
+
+
+def _encode_pulses(pulses, repeat=0):
+    """Return a raw Broadlink RF packet with the given pulse lengths."""
+    payload = b"".join(
+        bytes([pulse]) if pulse < 0x100 else b"\x00" + pulse.to_bytes(2, "big")
+        for pulse in pulses
+    )
+    return bytes([0xB2, repeat]) + len(payload).to_bytes(2, "little") + payload
+
+
+@pytest.mark.parametrize("hold", [False, True])
+def test_decode_reverses_build_packet(hold):
+    """Test decoding returns the fields of built packets."""
+    rng = random.Random(18)
+    for _ in range(50):
+        group = rng.getrandbits(16)
+        serial = rng.getrandbits(28)
+        button = rng.choice([0x2, 0x4, 0x8, 0xA])
+        counter = rng.getrandbits(16)
+        packet = BuildPacket(group, serial, button, counter, MSB, LSB, hold)
+
+        assert decode_packet(packet, MSB, LSB) == JaroliftFrame(
+            serial=serial, group=group, button=button, counter=counter, hold=hold
+        )
+
+
+def test_decode_jittered_capture_with_repeats():
+    """Test a learned code with timing jitter and several frames decodes."""
+    rng = random.Random(7)
+    pulses = parse_pulses(BuildPacketBytes(0x0003, 0x106AA01, 0x8, 41, MSB, LSB, False))
+    jittered = [pulse + rng.choice([-1, 0, 1]) for pulse in pulses]
+    # Leading noise, three repeats and a capture cut off after the last bit
+    capture = _encode_pulses([5, 0x300, 7] + jittered * 3)
+    capture = capture[:-3]
+
+    frame = decode_packet("b64:" + base64.b64encode(capture).decode(), MSB, LSB)
+    assert (frame.serial, frame.group, frame.button, frame.counter) == (
+        0x106AA01,
+        0x0003,
+        0x8,
+        41,
+    )
+
+
+def test_decode_packets_batch():
+    """Test batch decoding keeps order and marks invalid packets."""
+    packets = [
+        BuildPacket(0x0001, 0x106AA01, 0x2, 10, MSB, LSB, False),
+        "b64:AAAA",
+        BuildPacket(0x0002, 0x106AA02, 0x4, 11, MSB, LSB, False),
+        BuildPacket(0x0001, 0x106AA01, 0x8, 12, MSB, LSB, False),
+        "not base64!",
+    ]
+
+    frames = decode_packets(packets, MSB, LSB)
+
+    assert [frame and frame.counter for frame in frames] == [10, None, 11, 12, None]
+
+
+def test_wrong_manufacturer_key_is_rejected():
+    """Test a frame of another manufacturer key does not decode."""
+    packet = BuildPacket(0x0001, 0x106AA01, 0x2, 10, MSB, LSB, False)
+
+    assert decode_packets([packet], MSB ^ 1, LSB) == [None]
+    with pytest.raises(ValueError, match="does not decrypt"):
+        decode_packet(packet, MSB ^ 1, LSB)
+    with pytest.raises(ValueError, match="no Jarolift frame"):
+        decode_packet(_encode_pulses([0x0C, 0x19] * 10), MSB, LSB)
@@ -1,44 +1,24 @@
 """Tests for Jarolift __init__.py."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.jarolift import (
     DOMAIN,
-    BuildPacket,
-    ReadCounter,
-    WriteCounter,
     _parse_hex_config_value,
     async_reload_entry,
     async_setup_entry,
     async_unload_entry,
-    bitRead,
-    bitSet,
+    setup,
+)
+from custom_components.jarolift.core import (
+    BuildPacket,
+    ReadCounter,
+    WriteCounter,
     decrypt,
     encrypt,
-    setup,
 )
 
 
-def test_bit_read():
-    """Test bitRead function."""
-    # Test reading different bits
-    value = 0b10101010
-    assert bitRead(value, 0) == 0
-    assert bitRead(value, 1) == 1
-    assert bitRead(value, 2) == 0
-    assert bitRead(value, 3) == 1
-    assert bitRead(value, 7) == 1
-
-
-def test_bit_set():
-    """Test bitSet function."""
-    # Test setting different bits
-    value = 0b00000000
-    assert bitSet(value, 0) == 0b00000001
-    assert bitSet(value, 1) == 0b00000010
-    assert bitSet(value, 7) == 0b10000000
-
-
 def test_encrypt():
     """Test encrypt function."""
     # Test basic encryption (result will depend on implementation)
@@ -198,7 +178,12 @@ async def test_async_unload_entry(hass, mock_remote_entity):
     entry.entry_id = "test_entry"
 
     # Setup entry first
-    hass.data[DOMAIN] = {entry.entry_id: {}}
+    transmitter = MagicMock()
+    transmitter.async_shutdown = AsyncMock()
+    hass.data[DOMAIN] = {
+        entry.entry_id: {},
+        "transmitters": {mock_remote_entity: transmitter},
+    }
 
     with patch(
         "custom_components.jarolift.hass.config_entries.async_unload_platforms",
@@ -208,6 +193,8 @@ async def test_async_unload_entry(hass, mock_remote_entity):
 
     assert result is True
     assert entry.entry_id not in hass.data[DOMAIN]
+    assert "transmitters" not in hass.data[DOMAIN]
+    transmitter.async_shutdown.assert_awaited_once()
 
 
 async def test_async_reload_entry(hass, mock_remote_entity):
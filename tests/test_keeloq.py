@@ -0,0 +1,171 @@
+"""Tests for the table-driven KeeLoq engine."""
+
+import random
+
+import pytest
+
+from custom_components.jarolift.core import keeloq
+from tests.reference import decrypt as reference_decrypt
+from tests.reference import encrypt as reference_encrypt
+
+# (plaintext, keyHigh, keyLow, encrypted, decrypted) from the bit-at-a-time code
+KNOWN_VECTORS = [
+    (0x12345678, 0xABCDEF01, 0x23456789, 0x9D51FF84, 0x7CC862BE),
+    (0x00000000, 0x00000000, 0x00000000, 0x00000000, 0x00000000),
+    (0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF),
+    (0x2106AA01, 0x12345678, 0x87654321, 0x4EC4ACDE, 0x8143A52B),
+]
+
+
+@pytest.mark.parametrize(("x", "key_high", "key_low", "enc", "dec"), KNOWN_VECTORS)
+def test_known_vectors(x, key_high, key_low, enc, dec):
+    """Test the engine against known answers."""
+    assert keeloq.encrypt(x, key_high, key_low) == enc
+    assert keeloq.decrypt(x, key_high, key_low) == dec
+
+
+def test_matches_reference_implementation():
+    """Test the engine is bit-identical to the bit-at-a-time implementation."""
+    rng = random.Random(528)
+    for _ in range(200):
+        x = rng.getrandbits(32)
+        key_high = rng.getrandbits(32)
+        key_low = rng.getrandbits(32)
+
+        assert keeloq.encrypt(x, key_high, key_low) == reference_encrypt(
+            x, key_high, key_low
+        )
+        assert keeloq.decrypt(x, key_high, key_low) == reference_decrypt(
+            x, key_high, key_low
+        )
+
+
+def test_encrypt_decrypt_roundtrip():
+    """Test that decrypt inverts encrypt under the same key."""
+    rng = random.Random(63)
+    for _ in range(50):
+        x = rng.getrandbits(32)
+        key_high = rng.getrandbits(32)
+        key_low = rng.getrandbits(32)
+
+        encrypted = keeloq.encrypt(x, key_high, key_low)
+        assert keeloq.decrypt(encrypted, key_high, key_low) == x
+
+
+@pytest.mark.parametrize("lanes", [1, 3, 64, 200])
+def test_bitsliced_matches_engine(lanes):
+    """Test the bit-sliced engine with a different key per item."""
+    rng = random.Random(lanes)
+    items = [
+        (rng.getrandbits(32), rng.getrandbits(32), rng.getrandbits(32))
+        for _ in range(lanes)
+    ]
+
+    assert keeloq.encrypt_bitsliced(items) == [keeloq.encrypt(*item) for item in items]
+    assert keeloq.decrypt_bitsliced(items) == [keeloq.decrypt(*item) for item in items]
+
+
+def test_bitsliced_known_vectors():
+    """Test the bit-sliced engine against known answers, including edge values."""
+    items = [(x, key_high, key_low) for x, key_high, key_low, _, _ in KNOWN_VECTORS]
+
+    assert keeloq.encrypt_many(items) == [enc for *_, enc, _ in KNOWN_VECTORS]
+    assert keeloq.decrypt_many(items) == [dec for *_, dec in KNOWN_VECTORS]
+    assert keeloq.encrypt_bitsliced([]) == []
+
+
+def test_key_schedule_is_cached():
+    """Test that round tables are built once per key."""
+    keeloq.encrypt_schedule.cache_clear()
+
+    keeloq.encrypt(0x1, 0xABCDEF01, 0x23456789)
+    keeloq.encrypt(0x2, 0xABCDEF01, 0x23456789)
+
+    info = keeloq.encrypt_schedule.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert len(keeloq.encrypt_schedule(0xABCDEF01, 0x23456789)) == (
+        keeloq.KEELOQ_ROUNDS
+    )
+
+
+def test_package_uses_engine():
+    """Test the core's encrypt/decrypt are served by the engine."""
+    from custom_components.jarolift import core
+
+    assert core.encrypt is keeloq.encrypt
+    assert core.decrypt is keeloq.decrypt
+
+
+def test_derive_device_key_matches_direct_derivation():
+    """Test cached device keys match decrypting the serial directly."""
+    serial, msb, lsb = 0x106AA01, 0x12345678, 0x87654321
+
+    key_msb, key_lsb = keeloq.derive_device_key(serial, msb, lsb)
+
+    assert key_lsb == reference_decrypt(serial | 0x20000000, msb, lsb)
+    assert key_msb == reference_decrypt(serial | 0x60000000, msb, lsb)
+
+
+def test_derive_device_key_cache_counters():
+    """Test repeated packets for a serial hit the device key cache."""
+    from custom_components.jarolift.core import BuildPacket
+
+    keeloq.derive_device_key.cache_clear()
+
+    for counter in range(3):
+        BuildPacket(0x0001, 0x106AA01, 0x2, counter, 0x12345678, 0x87654321, False)
+    BuildPacket(0x0001, 0x106AA02, 0x2, 0, 0x12345678, 0x87654321, False)
+
+    info = keeloq.derive_device_key.cache_info()
+    assert info.misses == 2
+    assert info.hits == 2
+    assert info.currsize == 2
+
+    keeloq.derive_device_key.cache_clear()
+    assert keeloq.derive_device_key.cache_info().currsize == 0
+
+
+def test_derive_device_keys_batches_missing_keys(monkeypatch):
+    """Test keys missing from the cache are derived in one batch decrypt."""
+    msb, lsb = 0x12345678, 0x87654321
+    serials = [0x106AA01 + i for i in range(8)]
+    keeloq.derive_device_key.cache_clear()
+    keeloq.derive_device_key(serials[0], msb, lsb)
+    batches = []
+    decrypt_many = keeloq.decrypt_many
+
+    def counting_decrypt_many(items):
+        batches.append(len(items))
+        return decrypt_many(items)
+
+    monkeypatch.setattr(keeloq, "decrypt_many", counting_decrypt_many)
+
+    keys = keeloq.derive_device_keys([*serials, serials[3]], msb, lsb)
+
+    assert batches == [14]
+    assert keys[-1] == keys[3]
+    for serial, (key_msb, key_lsb) in zip(serials, keys, strict=False):
+        assert key_lsb == reference_decrypt(serial | 0x20000000, msb, lsb)
+        assert key_msb == reference_decrypt(serial | 0x60000000, msb, lsb)
+    info = keeloq.derive_device_key.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 8, 8)
+
+    keeloq.derive_device_keys(serials, msb, lsb)
+    assert batches == [14]
+    keeloq.derive_device_key.cache_clear()
+
+
+def test_device_key_cache_is_bounded(monkeypatch):
+    """Test the least recently used device keys are evicted."""
+    monkeypatch.setattr(keeloq, "DEVICE_KEY_CACHE_SIZE", 4)
+    keeloq.derive_device_key.cache_clear()
+
+    keeloq.derive_device_keys([1, 2, 3, 4], 0x12345678, 0x87654321)
+    keeloq.derive_device_key(1, 0x12345678, 0x87654321)
+    keeloq.derive_device_key(5, 0x12345678, 0x87654321)
+
+    assert list(keeloq._device_keys) == [
+        (serial, 0x12345678, 0x87654321) for serial in (3, 4, 1, 5)
+    ]
+    keeloq.derive_device_key.cache_clear()
@@ -0,0 +1,112 @@
+"""Tests for the optional native KeeLoq kernel."""
+
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from custom_components.jarolift.core import (
+    BuildPacket,
+    build_packets_batch,
+    keeloq,
+    keeloq_native,
+)
+
+MSB = 0x12345678
+LSB = 0x87654321
+
+
+@pytest.fixture(scope="module")
+def kernel(tmp_path_factory):
+    """Compile native/keeloq.c and load it (skipped without a C compiler)."""
+    compiler = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+    if compiler is None or keeloq_native.NATIVE_LIBRARY.endswith(".dll"):
+        pytest.skip("no C compiler")
+    path = tmp_path_factory.mktemp("native") / keeloq_native.NATIVE_LIBRARY
+    subprocess.run(
+        [
+            compiler,
+            "-O2",
+            "-shared",
+            "-fPIC",
+            "-o",
+            str(path),
+            str(keeloq_native.NATIVE_DIR / "keeloq.c"),
+        ],
+        check=True,
+    )
+    kernel = keeloq_native.load_kernel(path)
+    assert kernel is not None
+    return kernel
+
+
+def test_kernel_matches_python_engine(kernel):
+    """Test the kernel is bit-identical to the Python engine."""
+    rng = random.Random(528)
+    for _ in range(20):
+        key_high = rng.getrandbits(32)
+        key_low = rng.getrandbits(32)
+        values = [rng.getrandbits(32) for _ in range(16)]
+
+        assert kernel.encrypt_array(values, key_high, key_low) == [
+            keeloq.encrypt(x, key_high, key_low) for x in values
+        ]
+        assert kernel.decrypt_array(values, key_high, key_low) == [
+            keeloq.decrypt(x, key_high, key_low) for x in values
+        ]
+
+
+def test_batch_uses_kernel(kernel, monkeypatch):
+    """Test batch packet building with the kernel matches BuildPacket."""
+    monkeypatch.setattr(keeloq_native, "_kernel", kernel)
+    frames = [
+        (0x0001, 0x106AA01 + serial, 0x2, c) for serial in range(3) for c in (7, 8)
+    ]
+
+    assert build_packets_batch(frames, MSB, LSB) == [
+        BuildPacket(*frame, MSB, LSB, False) for frame in frames
+    ]
+
+
+def test_items_use_kernel_per_key(kernel, monkeypatch):
+    """Test items under several keys are encrypted by the kernel."""
+    monkeypatch.setattr(keeloq_native, "_kernel", kernel)
+    rng = random.Random(24)
+    keys = [(rng.getrandbits(32), rng.getrandbits(32)) for _ in range(3)]
+    items = [(rng.getrandbits(32), *rng.choice(keys)) for _ in range(20)]
+
+    assert keeloq_native.encrypt_items(items) == [
+        keeloq.encrypt(*item) for item in items
+    ]
+
+
+def test_fallback_without_kernel(monkeypatch):
+    """Test the module falls back to the Python engine."""
+    monkeypatch.setattr(keeloq_native, "_kernel", None)
+    values = [0x0, 0x2106AA01, 0xFFFFFFFF]
+
+    assert not keeloq_native.native_available()
+    assert keeloq_native.encrypt_array(values, MSB, LSB) == [
+        keeloq.encrypt(x, MSB, LSB) for x in values
+    ]
+    assert keeloq_native.decrypt_array(values, MSB, LSB) == [
+        keeloq.decrypt(x, MSB, LSB) for x in values
+    ]
+
+
+def test_missing_or_invalid_library_is_ignored(tmp_path):
+    """Test a missing or non-library file does not load."""
+    assert keeloq_native.load_kernel(tmp_path / "missing.so") is None
+
+    invalid = tmp_path / keeloq_native.NATIVE_LIBRARY
+    invalid.write_text("not a library")
+    assert keeloq_native.load_kernel(invalid) is None
+
+
+def test_failed_self_test_is_ignored(kernel, monkeypatch):
+    """Test a kernel disagreeing with the Python engine is rejected."""
+    monkeypatch.setattr(keeloq_native, "SELF_TEST_VECTORS", [(0x1, 0x2, 0x3)])
+    monkeypatch.setattr(keeloq_native, "encrypt", lambda x, high, low: 0)
+
+    assert not kernel.self_test()
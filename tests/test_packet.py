@@ -0,0 +1,179 @@
+"""Tests for the Jarolift RF frame encoder."""
+
+import base64
+import random
+
+import pytest
+
+from custom_components.jarolift.core import (
+    BuildPacket,
+    BuildPacketBytes,
+    build_packets_batch,
+)
+from custom_components.jarolift.core.packet import (
+    FRAME_AIRTIME,
+    FRAME_GAP_PULSE,
+    FRAME_SIZE,
+    HOLD_FRAME_AIRTIME,
+    KEELOQ_BIT_ONE,
+    KEELOQ_BIT_ZERO,
+    PACKET_SIZE,
+    PULSE_UNIT,
+    encode_packet,
+    encode_packet_b64,
+    fold_repeats_b64,
+    frame_template,
+    pack_frames,
+    packet_airtime,
+    parse_pulses,
+)
+from tests.reference import BuildPacket as reference_build_packet
+
+
+def _reference_encode(data: int, hold: bool) -> bytes:
+    """Encode a data word the way the original string-based code did."""
+    datastring = bin(data)[2:].zfill(72)[::-1]
+    codedstring = ""
+    for i, bit in enumerate(datastring):
+        if i == len(datastring) - 1:
+            codedstring += "0c0005dc" if bit == "1" else "190005dc"
+        else:
+            codedstring += KEELOQ_BIT_ONE if bit == "1" else KEELOQ_BIT_ZERO
+    codedstring = "190c1a0001e4310c0d0c0d0c0d0c0d0c0d0c0d0c0d0c0d7a" + codedstring
+    prefix = "b214" if hold else "b200"
+    codedstring = prefix + hex(len(codedstring) // 2)[2:] + "00" + codedstring
+    return bytes.fromhex(codedstring)
+
+
+@pytest.mark.parametrize("hold", [False, True])
+def test_encode_packet_matches_string_encoder(hold):
+    """Test the table-driven encoder against the string-based encoder."""
+    rng = random.Random(72)
+    values = [0, (1 << 72) - 1, 1, 1 << 71] + [rng.getrandbits(72) for _ in range(50)]
+
+    for data in values:
+        assert encode_packet(data, hold) == _reference_encode(data, hold)
+
+
+@pytest.mark.parametrize("hold", [False, True])
+def test_frame_template_matches_encoder(hold):
+    """Test patching the hopping code gives the fully encoded packet."""
+    rng = random.Random(23)
+    for _ in range(20):
+        static = rng.getrandbits(40) << 32
+        template = frame_template(static, hold)
+        for _ in range(5):
+            code = rng.getrandbits(32)
+            assert template.packet(code) == encode_packet(static | code, hold)
+            assert template.packet_b64(code) == encode_packet_b64(static | code, hold)
+    assert frame_template(static, hold) is template
+
+
+def test_encode_packet_layout():
+    """Test the header carries prefix and little endian frame length."""
+    packet = encode_packet(0x123456789ABCDEF012, False)
+
+    assert len(packet) == PACKET_SIZE
+    assert packet[:2] == b"\xb2\x00"
+    assert int.from_bytes(packet[2:4], "little") == FRAME_SIZE
+    assert encode_packet(0, True)[:2] == b"\xb2\x14"
+
+
+def test_encode_packet_b64():
+    """Test the base64 variant wraps the raw bytes."""
+    data = 0xFEDCBA9876543210AB
+    encoded = encode_packet_b64(data, False)
+
+    assert encoded.startswith("b64:")
+    assert base64.b64decode(encoded[4:]) == encode_packet(data, False)
+
+
+@pytest.mark.parametrize("hold", [False, True])
+def test_build_packet_unchanged(hold):
+    """Test BuildPacket output is identical to the original implementation."""
+    for button in (0x2, 0x4, 0x8, 0xA):
+        for counter in (0, 1, 0x1234):
+            args = (0x0102, 0x106AA01, button, counter, 0x12345678, 0x87654321)
+            assert BuildPacket(*args, hold) == reference_build_packet(*args, hold)
+
+
+def test_build_packet_bytes():
+    """Test the raw bytes API matches the decoded base64 packet."""
+    args = (0x0001, 0x106AA01, 0x2, 7, 0x12345678, 0x87654321, False)
+
+    raw = BuildPacketBytes(*args)
+
+    assert isinstance(raw, bytes)
+    assert base64.b64decode(BuildPacket(*args)[4:]) == raw
+
+
+def test_build_packets_batch():
+    """Test a batch yields the same packets as single BuildPacket calls."""
+    frames = [(0x0001, 0x106AA01, 0x2, 7), (0x0002, 0x106AA02, 0x8, 0)]
+    packets = build_packets_batch(frames, 0x12345678, 0x87654321, True)
+
+    assert packets == [
+        BuildPacket(group, serial, button, counter, 0x12345678, 0x87654321, True)
+        for group, serial, button, counter in frames
+    ]
+
+
+def test_packet_airtime():
+    """Test the airtime follows the pulses and the repeat count."""
+    packet = encode_packet(0x123456789ABCDEF012, False)
+
+    # 22 preamble pulses and a pulse pair per data bit
+    assert len(parse_pulses(packet)) == 22 + 2 * 72
+    # A frame is on the air for about 166 ms, held frames 21 times as long
+    assert packet_airtime(packet) == pytest.approx(FRAME_AIRTIME, rel=0.01)
+    assert FRAME_AIRTIME == pytest.approx(0.166, abs=0.005)
+    assert HOLD_FRAME_AIRTIME == pytest.approx(21 * FRAME_AIRTIME)
+
+
+def test_fold_repeats_b64():
+    """Test runs of identical packets become one packet with a repeat count."""
+    first = encode_packet_b64(0x1234, False)
+    second = encode_packet_b64(0x5678, False)
+
+    folded = fold_repeats_b64([first] * 3 + [second] + [first] * 300)
+
+    raw = [base64.b64decode(packet[4:]) for packet in folded]
+    assert [packet[1] for packet in raw] == [2, 0, 255, 43]
+    assert [packet[:1] + packet[2:] for packet in raw] == [
+        base64.b64decode(packet[4:])[:1] + base64.b64decode(packet[4:])[2:]
+        for packet in (first, second, first, first)
+    ]
+    # Held packets already repeat 21 times, so 12 of them fit in one packet
+    held = encode_packet_b64(0x1234, True)
+    assert [
+        base64.b64decode(packet[4:])[1] for packet in fold_repeats_b64([held] * 13)
+    ] == [251, 20]
+
+
+def test_pack_frames():
+    """Test frames are concatenated with the gap and split at the size limit."""
+    packets = [encode_packet(data, False) for data in range(8)]
+
+    packed = pack_frames(packets, gap=0.1, max_size=3 * PACKET_SIZE)
+
+    assert [len(packet) for packet in packed] == [4 + 3 * FRAME_SIZE] * 2 + [
+        4 + 2 * FRAME_SIZE
+    ]
+    gap = round(0.1 / PULSE_UNIT)
+    expected = []
+    for packet in packets:
+        pulses = parse_pulses(packet)
+        assert pulses[-1] == FRAME_GAP_PULSE
+        expected += pulses[:-1] + [gap]
+    assert sum((parse_pulses(packet) for packet in packed), []) == expected
+    assert all(packet[:2] == b"\xb2\x00" for packet in packed)
+
+
+def test_pack_frames_keeps_held_packets_apart():
+    """Test packets with another repeat count start a new packet."""
+    packets = [encode_packet(1, False), encode_packet(2, True), encode_packet(3, True)]
+
+    packed = pack_frames(packets)
+
+    assert [packet[1] for packet in packed] == [0x00, 0x14]
+    assert [len(packet) for packet in packed] == [PACKET_SIZE, 4 + 2 * FRAME_SIZE]
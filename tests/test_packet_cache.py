@@ -0,0 +1,63 @@
+"""Tests for the cache of precomputed packets."""
+
+from custom_components.jarolift.core import BuildPacket
+from custom_components.jarolift.packet_cache import PacketCache
+
+KEY = (0x0001, 0x106AA01, 0x2, 0x12345678, 0x87654321, False)
+
+
+def _filled_cache(first=0, **kwargs):
+    """Return a cache holding the window of KEY starting at first."""
+    cache = PacketCache(BuildPacket, **kwargs)
+    cache.add(KEY, first, cache.build_window(KEY, cache.missing(KEY, first)))
+    return cache
+
+
+def test_window_matches_build_packet():
+    """Test cached packets are identical to packets built at send time."""
+    cache = _filled_cache(10, depth=4)
+
+    for counter in range(10, 14):
+        assert cache.pop(KEY, counter) == BuildPacket(
+            0x0001, 0x106AA01, 0x2, counter, 0x12345678, 0x87654321, False
+        )
+    assert cache.hits == 4
+
+
+def test_pop_removes_packet():
+    """Test a packet is handed out only once."""
+    cache = _filled_cache(depth=2)
+
+    assert cache.pop(KEY, 0) is not None
+    assert cache.pop(KEY, 0) is None
+    assert cache.pop(KEY, 5) is None
+    assert cache.misses == 2
+
+
+def test_missing_only_lists_uncached_counters():
+    """Test a refill only builds counters that are not cached yet."""
+    cache = _filled_cache(depth=4)
+
+    assert cache.missing(KEY, 0) == []
+    assert cache.missing(KEY, 2) == [4, 5]
+
+
+def test_add_drops_used_counters():
+    """Test counters below the next counter of the serial are discarded."""
+    cache = _filled_cache(depth=4)
+    cache.add(KEY, 3, cache.build_window(KEY, cache.missing(KEY, 3)))
+
+    assert cache.pop(KEY, 2) is None
+    assert cache.missing(KEY, 3) == []
+
+
+def test_least_recently_used_command_is_evicted():
+    """Test the cache holds at most size commands."""
+    cache = PacketCache(BuildPacket, depth=1, size=2)
+    keys = [(group, *KEY[1:]) for group in (0x0001, 0x0002, 0x0004)]
+    for key in keys:
+        cache.add(key, 0, cache.build_window(key, [0]))
+
+    assert len(cache) == 2
+    assert cache.keys_for_serial(0x106AA01) == keys[1:]
+    assert cache.keys_for_serial(0x106AA02) == []
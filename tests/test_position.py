@@ -0,0 +1,196 @@
+"""Tests for the time-based cover position tracker."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.components.cover import CoverEntityFeature
+
+from custom_components.jarolift import cover as cover_module
+from custom_components.jarolift.cover import JaroliftCover
+from custom_components.jarolift.position import PositionTracker
+from custom_components.jarolift.transmit import JaroliftTransmitter
+
+
+def test_unknown_position_stays_unknown():
+    """Test the position is unknown until an end position is reached."""
+    tracker = PositionTracker(20, 10)
+    assert tracker.position(0) is None
+
+    assert tracker.start(0, 100) == 10
+    assert tracker.is_closing
+    assert tracker.position(105) is None
+
+    tracker.stop(105)
+    assert tracker.position(105) is None
+
+
+def test_full_run_calibrates_position():
+    """Test a run lasting the full travel time ends in the end position."""
+    tracker = PositionTracker(20, 10)
+    tracker.start(100, 0)
+    assert tracker.is_opening
+
+    tracker.stop(20)
+    assert tracker.position(20) == 100
+    assert tracker.target is None
+
+
+@pytest.mark.parametrize(
+    ("start", "target", "elapsed", "expected"),
+    [
+        (0, 100, 5, 25),
+        (0, 100, 30, 100),
+        (100, 0, 5, 50),
+        (100, 40, 60, 40),
+        (50, 80, 2, 60),
+    ],
+)
+def test_position_during_travel(start, target, elapsed, expected):
+    """Test the position moves linearly with the travel time of a direction."""
+    tracker = PositionTracker(20, 10, start)
+    tracker.start(target, 0)
+
+    assert tracker.position(elapsed) == pytest.approx(expected)
+
+
+def test_start_returns_time_to_target():
+    """Test the returned duration covers only the remaining distance."""
+    tracker = PositionTracker(20, 10, 80)
+
+    assert tracker.start(30, 0) == pytest.approx(5)
+    assert tracker.start(80, 2) == pytest.approx(4)
+
+
+def test_stop_keeps_reached_position():
+    """Test stopping mid-run keeps the estimated position."""
+    tracker = PositionTracker(20, 10, 100)
+    tracker.start(0, 0)
+    tracker.stop(3)
+
+    assert tracker.position(50) == pytest.approx(70)
+    assert not tracker.is_opening
+    assert not tracker.is_closing
+
+
+@pytest.mark.parametrize(
+    ("travel_time_up", "travel_time_down", "supported"),
+    [(0, 0, False), (20, 0, False), (20, 15, True)],
+)
+def test_cover_set_position_needs_travel_times(
+    travel_time_up, travel_time_down, supported
+):
+    """Test only covers with both travel times can be moved to a position."""
+    cover = JaroliftCover(
+        name="Test Cover",
+        group="0x0001",
+        serial="0x116ea01",
+        rep_count=0,
+        rep_delay=0.2,
+        reversed=False,
+        hass=None,
+        travel_time_up=travel_time_up,
+        travel_time_down=travel_time_down,
+    )
+
+    has_set_position = bool(cover.supported_features & CoverEntityFeature.SET_POSITION)
+    assert has_set_position is supported
+    assert cover.current_cover_position is None
+    assert cover.is_closed is None
+
+
+def _cover_on_transmitter(monkeypatch):
+    """Return a cover whose commands queue on a real transmitter.
+
+    Also returns the transmitter, the buttons sent and the scheduled travel
+    timers as (delay, callback).
+    """
+    loop = asyncio.get_running_loop()
+    hass = MagicMock()
+    hass.loop = loop
+    hass.data = {}
+    hass.async_create_task = loop.create_task
+    transmitter = JaroliftTransmitter(hass, "remote.test_remote")
+    sent = []
+    timers = []
+
+    async def async_call(domain, service, data, blocking=False):
+        button = data["button"]
+
+        async def run(grouping):
+            sent.append(button)
+
+        future = transmitter.async_submit_grouped(
+            button, int(data["group"], 16), run, member="cover"
+        )
+        if blocking:
+            await future
+
+    hass.services.async_call = async_call
+    monkeypatch.setattr(
+        cover_module,
+        "async_call_later",
+        lambda hass, delay, action: timers.append((delay, action)) or MagicMock(),
+    )
+    monkeypatch.setattr(
+        cover_module, "async_track_time_interval", lambda *args: MagicMock()
+    )
+    cover = JaroliftCover(
+        name="Test Cover",
+        group="0x0001",
+        serial="0x116ea01",
+        rep_count=0,
+        rep_delay=0.2,
+        reversed=False,
+        hass=hass,
+        travel_time_up=20,
+        travel_time_down=10,
+    )
+    cover.async_write_ha_state = MagicMock()
+    cover.async_schedule_update_ha_state = MagicMock()
+    cover._tracker.set_position(100)
+    return cover, transmitter, sent, timers
+
+
+@pytest.mark.asyncio
+async def test_run_starts_once_move_is_sent(monkeypatch):
+    """Test the stop ending a run never replaces the still queued move."""
+    cover, transmitter, sent, timers = _cover_on_transmitter(monkeypatch)
+    release = asyncio.Event()
+    transmitter.async_submit(release.wait)
+
+    moving = asyncio.ensure_future(cover.async_set_cover_position(position=50))
+    await asyncio.sleep(0)
+    # The move waits for the transmitter, the run has not started yet
+    assert timers == []
+    assert cover.current_cover_position == 100
+
+    release.set()
+    await moving
+    assert sent == ["0x2"]
+    assert [delay for delay, _ in timers] == [pytest.approx(5)]
+
+    timers[0][1](None)
+    await asyncio.sleep(0)
+    await asyncio.gather(*asyncio.all_tasks() - {asyncio.current_task()})
+    assert sent == ["0x2", "0x4"]
+    assert cover.current_cover_position == 50
+
+
+@pytest.mark.asyncio
+async def test_stop_while_move_is_queued(monkeypatch):
+    """Test a move replaced by a stop before it was sent starts no run."""
+    cover, transmitter, sent, timers = _cover_on_transmitter(monkeypatch)
+    release = asyncio.Event()
+    transmitter.async_submit(release.wait)
+
+    moving = asyncio.ensure_future(cover.async_close_cover())
+    await asyncio.sleep(0)
+    stopping = asyncio.ensure_future(cover.async_stop_cover())
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(moving, stopping)
+
+    assert sent == ["0x4"]
+    assert timers == []
+    assert cover.current_cover_position == 100
@@ -30,14 +30,16 @@ async def test_register_services_uses_async_register():
     )
 
     # Verify async_register was called for all services
-    assert hass.services.async_register.call_count == 4
+    assert hass.services.async_register.call_count == 6
 
     # Verify it was called with correct service names
     service_names = [call[0][1] for call in hass.services.async_register.call_args_list]
     assert "send_raw" in service_names
     assert "send_command" in service_names
+    assert "send_command_many" in service_names
     assert "learn" in service_names
     assert "clear" in service_names
+    assert "resync_counter" in service_names
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,1047 @@
+"""Tests for the asynchronous transmit pipeline."""
+
+import asyncio
+import base64
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import voluptuous as vol
+from homeassistant.util import dt as dt_util
+
+from custom_components.jarolift import (
+    _async_flush_counters,
+    _async_get_counter_store,
+    _get_transmitter,
+    _register_services,
+)
+from custom_components.jarolift.core import BuildPacket, BuildPacketBytes
+from custom_components.jarolift.core.counter import COUNTER_STORE_FILE, CounterStore
+from custom_components.jarolift.core.packet import pack_frames_b64
+from custom_components.jarolift.transmit import PRIORITY_STOP, JaroliftTransmitter
+
+
+def _mock_hass():
+    """Return a minimal hass mock backed by the running event loop."""
+    loop = asyncio.get_running_loop()
+    hass = MagicMock()
+    hass.loop = loop
+    hass.data = {}
+    hass.async_create_task = loop.create_task
+
+    async def async_add_executor_job(target, *args):
+        return target(*args)
+
+    hass.async_add_executor_job = async_add_executor_job
+    hass.services.has_service = MagicMock(return_value=False)
+    hass.services.async_call = AsyncMock()
+    return hass
+
+
+def _stored_counter(tmp_path, serial):
+    """Return the counter persisted in the counter store."""
+    store = CounterStore(str(tmp_path / COUNTER_STORE_FILE))
+    store.load()
+    return store.get(serial)
+
+
+def _registered_handlers(hass):
+    """Return the service handlers registered by _register_services."""
+    return {
+        call[0][1]: call[0][2] for call in hass.services.async_register.call_args_list
+    }
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_in_order():
+    """Test queued jobs run one at a time in submission order."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    events = []
+
+    def make_job(name):
+        async def run():
+            events.append(f"start {name}")
+            await asyncio.sleep(0)
+            events.append(f"end {name}")
+
+        return run
+
+    futures = [transmitter.async_submit(make_job(name)) for name in "abc"]
+    await asyncio.gather(*futures)
+
+    assert events == [
+        "start a",
+        "end a",
+        "start b",
+        "end b",
+        "start c",
+        "end c",
+    ]
+    assert transmitter.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_future_completes_after_frames_sent():
+    """Test the future resolves only once the job has finished."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+
+    async def run():
+        await release.wait()
+
+    future = transmitter.async_submit(run)
+    await asyncio.sleep(0)
+    assert not future.done()
+
+    release.set()
+    await future
+    assert future.done()
+
+
+@pytest.mark.asyncio
+async def test_delay_between_jobs():
+    """Test the post-job delay holds back the next job."""
+    loop = asyncio.get_running_loop()
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    started = []
+
+    async def run():
+        started.append(loop.time())
+
+    transmitter.async_submit(run, 0.05)
+    await transmitter.async_submit(run)
+
+    assert started[1] - started[0] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_failed_job_does_not_block_queue():
+    """Test a failing job reports its error and the queue continues."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+
+    async def fail():
+        raise RuntimeError("remote unavailable")
+
+    async def succeed():
+        return None
+
+    failed = transmitter.async_submit(fail)
+    succeeded = transmitter.async_submit(succeed)
+
+    with pytest.raises(RuntimeError):
+        await failed
+    await succeeded
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_queued_jobs():
+    """Test shutting down stops the consumer without sending waiting jobs."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    sent = []
+
+    async def run(name):
+        sent.append(name)
+        await asyncio.sleep(10)
+
+    active = transmitter.async_submit(lambda: run("active"))
+    waiting = transmitter.async_submit(lambda: run("waiting"))
+    await asyncio.sleep(0)
+
+    await transmitter.async_shutdown()
+
+    assert sent == ["active"]
+    assert active.cancelled() and waiting.cancelled()
+    assert transmitter.pending == 0
+    # A new job starts a new consumer
+    await transmitter.async_submit(lambda: asyncio.sleep(0))
+
+
+@pytest.mark.asyncio
+async def test_queued_group_commands_are_merged():
+    """Test waiting group commands with the same key share one job."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def busy():
+        await release.wait()
+
+    async def run(grouping):
+        sent.append(grouping)
+
+    transmitter.async_submit(busy)
+    futures = [
+        transmitter.async_submit_grouped(("serial", "down"), grouping, run)
+        for grouping in (0x0001, 0x0002, 0x0010)
+    ]
+    other = transmitter.async_submit_grouped(("serial", "up"), 0x0004, run)
+    assert transmitter.pending == 3
+
+    release.set()
+    await asyncio.gather(*futures, other)
+
+    assert sent == [0x0013, 0x0004]
+    assert futures[0] is futures[1] is futures[2]
+
+
+@pytest.mark.asyncio
+async def test_started_group_command_is_not_extended():
+    """Test a group command arriving after the job started gets its own job."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def run(grouping):
+        sent.append(grouping)
+        await release.wait()
+
+    first = transmitter.async_submit_grouped("key", 0x0001, run)
+    await asyncio.sleep(0)
+    second = transmitter.async_submit_grouped("key", 0x0002, run)
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert sent == [0x0001, 0x0002]
+
+
+@pytest.mark.asyncio
+async def test_superseded_member_leaves_shared_job():
+    """Test a newer command moves only its own cover out of a merged job."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def busy():
+        await release.wait()
+
+    def make_run(button):
+        async def run(grouping):
+            sent.append((button, grouping))
+
+        return run
+
+    transmitter.async_submit(busy)
+    transmitter.async_submit_grouped("down", 0x0001, make_run("down"), member="a")
+    transmitter.async_submit_grouped("down", 0x0002, make_run("down"), member="b")
+    stop = transmitter.async_submit_grouped(
+        "stop", 0x0002, make_run("stop"), member="b"
+    )
+    assert transmitter.pending == 3
+
+    release.set()
+    await stop
+
+    assert sent == [("down", 0x0001), ("stop", 0x0002)]
+
+
+@pytest.mark.asyncio
+async def test_superseded_job_is_dropped():
+    """Test a job without any cover left is removed and its future completes."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def busy():
+        await release.wait()
+
+    async def run(grouping):
+        sent.append(grouping)
+
+    transmitter.async_submit(busy)
+    opening = transmitter.async_submit_grouped("up", 0x0001, run, member="a")
+    closing = transmitter.async_submit_grouped("down", 0x0001, run, member="a")
+
+    assert opening.done()
+    assert transmitter.pending == 2
+
+    release.set()
+    await closing
+    assert sent == [0x0001]
+
+
+@pytest.mark.asyncio
+async def test_repeated_command_joins_job_on_the_air():
+    """Test pressing the command that is being sent again does not resend it."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def run(grouping):
+        sent.append(grouping)
+        await release.wait()
+
+    first = transmitter.async_submit_grouped("down", 0x0001, run, member="a")
+    await asyncio.sleep(0)
+    second = transmitter.async_submit_grouped("down", 0x0001, run, member="a")
+
+    assert second is first
+    release.set()
+    await first
+    assert sent == [0x0001]
+
+
+@pytest.mark.asyncio
+async def test_waiting_jobs_are_scheduled():
+    """Test priority, then deadline, then shortest airtime is sent first."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    def make_job(name):
+        async def run():
+            sent.append(name)
+            await release.wait()
+
+        return run
+
+    futures = [transmitter.async_submit(make_job("busy"))]
+    await asyncio.sleep(0)
+    futures += [
+        transmitter.async_submit(make_job("long"), airtime=5),
+        transmitter.async_submit(make_job("short"), airtime=0.2),
+        transmitter.async_submit(make_job("equal"), airtime=0.2),
+        transmitter.async_submit(make_job("deadline"), airtime=5, deadline=10),
+        transmitter.async_submit(make_job("stop"), airtime=5, priority=PRIORITY_STOP),
+    ]
+    release.set()
+    await asyncio.gather(*futures)
+
+    assert sent == ["busy", "stop", "deadline", "short", "equal", "long"]
+
+
+@pytest.mark.asyncio
+async def test_merged_group_command_takes_highest_priority():
+    """Test a merged group command is sent as early as its most urgent part."""
+    transmitter = JaroliftTransmitter(_mock_hass(), "remote.test_remote")
+    release = asyncio.Event()
+    sent = []
+
+    async def run(grouping):
+        sent.append(grouping)
+        await release.wait()
+
+    futures = [transmitter.async_submit_grouped("busy", 0x0001, run)]
+    await asyncio.sleep(0)
+    futures += [
+        transmitter.async_submit_grouped("other", 0x0008, run),
+        transmitter.async_submit_grouped("stop", 0x0002, run),
+        transmitter.async_submit_grouped("stop", 0x0004, run, priority=PRIORITY_STOP),
+    ]
+    release.set()
+    await asyncio.gather(*futures)
+
+    assert sent == [0x0001, 0x0006, 0x0008]
+
+
+@pytest.mark.asyncio
+async def test_stop_is_sent_between_covers_of_send_command_many(tmp_path):
+    """Test a stop does not wait until all covers of a bulk command are sent."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    sent = []
+    first_sent = asyncio.Event()
+
+    async def async_call(domain, service, data, blocking):
+        sent.append(data["command"][0])
+        first_sent.set()
+        await asyncio.sleep(0)
+
+    hass.services.async_call = async_call
+
+    bulk = MagicMock()
+    bulk.data = {
+        "targets": [{"serial": f"0x106aa0{i}"} for i in (1, 3, 4)],
+        "button": "0x8",
+    }
+    stop = MagicMock()
+    stop.data = {"serial": "0x106aa02", "button": "0x4"}
+    other = MagicMock()
+    other.data = {"serial": "0x106aa02", "group": "0x0002", "button": "0x2"}
+
+    bulk_task = asyncio.ensure_future(handlers["send_command_many"](bulk))
+    await first_sent.wait()
+    await asyncio.gather(
+        bulk_task, handlers["send_command"](other), handlers["send_command"](stop)
+    )
+
+    def packet(group, serial, button, counter):
+        return BuildPacket(
+            group, serial, button, counter, 0x12345678, 0x87654321, False
+        )
+
+    assert sent == [
+        packet(0x0001, 0x106AA01, 0x8, 0),
+        packet(0x0001, 0x106AA02, 0x4, 0),
+        packet(0x0001, 0x106AA03, 0x8, 0),
+        packet(0x0001, 0x106AA04, 0x8, 0),
+        packet(0x0002, 0x106AA02, 0x2, 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stop_during_send_command_many_supersedes_its_cover(tmp_path):
+    """Test a cover stopped during a bulk command is not moved by it afterwards."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    sent = []
+    first_sent = asyncio.Event()
+
+    async def async_call(domain, service, data, blocking):
+        sent.append(data["command"][0])
+        first_sent.set()
+        await asyncio.sleep(0)
+
+    hass.services.async_call = async_call
+
+    bulk = MagicMock()
+    bulk.data = {
+        "targets": [
+            {"serial": "0x106aa01"},
+            {"serial": "0x106aa02", "group": "0x0001"},
+            {"serial": "0x106aa03"},
+            {"serial": "0x106aa02", "group": "0x0002"},
+        ],
+        "button": "0x8",
+    }
+    stop = MagicMock()
+    stop.data = {"serial": "0x106aa03", "button": "0x4"}
+    stop_group = MagicMock()
+    stop_group.data = {"serial": "0x106aa02", "group": "0x0002", "button": "0x4"}
+
+    bulk_task = asyncio.ensure_future(handlers["send_command_many"](bulk))
+    await first_sent.wait()
+    await asyncio.gather(
+        bulk_task,
+        handlers["send_command"](stop),
+        handlers["send_command"](stop_group),
+    )
+
+    def packet(group, serial, button, counter):
+        return BuildPacket(
+            group, serial, button, counter, 0x12345678, 0x87654321, False
+        )
+
+    # The stopped group is left out of the merged frame of 0x106aa02
+    assert sent == [
+        packet(0x0001, 0x106AA01, 0x8, 0),
+        packet(0x0001, 0x106AA03, 0x4, 1),
+        packet(0x0002, 0x106AA02, 0x4, 1),
+        packet(0x0001, 0x106AA02, 0x8, 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stop_during_packed_send_command_many_supersedes_its_cover(tmp_path):
+    """Test packed frames of a stopped cover are left out of later packets."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    sent = []
+    first_sent = asyncio.Event()
+
+    async def async_call(domain, service, data, blocking):
+        sent.append(data["command"][0])
+        first_sent.set()
+        # Hold the first packet on the air until the stop is queued
+        transmitter = _get_transmitter(hass, "remote.test_remote")
+        while len(sent) == 1 and not transmitter.pending:
+            await asyncio.sleep(0)
+
+    hass.services.async_call = async_call
+
+    bulk = MagicMock()
+    bulk.data = {
+        "targets": [{"serial": f"0x106aa0{i}"} for i in range(1, 5)],
+        "rep_count": 1,
+        "pack_frames": True,
+        "frame_gap": 0.1,
+    }
+    stop = MagicMock()
+    stop.data = {"serial": "0x106aa04", "button": "0x4"}
+
+    bulk_task = asyncio.ensure_future(handlers["send_command_many"](bulk))
+    await first_sent.wait()
+    await asyncio.gather(bulk_task, handlers["send_command"](stop))
+
+    def frame(serial, button, counter):
+        return (
+            "b64:"
+            + base64.b64encode(
+                BuildPacketBytes(
+                    0x0001, serial, button, counter, 0x12345678, 0x87654321, False
+                )
+            ).decode()
+        )
+
+    # Six frames fit in one packet, the stop goes out before the last repeats
+    first = [frame(serial, 0x2, 0) for serial in range(0x106AA01, 0x106AA05)]
+    first += [frame(0x106AA01, 0x2, 1), frame(0x106AA02, 0x2, 1)]
+    assert sent == [
+        *pack_frames_b64(first, 0.1),
+        BuildPacket(0x0001, 0x106AA04, 0x4, 2, 0x12345678, 0x87654321, False),
+        *pack_frames_b64([frame(0x106AA03, 0x2, 1)], 0.1),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("service", ["send_command", "send_command_many"])
+async def test_send_services_validate_priority_and_deadline(tmp_path, service):
+    """Test priority and deadline are coerced and range checked."""
+    hass = _mock_hass()
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, str(tmp_path / "c_")
+    )
+    schema = {
+        call[0][1]: call[1].get("schema")
+        for call in hass.services.async_register.call_args_list
+    }[service]
+
+    data = schema({"serial": "0x106aa01", "priority": "10", "deadline": "2.5"})
+    assert data == {"serial": "0x106aa01", "priority": 10, "deadline": 2.5}
+    for invalid in ({"deadline": "soon"}, {"deadline": -1}, {"priority": 1000}):
+        with pytest.raises(vol.Invalid):
+            schema(invalid)
+
+
+@pytest.mark.asyncio
+async def test_send_command_many_validates_frame_gap(tmp_path):
+    """Test frame_gap is coerced and limited to what a packet can encode."""
+    hass = _mock_hass()
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, str(tmp_path / "c_")
+    )
+    schema = {
+        call[0][1]: call[1].get("schema")
+        for call in hass.services.async_register.call_args_list
+    }["send_command_many"]
+
+    assert schema({"frame_gap": "0.1"}) == {"frame_gap": 0.1}
+    for invalid in ("wide", -0.1, 3):
+        with pytest.raises(vol.Invalid):
+            schema({"frame_gap": invalid})
+
+
+@pytest.mark.asyncio
+async def test_send_command_uses_pipeline(tmp_path):
+    """Test send_command sends every repeat and stores the counter."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "group": "0x0001",
+        "serial": "0x106aa01",
+        "rep_count": 2,
+        "rep_delay": 0,
+    }
+    await handlers["send_command"](call)
+
+    assert hass.services.async_call.await_count == 3
+    for remote_call in hass.services.async_call.await_args_list:
+        assert remote_call.args[:2] == ("remote", "send_command")
+        assert remote_call.args[2]["entity_id"] == "remote.test_remote"
+        assert remote_call.kwargs["blocking"] is True
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 3
+
+
+@pytest.mark.asyncio
+async def test_send_command_batch_repeat_mode(tmp_path):
+    """Test batch repeat mode hands all repeats to the remote in one call."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "serial": "0x106aa01",
+        "rep_count": 4,
+        "rep_delay": 0.3,
+        "repeat_mode": "batch",
+    }
+    await handlers["send_command"](call)
+
+    hass.services.async_call.assert_awaited_once()
+    data = hass.services.async_call.await_args.args[2]
+    assert len(data["command"]) == 5
+    assert len(set(data["command"])) == 5
+    assert data["delay_secs"] == 0.3
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy", ["same", "increment", "adaptive"])
+async def test_send_command_hardware_repeat_mode(tmp_path, policy):
+    """Test hardware repeat mode sends the repeats as one packet, one counter."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "serial": "0x106aa01",
+        "rep_count": 4,
+        "rep_delay": 0.3,
+        "repeat_mode": "hardware",
+        "counter_policy": policy,
+    }
+    await handlers["send_command"](call)
+
+    hass.services.async_call.assert_awaited_once()
+    data = hass.services.async_call.await_args.args[2]
+    expected = bytearray(
+        BuildPacketBytes(0x0001, 0x106AA01, 0x2, 0, 0x12345678, 0x87654321, False)
+    )
+    expected[1] = 4
+    assert data["command"] == ["b64:" + base64.b64encode(expected).decode()]
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("policy", "distinct", "stored"),
+    [("same", 1, 1), ("adaptive", 1, 1), ("increment", 4, 4)],
+)
+async def test_send_command_counter_policy(tmp_path, policy, distinct, stored):
+    """Test the counter policy sets the counters used by the repeats."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "serial": "0x106aa01",
+        "rep_count": 3,
+        "rep_delay": 0.3,
+        "repeat_mode": "batch",
+        "counter_policy": policy,
+    }
+    await handlers["send_command"](call)
+
+    commands = hass.services.async_call.await_args.args[2]["command"]
+    assert len(commands) == 4
+    assert len(set(commands)) == distinct
+    # Consecutive frames differ unless all repeats share one counter
+    changes = [a != b for a, b in zip(commands, commands[1:], strict=False)]
+    assert all(changes) is (distinct > 1)
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == stored
+    assert hass.data["jarolift"]["counter_usage"].history(0x106AA01, 0x0001) == {
+        dt_util.now().date().isoformat(): stored
+    }
+
+
+@pytest.mark.asyncio
+async def test_packets_are_precomputed_after_send(tmp_path):
+    """Test the next command of a cover is sent from the packet cache."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {"group": "0x0001", "serial": "0x106aa01", "button": "0x2"}
+    await handlers["send_command"](call)
+    # Let the background refill run
+    await asyncio.sleep(0.01)
+    packet_cache = hass.data["jarolift"]["packet_cache"]
+    assert packet_cache.hits == 0
+    assert len(packet_cache) == 1
+
+    await handlers["send_command"](call)
+
+    assert packet_cache.hits == 1
+    packet = hass.services.async_call.await_args.args[2]["command"][0]
+    assert packet == BuildPacket(
+        0x0001, 0x106AA01, 0x2, 1, 0x12345678, 0x87654321, False
+    )
+
+
+@pytest.mark.asyncio
+async def test_packets_are_built_in_executor(tmp_path):
+    """Test cache misses and learn frames are never built on the event loop."""
+    hass = _mock_hass()
+    targets = []
+
+    async def async_add_executor_job(target, *args):
+        targets.append(getattr(target, "__name__", None))
+        return target(*args)
+
+    hass.async_add_executor_job = async_add_executor_job
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {"group": "0x0001", "serial": "0x106aa01", "button": "0x2"}
+    await handlers["send_command"](call)
+    assert "build_window" in targets
+    packet = hass.services.async_call.await_args.args[2]["command"][0]
+    assert packet == BuildPacket(
+        0x0001, 0x106AA01, 0x2, 0, 0x12345678, 0x87654321, False
+    )
+
+    targets.clear()
+    call.data = {"group": "0x0001", "serial": "0x106aa01", "counter": "0x0005"}
+    await handlers["send_command"](call)
+    assert "build_window" in targets
+    packet = hass.services.async_call.await_args.args[2]["command"][0]
+    assert packet == BuildPacket(
+        0x0001, 0x106AA01, 0x2, 5, 0x12345678, 0x87654321, False
+    )
+
+    targets.clear()
+    call.data = {"group": "0x0001", "serial": "0x106aa02", "counter": "0x0010"}
+    await handlers["learn"](call)
+    assert targets == ["build_packets_batch"]
+    sent = [c.args[2]["command"][0] for c in hass.services.async_call.await_args_list]
+    assert sent[-2:] == [
+        BuildPacket(0x0001, 0x106AA02, 0xA, 16, 0x12345678, 0x87654321, False),
+        BuildPacket(0x0001, 0x106AA02, 0x4, 17, 0x12345678, 0x87654321, False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_group_commands_share_one_frame(tmp_path):
+    """Test covers sharing a serial are closed with one OR-ed group frame."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    calls = []
+    for group in ("0x0001", "0x0002", "0x0004"):
+        call = MagicMock()
+        call.data = {"group": group, "serial": "0x106aa01", "button": "0x2"}
+        calls.append(handlers["send_command"](call))
+    await asyncio.gather(*calls)
+
+    hass.services.async_call.assert_awaited_once()
+    packet = hass.services.async_call.await_args.args[2]["command"][0]
+    assert packet == BuildPacket(
+        0x0007, 0x106AA01, 0x2, 0, 0x12345678, 0x87654321, False
+    )
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_command_many(tmp_path, monkeypatch):
+    """Test many covers are sent in order with one counter write and build.
+
+    Covers sharing a serial and button get one frame with the OR-ed group mask.
+    """
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    store = await _async_get_counter_store(hass, counter_file)
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    writes = []
+    write = store.write
+    monkeypatch.setattr(store, "write", lambda *args: writes.append(write(*args)))
+
+    call = MagicMock()
+    call.data = {
+        "targets": [
+            {"serial": "0x106aa01", "group": "0x0001"},
+            {"serial": "0x106aa02", "group": "0x0001", "button": "0x8"},
+            {"serial": "0x106aa01", "group": "0x0002"},
+        ],
+        "button": "0x2",
+        "rep_count": 1,
+        "rep_delay": 0,
+    }
+    await handlers["send_command_many"](call)
+
+    packets = [
+        c.args[2]["command"][0] for c in hass.services.async_call.await_args_list
+    ]
+    assert packets == [
+        BuildPacket(group, serial, button, counter, 0x12345678, 0x87654321, False)
+        for group, serial, button, counter in (
+            (0x0003, 0x106AA01, 0x2, 0),
+            (0x0003, 0x106AA01, 0x2, 1),
+            (0x0001, 0x106AA02, 0x8, 0),
+            (0x0001, 0x106AA02, 0x8, 1),
+        )
+    ]
+    assert len(writes) == 1
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 2
+    assert _stored_counter(tmp_path, 0x106AA02) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_command_many_packs_frames(tmp_path):
+    """Test packed frames of all covers are sent in few remote packets."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "targets": [{"serial": f"0x106aa0{i}", "group": "0x0001"} for i in range(1, 5)],
+        "rep_count": 1,
+        "pack_frames": True,
+        "frame_gap": 0.1,
+    }
+    await handlers["send_command_many"](call)
+
+    packets = [
+        c.args[2]["command"][0] for c in hass.services.async_call.await_args_list
+    ]
+    frames = [
+        BuildPacketBytes(0x0001, serial, 0x2, counter, 0x12345678, 0x87654321, False)
+        for counter in (0, 1)
+        for serial in range(0x106AA01, 0x106AA05)
+    ]
+    assert packets == pack_frames_b64(
+        ["b64:" + base64.b64encode(frame).decode() for frame in frames], 0.1
+    )
+    assert len(packets) == 2
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA04) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_are_serialized(tmp_path):
+    """Test concurrent service calls never share counter values."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    calls = []
+    for group, button in (("0x0001", "0x2"), ("0x0002", "0x4"), ("0x0004", "0x8")):
+        call = MagicMock()
+        call.data = {"group": group, "serial": "0x106aa01", "button": button}
+        calls.append(handlers["send_command"](call))
+    await asyncio.gather(*calls)
+
+    packets = [
+        c.args[2]["command"][0] for c in hass.services.async_call.await_args_list
+    ]
+    assert len(set(packets)) == 3
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 3
+
+
+@pytest.mark.asyncio
+async def test_newer_command_for_cover_replaces_waiting_one(tmp_path):
+    """Test open then close queued for the same cover only sends close."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    calls = []
+    for button in ("0x8", "0x2"):
+        call = MagicMock()
+        call.data = {"group": "0x0001", "serial": "0x106aa01", "button": button}
+        calls.append(handlers["send_command"](call))
+    await asyncio.gather(*calls)
+
+    hass.services.async_call.assert_awaited_once()
+    packet = hass.services.async_call.await_args.args[2]["command"][0]
+    assert packet == BuildPacket(
+        0x0001, 0x106AA01, 0x2, 0, 0x12345678, 0x87654321, False
+    )
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 1
+
+
+@pytest.mark.asyncio
+async def test_remotes_transmit_concurrently(tmp_path):
+    """Test commands for different remotes do not wait for each other."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.downstairs", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    in_flight = set()
+    overlapped = False
+
+    async def remote_call(domain, service, data, blocking=False):
+        nonlocal overlapped
+        in_flight.add(data["entity_id"])
+        overlapped |= len(in_flight) > 1
+        await asyncio.sleep(0.01)
+        in_flight.discard(data["entity_id"])
+
+    hass.services.async_call = AsyncMock(side_effect=remote_call)
+
+    downstairs = MagicMock()
+    downstairs.data = {"serial": "0x106aa01"}
+    upstairs = MagicMock()
+    upstairs.data = {"serial": "0x106aa02", "remote_entity_id": "remote.upstairs"}
+    await asyncio.gather(
+        handlers["send_command"](downstairs), handlers["send_command"](upstairs)
+    )
+
+    assert overlapped
+    assert set(hass.data["jarolift"]["transmitters"]) == {
+        "remote.downstairs",
+        "remote.upstairs",
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_serial_across_remotes_reserves_counters(tmp_path):
+    """Test one serial used on two remotes never reuses a counter."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _register_services(
+        hass, "remote.downstairs", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    calls = []
+    for remote in ("remote.downstairs", "remote.upstairs"):
+        call = MagicMock()
+        call.data = {
+            "serial": "0x106aa01",
+            "rep_count": 1,
+            "rep_delay": 0,
+            "remote_entity_id": remote,
+        }
+        calls.append(handlers["send_command"](call))
+    await asyncio.gather(*calls)
+
+    packets = [
+        c.args[2]["command"][0] for c in hass.services.async_call.await_args_list
+    ]
+    assert len(set(packets)) == 4
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 4
+
+
+@pytest.mark.asyncio
+async def test_write_behind_sends_without_disk_io(tmp_path, monkeypatch):
+    """Test sends within a reserved block do not write the counter file."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    store = await _async_get_counter_store(hass, counter_file)
+    store.block_size = 64
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    writes = []
+    write = store.write
+    monkeypatch.setattr(store, "write", lambda *args: writes.append(write(*args)))
+
+    for _ in range(5):
+        call = MagicMock()
+        call.data = {"serial": "0x106aa01", "rep_count": 1, "rep_delay": 0}
+        await handlers["send_command"](call)
+
+    assert len(writes) == 1
+    assert _stored_counter(tmp_path, 0x106AA01) == 2 + 64
+
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 10
+
+
+@pytest.mark.asyncio
+async def test_counter_fsync_runs_after_send(tmp_path, monkeypatch):
+    """Test a command does not wait for the fsync of its counter write."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    await _async_get_counter_store(hass, counter_file, block_size=0)
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+    events = []
+    monkeypatch.setattr(os, "fsync", lambda fd: events.append("fsync"))
+    hass.services.async_call.side_effect = lambda *args, **kwargs: events.append("send")
+
+    call = MagicMock()
+    call.data = {"serial": "0x106aa01"}
+    await handlers["send_command"](call)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert events == ["send", "fsync"]
+    await _async_flush_counters(hass, release=True)
+    assert _stored_counter(tmp_path, 0x106AA01) == 1
+
+
+@pytest.mark.asyncio
+async def test_resync_counter_fast_forwards(tmp_path):
+    """Test captured frames move stored counters forward, never back."""
+    hass = _mock_hass()
+    counter_file = str(tmp_path / "counter_")
+    store = await _async_get_counter_store(hass, counter_file)
+    store.set(0x106AA02, 500)
+    await _register_services(
+        hass, "remote.test_remote", 0x12345678, 0x87654321, 0, counter_file
+    )
+    handlers = _registered_handlers(hass)
+
+    call = MagicMock()
+    call.data = {
+        "packet": [
+            BuildPacket(0x0001, 0x106AA01, 0x8, 40, 0x12345678, 0x87654321, False),
+            BuildPacket(0x0001, 0x106AA01, 0x2, 42, 0x12345678, 0x87654321, False),
+            BuildPacket(0x0001, 0x106AA02, 0x2, 7, 0x12345678, 0x87654321, False),
+            "b64:AAAA",
+        ]
+    }
+    await handlers["resync_counter"](call)
+
+    assert _stored_counter(tmp_path, 0x106AA01) == 43
+    assert _stored_counter(tmp_path, 0x106AA02) == 500
+    hass.services.async_call.assert_not_awaited()
+
+    call.data = {
+        "packet": BuildPacket(
+            0x0001, 0x106AA01, 0x2, 90, 0x12345678, 0x87654321, False
+        ),
+        "serial": "0x106aa03",
+    }
+    await handlers["resync_counter"](call)
+    assert _stored_counter(tmp_path, 0x106AA01) == 43